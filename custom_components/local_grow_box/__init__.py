@@ -1,45 +1,80 @@
 """The Local Grow Box integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
 import datetime
-import math
 import os
 import json
 import base64
+import random
+import time
 import voluptuous as vol
 from datetime import timedelta
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect, async_dispatcher_send
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.event import (
+    async_call_later, async_track_point_in_time, async_track_time_interval,
+)
 from homeassistant.util import dt as dt_util
 from homeassistant.components.http import StaticPathConfig
 from homeassistant.components import panel_custom, websocket_api
-from homeassistant.exceptions import HomeAssistantError
 
 from .const import (
     DOMAIN, CONF_LIGHT_ENTITY, CONF_FAN_ENTITY, CONF_TEMP_SENSOR, CONF_HUMIDITY_SENSOR,
-    CONF_TARGET_TEMP, CONF_MAX_HUMIDITY, DEFAULT_TARGET_TEMP, DEFAULT_MAX_HUMIDITY,
-    CONF_HUMIDIFIER_ENTITY, CONF_MIN_HUMIDITY, DEFAULT_MIN_HUMIDITY,
-    PHASE_LIGHT_HOURS, PHASE_VEGETATIVE, CONF_PHASE_SEEDLING_HOURS, CONF_PHASE_VEGETATIVE_HOURS,
-    CONF_PHASE_FLOWERING_HOURS, CONF_PHASE_DRYING_HOURS, CONF_PHASE_CURING_HOURS,
-    CONF_CUSTOM1_NAME, CONF_CUSTOM1_HOURS, CONF_CUSTOM2_NAME, CONF_CUSTOM2_HOURS,
-    CONF_CUSTOM3_NAME, CONF_CUSTOM3_HOURS, PHASE_SEEDLING, PHASE_FLOWERING, PHASE_DRYING,
-    PHASE_CURING, CONF_PUMP_DURATION, CONF_MOISTURE_SENSOR, CONF_TARGET_MOISTURE,
-    CONF_LIGHT_START_HOUR, CONF_PHASE_START_DATE, DEFAULT_PUMP_DURATION,
-    CONF_TARGET_HUMIDITY, CONF_HUMIDIFIER_DURATION, DEFAULT_TARGET_HUMIDITY, 
+    CONF_HUMIDIFIER_ENTITY,
+    PHASE_VEGETATIVE, CONF_PHASE_START_DATE, CONF_PHASE_PROFILES,
+    CONF_HUMIDIFIER_DURATION, CONF_GROW_PLAN, CONF_CLIMATE_MODE, CLIMATE_MODE_HUMIDITY, CLIMATE_MODE_VPD,
+    CONF_LEAF_TEMP_OFFSET, DEFAULT_LEAF_TEMP_OFFSET, CONF_VPD_HYSTERESIS, DEFAULT_VPD_HYSTERESIS,
+    CONF_ANOMALY_ACTION, ANOMALY_ACTION_NOTIFY, ANOMALY_ACTION_HOLD,
+    CONF_WATERING_MODE, WATERING_MODE_THRESHOLD, WATERING_MODE_PREDICTIVE, WATERING_LEAD,
+    CONF_WATER_ZONES, POWER_INRUSH_FACTOR, CONF_LIGHT_RAMP, STATE_SAVE_DELAY, STATE_CHECKPOINT_INTERVAL,
+    PHASE_HISTORY_SIZE,
     DEFAULT_HUMIDIFIER_DURATION, CONF_PUMP_ENTITY, CONF_CAMERA_ENTITY,
     CONF_HUMIDITY_HYSTERESIS, DEFAULT_HUMIDITY_HYSTERESIS,
     CONF_TEMP_HYSTERESIS, DEFAULT_TEMP_HYSTERESIS,
     CONF_FAN_HYSTERESIS, DEFAULT_FAN_HYSTERESIS,
-    DEFAULT_LIGHT_START_HOUR, DEFAULT_TARGET_MOISTURE,
+    SIGNAL_LIVE_STATE, LIVE_STATE_MIN_INTERVAL,
+    STARTUP_STAGGER, STARTUP_SPREAD, STARTUP_JITTER,
+)
+from .anomaly import AnomalyMonitor
+from .climate import (
+    DATA_CLIMATE_BATCH, KEEP, TURN_OFF, TURN_ON, ClimateBatchEngine, ClimateDecision, ClimateSetpoints,
+    decide_climate,
+)
+from .display import DATA_DISPLAY, DisplayScheduler
+from .entities import TRACKED_KEYS, EntityTracker
+from .export import GrowExportView
+from .growplan import PLAN_SCHEMA, compile_calendar
+from .irrigation import DATA_IRRIGATION, IrrigationScheduler
+from .loadtest import SERVICE_LOADTEST, SERVICE_LOADTEST_SCHEMA, async_handle_loadtest
+from .panel import PANEL_FILENAME, GrowBoxPanelView, load_panel_asset
+from .power import DATA_POWER, PowerBudget
+from .phases import BUILTIN_IDS, PROFILE_SCHEMA, PhaseProfile, PhaseRegistry
+from .ramp import RAMP_SUNRISE, RAMP_SUNSET, LightRamp, ramp_mode
+from .profiler import SERVICE_PROFILE, SERVICE_PROFILE_SCHEMA, async_handle_profile, profiled
+from .psychrometrics import SVP_TABLE
+from .runtime import ACTUATORS, WATTS_KEYS, RuntimeCounters
+from .snapshot import SensorSnapshot, build_snapshot, state_as_float, state_is_on
+from .stats import HourlyStats
+from .telemetry import TIERS_BY_NAME, TelemetryStore
+from .trace import ACTION_KEEP, ACTION_OFF, ACTION_ON, DecisionTrace
+from .zones import (
+    MAIN_ZONE, ZONES_SCHEMA, WaterZone, build_zones, rename_zone_entities, zone_references,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.SWITCH, Platform.SELECT]
+STATE_STORAGE_VERSION = 1
+
+PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.SWITCH, Platform.SELECT, Platform.BINARY_SENSOR]
+
+# Anomaly channels and the names used in the log
+ANOMALY_LABELS = {"temp": "Temperatur", "humidity": "Luftfeuchte", "moisture": "Bodenfeuchte"}
 
 class GrowBoxManager:
     """Class to manage the Grow Box automation."""
@@ -52,6 +87,7 @@ class GrowBoxManager:
         self._remove_update_listener = None
         self.master_switch_on = True
         self.current_phase = self.config.get("current_phase", PHASE_VEGETATIVE)
+        self.phases = PhaseRegistry(self.config)
         self.phase_start_date = None
         start_date_str = self.config.get(CONF_PHASE_START_DATE)
         if start_date_str:
@@ -62,46 +98,103 @@ class GrowBoxManager:
         
         if self.phase_start_date is None:
              self.phase_start_date = dt_util.now()
+        # Past phases, oldest first: [{"phase": id, "start": iso, "end": iso}]
+        self.phase_history: list[dict] = []
 
         self.vpd = 0.0
-        self.pump_start_time = None
-        # Initialize timers in the past so devices can start immediately on restart if needed
-        self.last_pump_stop_time = dt_util.now() - timedelta(hours=1)
-        
+        # Initialize timers in the past so devices can start immediately on a first start;
+        # later restarts continue the saved timers (see _async_restore_state)
         self.humidifier_start_time = None
         self.last_humidifier_stop_time = dt_util.now() - timedelta(hours=1)
         
-        self.logs = []
+        # Log history is read lazily in the executor (see async_load_logs)
+        self._logs = None
+        self._pending_logs = []
+        self._logs_lock = asyncio.Lock()
         self._last_log_state = {}
+        self._log_dedup_restored = False
+        self._state_store = Store(hass, STATE_STORAGE_VERSION, f"{DOMAIN}_state_{entry.entry_id}")
+        self._cancel_state_checkpoint = None
+        self._remove_stop_listener = None
         self._log_file_path = hass.config.path(f".storage", f"local_grow_box_logs_{self.entry.entry_id}.json")
-        self._load_logs()
         self._last_display_update = None
+        self._started = False
+        self._cancel_start = None
+        self.startup_timings = {}
+        self.entities = EntityTracker(hass, self.config, self._async_entities_renamed, zone_references(self.config))
+        self.snapshot: SensorSnapshot | None = None
+        self.anomalies = AnomalyMonitor(self.entities)
+        self._remove_anomaly_listener = None
+        self._remove_power_load = None
+        self.safe_hold = self._get_config_value(CONF_ANOMALY_ACTION, ANOMALY_ACTION_NOTIFY) == ANOMALY_ACTION_HOLD
+        self.zones = build_zones(self.config, self.entities)
+        self.predictive_watering = (
+            self._get_config_value(CONF_WATERING_MODE, WATERING_MODE_THRESHOLD) == WATERING_MODE_PREDICTIVE
+        )
+        self.telemetry = TelemetryStore(hass, entry.entry_id)
+        # Phase changes reload the entry, so the calendar is compiled once per phase
+        self.transitions = compile_calendar(
+            self.config.get(CONF_GROW_PLAN) or [], self.current_phase, self._phase_start_local()
+        )
+        self._cancel_transition = None
+        self.climate_setpoints = self._compile_climate_setpoints()
+        self.trace = DecisionTrace()
+        self.runtime = RuntimeCounters(
+            hass, entry.entry_id, self.entities,
+            {actuator: self._get_config_value(WATTS_KEYS[actuator], 0.0, float) for actuator in ACTUATORS},
+        )
+        self.hourly_stats = HourlyStats(hass, entry, self.runtime)
+        self.next_light_transition = None
+        self.light_ramp: LightRamp | None = None
+        self._live_state = {}
+
+    def _read_logs(self) -> list:
+        """Read logs from file. Runs in the executor."""
+        if not os.path.exists(self._log_file_path):
+            return []
+        try:
+            with open(self._log_file_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            _LOGGER.error("Failed to load Local Grow Box logs: %s", e)
+            return []
+
+    async def async_load_logs(self) -> list:
+        """Return the log history, reading it from disk on first access."""
+        if self._logs is not None:
+            return self._logs
+        async with self._logs_lock:
+            if self._logs is None:
+                started = time.monotonic()
+                logs = await self.hass.async_add_executor_job(self._read_logs)
+                # Reconstruct last state from history, unless the saved controller state had it
+                # We reverse so we process oldest -> newest (logs has newest at index 0)
+                for log in reversed(logs) if not self._log_dedup_restored else ():
+                    try:
+                        msg = log.split("] ", 1)[-1]
+                        prefix = msg.split(" (")[0]
+                        category = prefix.split(" ")[0]
+                        self._last_log_state[category] = prefix
+                    except Exception:
+                        pass
+                # Entries added before the history was loaded are newer
+                self._logs = (self._pending_logs + logs)[:1000]
+                self.startup_timings["log_load"] = round(time.monotonic() - started, 4)
+                if self._pending_logs:
+                    self._pending_logs = []
+                    self.hass.async_create_task(self.hass.async_add_executor_job(self._save_logs, list(self._logs)))
+        return self._logs
 
-    def _load_logs(self):
-        """Load logs from file."""
-        if os.path.exists(self._log_file_path):
-            try:
-                with open(self._log_file_path, "r", encoding="utf-8") as f:
-                    self.logs = json.load(f)
-                    
-                    # Reconstruct last state from history
-                    # We reverse so we process oldest -> newest (self.logs has newest at index 0)
-                    for log in reversed(self.logs):
-                        try:
-                            msg = log.split("] ", 1)[-1]
-                            prefix = msg.split(" (")[0]
-                            category = prefix.split(" ")[0]
-                            self._last_log_state[category] = prefix
-                        except Exception:
-                            pass
-            except Exception as e:
-                _LOGGER.error("Failed to load Local Grow Box logs: %s", e)
+    @property
+    def logs(self) -> list:
+        """Return the loaded log history (empty until first loaded)."""
+        return self._logs if self._logs is not None else list(self._pending_logs)
 
-    def _save_logs(self):
+    def _save_logs(self, logs):
         """Save logs to file."""
         try:
             with open(self._log_file_path, "w", encoding="utf-8") as f:
-                json.dump(self.logs, f)
+                json.dump(logs, f)
         except Exception as e:
             pass # avoid spamming if permissions fail
 
@@ -115,17 +208,51 @@ class GrowBoxManager:
             return  # Same action already logged recently
             
         self._last_log_state[category] = prefix
+        # Log lines mark actuator changes, so the timers are saved with the dedup state
+        self._async_save_state()
 
         timestamp = dt_util.now().strftime("%d.%m.%Y %H:%M:%S")
-        self.logs.insert(0, f"[{timestamp}] {message}")
+        line = f"[{timestamp}] {message}"
+        if self._logs is None:
+            # History not loaded yet, merged in by async_load_logs
+            self._pending_logs.insert(0, line)
+            return
+
+        self._logs.insert(0, line)
         
-        if len(self.logs) > 1000:
-            self.logs.pop()
+        if len(self._logs) > 1000:
+            self._logs.pop()
             
-        self.hass.async_create_task(self.hass.async_add_executor_job(self._save_logs))
-
-    async def async_setup(self):
-        """Setup background tasks."""
+        self.hass.async_create_task(self.hass.async_add_executor_job(self._save_logs, list(self._logs)))
+
+    async def async_setup(self, slot: int = 0):
+        """Setup background tasks, staggered by slot so many boxes don't tick in the same instant."""
+        delay = (slot * STARTUP_STAGGER) % STARTUP_SPREAD + random.uniform(0, STARTUP_JITTER)
+        self.startup_timings["first_tick_delay"] = round(delay, 3)
+        self.entities.async_setup()
+        self.anomalies.async_setup()
+        for zone in self.zones.values():
+            zone.watering.async_setup()
+        self._async_restore_state(await self._state_store.async_load())
+        self._cancel_state_checkpoint = async_track_time_interval(
+            self.hass, self._async_checkpoint_state, timedelta(seconds=STATE_CHECKPOINT_INTERVAL)
+        )
+        # Entries are not unloaded on shutdown; a pending delayed save is written with the final write
+        self._remove_stop_listener = self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_stopping)
+        self._remove_anomaly_listener = self.anomalies.async_add_listener(self._async_anomalies_changed)
+        await self.telemetry.async_setup()
+        await self.runtime.async_setup()
+        self._remove_power_load = self.hass.data[DATA_POWER].async_register_load(self.entry.entry_id, self.power_load)
+        self._cancel_start = async_call_later(self.hass, delay, self._async_start)
+
+    @callback
+    def _async_start(self, _now=None):
+        """Start the control loop."""
+        self._cancel_start = None
+        self._started = True
+        # Phase is final here (the select restores it during platform setup)
+        self.runtime.async_set_phase(self.phase_key)
+        self._async_arm_transition()
         # Check more frequently (1s) to handle pump duration accurately
         self._remove_update_listener = async_track_time_interval(
             self.hass, self._async_update_logic, timedelta(seconds=1)
@@ -134,9 +261,137 @@ class GrowBoxManager:
 
     def async_unload(self):
         """Unload and clean up."""
+        if DATA_DISPLAY in self.hass.data:
+            self.hass.data[DATA_DISPLAY].async_remove(self.entry.entry_id)
+        if self._cancel_state_checkpoint:
+            self._cancel_state_checkpoint()
+            self._cancel_state_checkpoint = None
+        if self._remove_stop_listener:
+            self._remove_stop_listener()
+            self._remove_stop_listener = None
+        if self._remove_power_load:
+            self._remove_power_load()
+            self._remove_power_load = None
+        if self._remove_anomaly_listener:
+            self._remove_anomaly_listener()
+            self._remove_anomaly_listener = None
+        self.anomalies.async_unload()
+        for zone in self.zones.values():
+            zone.watering.async_unload()
+        if DATA_IRRIGATION in self.hass.data:
+            self.hass.data[DATA_IRRIGATION].async_remove_entry(self.entry.entry_id)
+        self.entities.async_unload()
+        if self._cancel_start:
+            self._cancel_start()
+            self._cancel_start = None
+        if self._cancel_transition:
+            self._cancel_transition()
+            self._cancel_transition = None
         if self._remove_update_listener:
             self._remove_update_listener()
 
+    def _state_to_save(self) -> dict:
+        return {
+            "saved": dt_util.utcnow().isoformat(),
+            "humidifier_start": self.humidifier_start_time.isoformat() if self.humidifier_start_time else None,
+            "humidifier_stop": self.last_humidifier_stop_time.isoformat() if self.last_humidifier_stop_time else None,
+            "zones": {zone_id: zone.as_state() for zone_id, zone in self.zones.items()},
+            "anomalies": self.anomalies.as_state(),
+            "log_dedup": self._last_log_state,
+            "phase": self.current_phase,
+            "phase_start": self.phase_start_date.isoformat(),
+            "phase_history": self.phase_history,
+            "hourly_stats": self.hourly_stats.as_state(),
+        }
+
+    @callback
+    def _async_restore_state(self, data: dict | None):
+        """Continue timers, filters and log dedup of the previous run."""
+        if not data:
+            return
+        try:
+            if data["humidifier_start"]:
+                self.humidifier_start_time = dt_util.parse_datetime(data["humidifier_start"])
+            if data["humidifier_stop"]:
+                self.last_humidifier_stop_time = dt_util.parse_datetime(data["humidifier_stop"])
+            for zone_id, state in data["zones"].items():
+                # Zones removed in the meantime are dropped
+                if zone_id in self.zones:
+                    self.zones[zone_id].restore(state)
+            self._async_restore_irrigation_slots()
+            self.anomalies.async_restore(data["anomalies"])
+            self._last_log_state = {**data["log_dedup"], **self._last_log_state}
+            self._log_dedup_restored = True
+            self._async_restore_phase_history(data)
+            self.hourly_stats.async_restore(data.get("hourly_stats"))
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring saved controller state of %s: %s", self.entry.title, err)
+            return
+        self.startup_timings["state_saved"] = data["saved"]
+
+    @callback
+    def _async_restore_irrigation_slots(self):
+        """Count pumps that were running when the state was saved against max_concurrent."""
+        irrigation: IrrigationScheduler = self.hass.data[DATA_IRRIGATION]
+        now = dt_util.now()
+        for zone in self.zones.values():
+            if zone.pump_start_time is None:
+                continue
+            duration = zone.pump_run_duration
+            if duration is None:
+                duration = zone.pump_duration or self.phase_profile.pump_duration
+            elapsed = (now - zone.pump_start_time).total_seconds()
+            # The first tick releases the slot if the pump is off by now
+            irrigation.async_restore_running(self.entry.entry_id, zone.id, duration - elapsed)
+
+    @callback
+    def _async_restore_phase_history(self, data: dict):
+        """Continue the phase history and record the phase that ended since the last run."""
+        self.phase_history = list(data.get("phase_history", []))
+        previous, previous_start = data.get("phase"), data.get("phase_start")
+        # Without a stored phase clock the phase is restored later by the select entity
+        if previous is None or CONF_PHASE_START_DATE not in self.config:
+            return
+        if (previous, previous_start) == (self.current_phase, self.phase_start_date.isoformat()):
+            return
+        self.phase_history.append({
+            "phase": previous, "start": previous_start, "end": self.phase_start_date.isoformat(),
+        })
+        del self.phase_history[:-PHASE_HISTORY_SIZE]
+        self._async_save_state()
+
+    def phase_period(self, phase: str) -> tuple[datetime.datetime, datetime.datetime] | None:
+        """Return start and end of the latest run of a phase ("current" for the running one)."""
+        if phase in ("current", self.current_phase):
+            return self._phase_start_local(), dt_util.now()
+        for period in reversed(self.phase_history):
+            if period["phase"] == phase:
+                start, end = (dt_util.parse_datetime(period[key]) for key in ("start", "end"))
+                return (
+                    dt_util.as_local(start) if start.tzinfo is None else start,
+                    dt_util.as_local(end) if end.tzinfo is None else end,
+                )
+        return None
+
+    @callback
+    def _async_save_state(self):
+        """Write the controller state soon, coalescing changes within STATE_SAVE_DELAY."""
+        self._state_store.async_delay_save(self._state_to_save, STATE_SAVE_DELAY)
+
+    async def async_write_state(self):
+        """Write the controller state now."""
+        await self._state_store.async_save(self._state_to_save())
+
+    @callback
+    def _async_stopping(self, _event):
+        self._remove_stop_listener = None
+        self._async_save_state()
+
+    @callback
+    def _async_checkpoint_state(self, _now=None):
+        # Filter statistics change with every reading, they are saved on a timer instead
+        self._async_save_state()
+
     @property
     def days_in_phase(self) -> int:
         """Return number of days in current phase."""
@@ -149,30 +404,59 @@ class GrowBoxManager:
         delta = now - start
         return max(0, delta.days)
 
-    def _get_safe_state(self, entity_id):
-        if not entity_id:
-            return None
-            
-        state = self.hass.states.get(entity_id)
-        
-        # Robust check: If not found, try common domains (sensor, switch)
-        if not state and "." not in entity_id:
-            for domain in ["sensor", "switch", "binary_sensor"]:
-                test_id = f"{domain}.{entity_id}"
-                state = self.hass.states.get(test_id)
-                if state:
-                    self.config[entity_id] = test_id # Update config for next time
-                    break
-        
-        if not state:
-            _LOGGER.debug("Entity not found: %s", entity_id)
-            return None
-            
-        if state.state in ["unavailable", "unknown"]:
-            _LOGGER.debug("Entity %s is %s", entity_id, state.state)
-            return None
-            
-        return state
+    def _phase_start_local(self) -> datetime.datetime:
+        start = self.phase_start_date
+        return dt_util.as_local(start) if start.tzinfo is None else start
+
+    @callback
+    def _async_arm_transition(self):
+        """Arm one timer for the next planned phase transition (fires at once if overdue)."""
+        if not self.transitions or self.current_phase != self.transitions[0].from_phase:
+            return
+        self._cancel_transition = async_track_point_in_time(
+            self.hass, self._async_advance_phase, self.transitions[0].at
+        )
+
+    @callback
+    def _async_advance_phase(self, _now=None):
+        """Apply the next transition of the grow plan."""
+        self._cancel_transition = None
+        transition = self.transitions[0]
+        if transition.to_phase not in self.phases:
+            _LOGGER.warning("Grow plan phase %s does not exist. Not advancing.", transition.to_phase)
+            return
+        self.add_log(f"Phase automatisch gewechselt ({transition.from_phase} -> {transition.to_phase})")
+        # Start at the planned instant so missed transitions catch up one by one
+        self.async_change_phase(transition.to_phase, transition.at)
+
+    @callback
+    def async_change_phase(self, phase: str, start: datetime.datetime | None = None):
+        """Switch to a phase and restart the phase clock. The entry reloads with it."""
+        start = start or dt_util.now()
+        opts = {**self.entry.options, "current_phase": phase, CONF_PHASE_START_DATE: start.isoformat()}
+        self.hass.config_entries.async_update_entry(self.entry, options=opts)
+
+    @property
+    def phase_profile(self) -> PhaseProfile:
+        """Return the setpoints of the current phase."""
+        return self.phases.get(self.current_phase)
+
+    @property
+    def phase_key(self) -> str:
+        """Return an identifier of the running phase (name and start)."""
+        return f"{self.current_phase}|{self.phase_start_date.isoformat()}"
+
+    @callback
+    def _async_entities_renamed(self, renamed: dict):
+        """Persist entity ids that were renamed in the entity registry."""
+        zones = rename_zone_entities(self.config.get(CONF_WATER_ZONES) or [], renamed)
+        renamed = {key: value for key, value in renamed.items() if key in TRACKED_KEYS}
+        if zones is not None:
+            renamed[CONF_WATER_ZONES] = zones
+        self.config.update(renamed)
+        opts = {**self.entry.options, **renamed}
+        # The reload listener sees the manager already matches and skips the reload
+        self.hass.config_entries.async_update_entry(self.entry, options=opts)
 
     def _get_config_value(self, key, default, type_func=str):
         val = self.config.get(key)
@@ -183,90 +467,171 @@ class GrowBoxManager:
         except (ValueError, TypeError):
             return default
 
-    async def _async_stop_all_devices(self):
+    def power_load(self) -> float:
+        """Return the watts the box draws right now (for the power budget)."""
+        pump_watts = self.runtime.watts.get("pump", 0.0)
+        zone_pumps = sum(
+            1 for zone in self.zones.values()
+            if zone.id != MAIN_ZONE and state_is_on(self.entities.state(zone.pump_key))
+        )
+        return self.runtime.load + zone_pumps * pump_watts
+
+    def _power_granted(self, actuator: str, entity_id: str) -> bool:
+        """Return True if the shared power budget lets entity_id switch on now."""
+        power: PowerBudget = self.hass.data[DATA_POWER]
+        return power.async_request(self.entry.entry_id, entity_id, self.runtime.watts.get(actuator, 0.0))
+
+    async def _async_stop_all_devices(self, snapshot: SensorSnapshot):
         """Turn off all managed devices if they are currently on."""
-        entities = [
-            self.config.get(CONF_LIGHT_ENTITY),
-            self.config.get(CONF_FAN_ENTITY),
-            self.config.get(CONF_PUMP_ENTITY),
-            self.config.get(CONF_HUMIDIFIER_ENTITY),
+        devices = [
+            (CONF_LIGHT_ENTITY, snapshot.light_on),
+            (CONF_FAN_ENTITY, snapshot.fan_on),
+            (CONF_PUMP_ENTITY, snapshot.pump_on),
+            (CONF_HUMIDIFIER_ENTITY, snapshot.humidifier_on),
         ]
+        for zone in self.zones.values():
+            if zone.id != MAIN_ZONE:
+                devices.append((zone.pump_key, state_is_on(self.entities.state(zone.pump_key))))
+            zone.pump_start_time = None
+            zone.pump_run_duration = None
+        self.hass.data[DATA_IRRIGATION].async_remove_entry(self.entry.entry_id)
         
-        for entity_id in entities:
-            if not entity_id:
-                continue
-            state = self._get_safe_state(entity_id)
-            # Use a slightly broader check for 'on' to handle various device classes
-            if state and state.state not in ["off", "unavailable", "unknown"]:
+        for key, is_on in devices:
+            entity_id = self.entities.entity_id(key)
+            if entity_id and is_on:
                 _LOGGER.info("Master Switch is OFF: Actively turning off %s", entity_id)
                 await self.hass.services.async_call("homeassistant", "turn_off", {"entity_id": entity_id})
 
+    @profiled
     async def _async_update_logic(self, now: datetime.datetime):
+        await self.async_load_logs()
+
+        # Every subsystem decides on the same, once-parsed inputs
+        snapshot = build_snapshot(self.entities, now)
+        self.snapshot = snapshot
+        self.anomalies.async_check(now)
+        _LOGGER.debug("Tick snapshot %s: %s", self.entry.title, snapshot)
+
         if not self.master_switch_on:
-            await self._async_stop_all_devices()
+            await self._async_stop_all_devices(snapshot)
+            self.trace.record(now.timestamp(), "master", "master_off", ACTION_OFF, 0.0, lambda: ({}, {}))
+            self._async_record_tick(snapshot, None)
+            self._async_publish_live_state()
             return
             
         # Isolate Light Logic
         try:
-            await self._async_update_light_logic(now)
+            await self._async_update_light_logic(now, snapshot)
         except Exception as e:
             _LOGGER.error("Error in Light Logic: %s", e)
 
         # Isolate Climate Logic
         try:
-            await self._async_update_climate_logic(now)
+            await self._async_update_climate_logic(now, snapshot)
         except Exception as e:
             _LOGGER.error("Error in Climate Logic: %s", e)
 
         # Isolate Water Logic
         try:
-            await self._async_update_water_logic(now)
+            await self._async_update_water_logic(now, snapshot)
         except Exception as e:
             _LOGGER.error("Error in Water Logic: %s", e)
 
+        has_climate = snapshot.temp is not None and snapshot.humidity is not None
+        self._async_record_tick(snapshot, self.vpd if has_climate and self.vpd > 0 else None)
+
         # Update Display Logic - Throttle to every 5 seconds
         try:
             now_utc = dt_util.utcnow()
             if self._last_display_update is None or (now_utc - self._last_display_update).total_seconds() >= 5:
-                await self._async_update_display_logic()
+                await self._async_update_display_logic(snapshot)
                 self._last_display_update = now_utc
         except Exception as e:
             _LOGGER.error("Error in Display Logic: %s", e)
 
-    async def _async_update_display_logic(self):
+        self._async_publish_live_state()
+
+    @callback
+    def _async_record_tick(self, snapshot: SensorSnapshot, vpd: float | None):
+        """Feed the tick into telemetry and the hourly statistics."""
+        self.telemetry.async_add_sample(snapshot, vpd)
+        self.hourly_stats.async_add_tick(snapshot, vpd)
+
+    def _build_live_state(self) -> dict:
+        """Return the compact live state pushed to the panel."""
+        snapshot = self.snapshot
+        return {
+            "master": self.master_switch_on,
+            "temp": round(snapshot.temp, 1) if snapshot.temp is not None else None,
+            "hum": round(snapshot.humidity, 1) if snapshot.humidity is not None else None,
+            "vpd": round(self.vpd, 2) if self.vpd > 0 else None,
+            "soil": round(snapshot.moisture) if snapshot.moisture is not None else None,
+            "light": snapshot.light_on,
+            "fan": snapshot.fan_on,
+            "pump": snapshot.pump_on,
+            "humidifier": snapshot.humidifier_on,
+            "phase": self.current_phase,
+            "days": self.days_in_phase,
+            "next_light": self.next_light_transition.isoformat() if self.next_light_transition else None,
+        }
+
+    def watering_predictions(self, zone_id: str = MAIN_ZONE) -> dict:
+        """Return the drying trend and pump gain predictions of a zone for the current phase."""
+        profile = self.phase_profile
+        zone = self.zones[zone_id]
+        return zone.watering.as_dict(
+            profile.target_moisture if zone.target_moisture is None else zone.target_moisture,
+            zone.pump_duration or profile.pump_duration,
+            dt_util.utcnow().timestamp(),
+        )
+
+    def box_config(self) -> dict:
+        """Return resolved entity ids and the effective setpoints of the current phase."""
+        profile = self.phase_profile
+        return {
+            "entities": {
+                **{key: self.entities.entity_id(key) for key in TRACKED_KEYS},
+                CONF_CAMERA_ENTITY: self.config.get(CONF_CAMERA_ENTITY),
+            },
+            "setpoints": {
+                "light_hours": profile.light_hours,
+                "light_start_hour": profile.light_start_hour,
+                "target_temp": profile.target_temp,
+                "target_humidity": profile.target_humidity,
+                "max_humidity": profile.max_humidity,
+                "target_moisture": profile.target_moisture,
+                "pump_duration": profile.pump_duration,
+                "vpd_min": profile.vpd_min,
+                "vpd_max": profile.vpd_max,
+                **self.climate_setpoints.as_dict(),
+            },
+            "phase": self.current_phase,
+            "phase_start_date": self.phase_start_date.isoformat() if self.phase_start_date else None,
+            "days_in_phase": self.days_in_phase,
+        }
+
+    @property
+    def live_state(self) -> dict:
+        """Return the last published live state."""
+        return self._live_state
+
+    @callback
+    def _async_publish_live_state(self):
+        """Push changed live values to panel subscribers."""
+        new_state = self._build_live_state()
+        changes = {k: v for k, v in new_state.items() if k not in self._live_state or self._live_state[k] != v}
+        if not changes:
+            return
+        self._live_state = new_state
+        async_dispatcher_send(self.hass, SIGNAL_LIVE_STATE, self.entry.entry_id, changes)
+
+    @profiled
+    async def _async_update_display_logic(self, snapshot: SensorSnapshot):
         """Send current state to ESPHome Display"""
-        # Find all display services available
-        esphome_services = self.hass.services.async_services().get("esphome", {})
-        
-        # We look for the base service name of ANY connected display (ignoring the _update_room_X suffix)
-        basenames = set()
-        for s in esphome_services:
-            if "growbox_display" in s and "_update_room_" in s:
-                basename = s.rsplit("_update_room_", 1)[0]
-                basenames.add(basename)
-                
-        if not basenames:
-             return
-             
-        # Determine the "Room ID" (1 to 5) for THIS specific Grow Box instance
-        # We do this by sorting all configured Local Grow Box entries by their creation/ID
-        # so they always get the same slot on the display
-        all_entries = self.hass.config_entries.async_entries(DOMAIN)
-        # Sort by entry_id to keep the assignment semi-stable
-        all_entries.sort(key=lambda x: x.entry_id)
-        
-        room_index = 1
-        for i, entry in enumerate(all_entries):
-            if entry.entry_id == self.entry.entry_id:
-                room_index = i + 1
-                break
-                
-        # If a user has more than 5 boxes, cap it at 5 since our display only supports 5 pages
-        if room_index > 5:
-            room_index = 5
-            
-        target_service_suffix = f"_update_room_{room_index}"
-             
+        # The shared scheduler owns the slot map and paces the service calls
+        scheduler: DisplayScheduler = self.hass.data[DATA_DISPLAY]
+        room_index = scheduler.async_slot(self.entry.entry_id)
+
         # Gather all current data
         # Use the name the user gave this Grow Box integration instance
         name = self.entry.title if self.entry and self.entry.title else f"Grow Box {room_index}"
@@ -274,53 +639,27 @@ class GrowBoxManager:
             name = name[:10] + "..."
 
         # Temp
-        temp_entity = self.config.get(CONF_TEMP_SENSOR)
-        temp_state = self._get_safe_state(temp_entity)
         temp_val = "--.-"
-        if temp_state:
-            try:
-                temp_val = f"{float(temp_state.state):.1f}"
-            except ValueError:
-                temp_val = str(temp_state.state)
+        if snapshot.temp is not None:
+            temp_val = f"{snapshot.temp:.1f}"
 
         # Hum
-        hum_entity = self.config.get(CONF_HUMIDITY_SENSOR)
-        hum_state = self._get_safe_state(hum_entity)
         hum_val = "--"
-        if hum_state:
-            try:
-                hum_val = f"{float(hum_state.state):.1f}"
-                if hum_val.endswith(".0"):
-                    hum_val = hum_val[:-2]
-            except ValueError:
-                hum_val = str(hum_state.state)
+        if snapshot.humidity is not None:
+            hum_val = f"{snapshot.humidity:.1f}"
+            if hum_val.endswith(".0"):
+                hum_val = hum_val[:-2]
 
         # Soil
-        soil_entity = self.config.get(CONF_MOISTURE_SENSOR)
-        soil_state = self._get_safe_state(soil_entity)
         soil_val = "--"
-        if soil_state:
-            try:
-                soil_val = f"{float(soil_state.state):.0f}"
-            except ValueError:
-                soil_val = str(soil_state.state)
+        if snapshot.moisture is not None:
+            soil_val = f"{snapshot.moisture:.0f}"
 
         # VPD is calculated globally in manager
         vpd_val = f"{self.vpd:.2f}" if self.vpd > 0 else "-.--"
 
-        # Light
-        light_entity = self.config.get(CONF_LIGHT_ENTITY)
-        light_state = self._get_safe_state(light_entity)
-        light_str = "Aus"
-        if light_state and light_state.state == "on":
-            light_str = "An"
-            
-        # Fan
-        fan_entity = self.config.get(CONF_FAN_ENTITY)
-        fan_state_obj = self._get_safe_state(fan_entity)
-        fan_str = "Aus"
-        if fan_state_obj and fan_state_obj.state == "on":
-            fan_str = "An"
+        light_str = "An" if snapshot.light_on else "Aus"
+        fan_str = "An" if snapshot.fan_on else "Aus"
 
         display_data = {
             "name": name,
@@ -332,54 +671,23 @@ class GrowBoxManager:
             "fan_state": fan_str
         }
 
-        # Fire and forget updating all connected screens
-        for basename in basenames:
-            service_name = f"{basename}{target_service_suffix}"
-            try:
-                await self.hass.services.async_call("esphome", service_name, display_data)
-            except HomeAssistantError as err:
-                _LOGGER.debug("Failed to update display %s: %s", service_name, err)
-            except Exception as err:
-                _LOGGER.error("Unexpected error updating display %s: %s", service_name, err)
-
-    async def _async_update_light_logic(self, now: datetime.datetime):
-        light_entity = self.config.get(CONF_LIGHT_ENTITY)
+        scheduler.async_update(self.entry.entry_id, display_data)
+
+    async def _async_update_light_logic(self, now: datetime.datetime, snapshot: SensorSnapshot):
+        started = time.perf_counter()
+        light_entity = self.entities.entity_id(CONF_LIGHT_ENTITY)
         if not light_entity:
             return
             
         # Check if light is also configured as fan (common conflict)
-        fan_entity = self.config.get(CONF_FAN_ENTITY)
+        fan_entity = self.entities.entity_id(CONF_FAN_ENTITY)
         if fan_entity and fan_entity == light_entity:
             _LOGGER.warning("CONFIGURATION ERROR: Light entity is same as Fan entity! This will cause toggling.")
 
-        light_hours = 0
         phase = self.current_phase
-
-        if phase == PHASE_SEEDLING:
-            light_hours = self._get_config_value(CONF_PHASE_SEEDLING_HOURS, 18, float)
-        elif phase == PHASE_VEGETATIVE:
-            light_hours = self._get_config_value(CONF_PHASE_VEGETATIVE_HOURS, 18, float)
-        elif phase == PHASE_FLOWERING:
-            light_hours = self._get_config_value(CONF_PHASE_FLOWERING_HOURS, 12, float)
-        elif phase == PHASE_DRYING:
-            light_hours = self._get_config_value(CONF_PHASE_DRYING_HOURS, 0, float)
-        elif phase == PHASE_CURING:
-            light_hours = self._get_config_value(CONF_PHASE_CURING_HOURS, 0, float)
-        elif phase == self.config.get(CONF_CUSTOM1_NAME):
-            light_hours = self._get_config_value(CONF_CUSTOM1_HOURS, 0, float)
-        elif phase == self.config.get(CONF_CUSTOM2_NAME):
-            light_hours = self._get_config_value(CONF_CUSTOM2_HOURS, 0, float)
-        elif phase == self.config.get(CONF_CUSTOM3_NAME):
-            light_hours = self._get_config_value(CONF_CUSTOM3_HOURS, 0, float)
-        else:
-             light_hours = PHASE_LIGHT_HOURS.get(phase, 12)
-
-        start_hour = self._get_config_value(CONF_LIGHT_START_HOUR, DEFAULT_LIGHT_START_HOUR, int)
-        
-        # Validate start_hour to prevent crash
-        if not (0 <= start_hour <= 23):
-             _LOGGER.warning("Invalid start_hour %s. Using default.", start_hour)
-             start_hour = 18
+        profile = self.phase_profile
+        light_hours = profile.light_hours
+        start_hour = profile.light_start_hour
 
         now_local = dt_util.now()
         start_time = now_local.replace(hour=int(start_hour), minute=0, second=0, microsecond=0)
@@ -393,211 +701,454 @@ class GrowBoxManager:
         duration = float(light_hours) * 3600
         is_light_time = 0 <= elapsed < duration
 
+        if duration <= 0 or duration >= 86400:
+            self.next_light_transition = None
+        elif is_light_time:
+            self.next_light_transition = start_time + timedelta(seconds=duration)
+        else:
+            self.next_light_transition = start_time + timedelta(days=1)
+
         _LOGGER.debug(
             "Light Logic: Phase=%s, Hours=%s, Start=%s, Now=%s, Elapsed=%.1f, Duration=%.1f, IsLightTime=%s", 
             phase, light_hours, start_hour, now_local.strftime("%H:%M"), elapsed, duration, is_light_time
         )
 
-        current_state = self._get_safe_state(light_entity)
-        if not current_state:
-            return
-            
-        if current_state.state in ["unavailable", "unknown"]:
+        rule = "light_period" if is_light_time else "dark_period"
+        trace = lambda rule, action: self.trace.record(
+            now.timestamp(), "light", rule, action, (time.perf_counter() - started) * 1000,
+            lambda: (
+                {"time": now_local.strftime("%H:%M"), "elapsed": round(elapsed), "light_on": snapshot.light_on},
+                {"phase": phase, "light_hours": light_hours, "start_hour": start_hour,
+                 "ramp": self.light_ramp.as_dict() if self.light_ramp else None},
+            ),
+        )
+
+        if snapshot.light_on is None:
             _LOGGER.debug("Light entity %s is unavailable. Skipping.", light_entity)
+            trace("unavailable", ACTION_KEEP)
+            return
+
+        is_on = snapshot.light_on
+
+        # Dimmable lights fade in and out over the first and last minutes of the window
+        ramp_seconds = min(self._get_config_value(CONF_LIGHT_RAMP, 0, float) * 60, duration / 2) if 0 < duration < 86400 else 0
+        mode = ramp_mode(self.entities.state(CONF_LIGHT_ENTITY)) if ramp_seconds > 0 and is_light_time else None
+        kind = None
+        if mode and elapsed < ramp_seconds:
+            kind, ramp_start = RAMP_SUNRISE, start_time
+        elif mode and elapsed >= duration - ramp_seconds:
+            kind, ramp_start = RAMP_SUNSET, start_time + timedelta(seconds=duration - ramp_seconds)
+        if kind is None:
+            self.light_ramp = None
+        elif kind == RAMP_SUNRISE or is_on:
+            if not is_on:
+                last_changed = snapshot.light_changed
+                if last_changed and (dt_util.utcnow() - last_changed).total_seconds() < 10:
+                    trace("manual_override", ACTION_KEEP)
+                    return
+                if not self._power_granted("light", light_entity):
+                    trace("power_wait", ACTION_KEEP)
+                    return
+            ramp = self.light_ramp
+            if not is_on or ramp is None or not ramp.matches(kind, mode, ramp_start):
+                ramp = self.light_ramp = LightRamp(
+                    kind, mode, ramp_start, ramp_start + timedelta(seconds=ramp_seconds), now_local
+                )
+            step = ramp.due(now_local)
+            if step is not None:
+                await self.hass.services.async_call("light", "turn_on", step.service_data(light_entity))
+            if not is_on:
+                _LOGGER.info("Light should be ON. Starting sunrise over %.0fs.", ramp_seconds)
+                self.add_log(f"Licht eingeschaltet (Sonnenaufgang, {ramp_seconds / 60:.0f} min)")
+                trace(kind, ACTION_ON)
+            else:
+                trace(kind, ACTION_KEEP)
             return
 
-        is_on = current_state.state == "on"
-        
         if is_light_time and not is_on:
             # Check Manual Override (Debounce 15 mins)
-            last_changed = current_state.last_changed
+            last_changed = snapshot.light_changed
             if last_changed:
                 diff = (dt_util.utcnow() - last_changed).total_seconds()
                 if diff < 10:
                     _LOGGER.info("Light manual override detected (changed %.0fs ago). Skipping auto-control.", diff)
+                    trace("manual_override", ACTION_KEEP)
                     return
 
+            if not self._power_granted("light", light_entity):
+                trace("power_wait", ACTION_KEEP)
+                return
             _LOGGER.info("Light should be ON. Turning ON.")
             self.add_log("Licht eingeschaltet (Automatik)")
             await self.hass.services.async_call("homeassistant", "turn_on", {"entity_id": light_entity})
+            trace(rule, ACTION_ON)
         elif not is_light_time and is_on:
             # Check Manual Override (Debounce 15 mins)
-            last_changed = current_state.last_changed
+            last_changed = snapshot.light_changed
             if last_changed:
                 diff = (dt_util.utcnow() - last_changed).total_seconds()
                 if diff < 900:
                     _LOGGER.info("Light manual override detected (changed %.0fs ago). Skipping auto-control.", diff)
+                    trace("manual_override", ACTION_KEEP)
                     return
 
             _LOGGER.info("Light should be OFF. Turning OFF.")
             self.add_log("Licht ausgeschaltet (Automatik)")
             await self.hass.services.async_call("homeassistant", "turn_off", {"entity_id": light_entity})
+            trace(rule, ACTION_OFF)
+        else:
+            trace(rule, ACTION_KEEP)
+
+    async def _async_update_water_logic(self, now: datetime.datetime, snapshot: SensorSnapshot):
+        for zone in self.zones.values():
+            try:
+                await self._async_update_zone(now, snapshot, zone)
+            except Exception as e:
+                _LOGGER.error("Error in Water Logic (zone %s): %s", zone.id, e)
 
-    async def _async_update_water_logic(self, now: datetime.datetime):
-        pump_entity = self.config.get(CONF_PUMP_ENTITY)
+    async def _async_update_zone(self, now: datetime.datetime, snapshot: SensorSnapshot, zone: WaterZone):
+        pump_entity = self.entities.entity_id(zone.pump_key)
         if not pump_entity:
             return
 
-        pump_state = self._get_safe_state(pump_entity)
-        if not pump_state:
-            return
-            
-        if pump_state.state in ["unavailable", "unknown"]:
+        started = time.perf_counter()
+        irrigation: IrrigationScheduler = self.hass.data[DATA_IRRIGATION]
+        entry_id = self.entry.entry_id
+        profile = self.phase_profile
+        duration = zone.pump_duration or profile.pump_duration
+        target = profile.target_moisture if zone.target_moisture is None else zone.target_moisture
+        if zone.id == MAIN_ZONE:
+            pump_on, val = snapshot.pump_on, snapshot.moisture
+        else:
+            pump_on = state_is_on(self.entities.state(zone.pump_key))
+            val = state_as_float(self.entities.state(zone.moisture_key))
+        trace = lambda rule, action: self.trace.record(
+            now.timestamp(), zone.subsystem, rule, action, (time.perf_counter() - started) * 1000,
+            lambda: (
+                {"moisture": val, "pump_on": pump_on,
+                 "pump_start": zone.pump_start_time.isoformat() if zone.pump_start_time else None,
+                 "last_stop": zone.last_pump_stop_time.isoformat() if zone.last_pump_stop_time else None,
+                 "run_duration": zone.pump_run_duration,
+                 "queued": irrigation.is_waiting(entry_id, zone.id)},
+                {"target_moisture": target, "pump_duration": duration, "soak": zone.soak},
+            ),
+        )
+
+        if pump_on is None:
+            irrigation.async_cancel(entry_id, zone.id)
+            trace("unavailable", ACTION_KEEP)
             return
 
-        is_on = pump_state.state == "on"
-        duration = self._get_config_value(CONF_PUMP_DURATION, DEFAULT_PUMP_DURATION, float)
-        
-        if is_on:
+        if pump_on:
             # Start tracking if not already
-            if not self.pump_start_time:
-                 self.pump_start_time = now
-            
-            elapsed = (now - self.pump_start_time).total_seconds()
-            
+            if not zone.pump_start_time:
+                 zone.pump_start_time = now
+
+            elapsed = (now - zone.pump_start_time).total_seconds()
+            # Runs started by the predictive mode are sized, manual ones use the phase duration
+            if zone.pump_run_duration is not None:
+                 duration = zone.pump_run_duration
+
             if elapsed >= duration:
-                 _LOGGER.info("Pump ran for %.1fs. Turning OFF.", elapsed)
-                 self.add_log(f"Pumpe ausgeschaltet (Lief {elapsed:.1f}s)")
+                 _LOGGER.info("Pump %s ran for %.1fs. Turning OFF.", pump_entity, elapsed)
+                 self.add_log(f"{zone.label} ausgeschaltet (Lief {elapsed:.1f}s)")
                  await self.hass.services.async_call("homeassistant", "turn_off", {"entity_id": pump_entity})
-                 self.last_pump_stop_time = now
-                 self.pump_start_time = None
-        else:
-            # Pump is OFF
-            self.pump_start_time = None
-            
-            # Soak Time Check (15 min)
-            if self.last_pump_stop_time:
-                 time_off = (now - self.last_pump_stop_time).total_seconds()
-                 if time_off < 900: # 900s = 15 min
-                      return
-
-            # Moisture Check
-            moisture_entity = self.config.get(CONF_MOISTURE_SENSOR)
-            if not moisture_entity:
-                return
-                
-            state = self._get_safe_state(moisture_entity)
-            if not state or state.state in ["unavailable", "unknown"]:
-                return
-            
-            try:
-                val = float(state.state)
-                target = self._get_config_value(CONF_TARGET_MOISTURE, DEFAULT_TARGET_MOISTURE, float)
-                if val < target:
-                     _LOGGER.info("Moisture low (%.1f < %.1f). Starting Pump.", val, target)
-                     self.add_log(f"Pumpe eingeschaltet (Bodenfeuchte {val}% < {target}%)")
-                     await self.hass.services.async_call("homeassistant", "turn_on", {"entity_id": pump_entity})
-                     self.pump_start_time = now
-            except ValueError:
-                pass
+                 zone.last_pump_stop_time = now
+                 zone.pump_start_time = None
+                 zone.pump_run_duration = None
+                 irrigation.async_release(entry_id, zone.id)
+                 trace("duration_reached", ACTION_OFF)
+            else:
+                 trace("pumping", ACTION_KEEP)
+            return
 
-    async def _async_update_climate_logic(self, now: datetime.datetime):
-        temp_entity = self.config.get(CONF_TEMP_SENSOR)
-        humid_entity = self.config.get(CONF_HUMIDITY_SENSOR)
-        fan_entity = self.config.get(CONF_FAN_ENTITY)
-        
-        # Climate Settings
-        target_temp = self._get_config_value(CONF_TARGET_TEMP, DEFAULT_TARGET_TEMP, float)
-        min_humidity = self._get_config_value(CONF_MIN_HUMIDITY, DEFAULT_MIN_HUMIDITY, float)
-        max_humidity = self._get_config_value(CONF_MAX_HUMIDITY, DEFAULT_MAX_HUMIDITY, float)
-        target_humidity = self._get_config_value(CONF_TARGET_HUMIDITY, DEFAULT_TARGET_HUMIDITY, float)
-        humidity_hysteresis = self._get_config_value(CONF_HUMIDITY_HYSTERESIS, DEFAULT_HUMIDITY_HYSTERESIS, float)
-        temp_hysteresis = self._get_config_value(CONF_TEMP_HYSTERESIS, DEFAULT_TEMP_HYSTERESIS, float)
-        fan_hysteresis = self._get_config_value(CONF_FAN_HYSTERESIS, DEFAULT_FAN_HYSTERESIS, float)
-        
-        humidifier_entity = self.config.get(CONF_HUMIDIFIER_ENTITY)
+        if zone.pump_start_time is not None:
+            # Switched off elsewhere before the duration was reached
+            zone.last_pump_stop_time = now
+            irrigation.async_release(entry_id, zone.id)
+            self._async_save_state()
+        zone.pump_start_time = None
+        zone.pump_run_duration = None
+
+        # Soak Time Check
+        if (now - zone.last_pump_stop_time).total_seconds() < zone.soak:
+            trace("soak", ACTION_KEEP)
+            return
 
-        temp_state = self._get_safe_state(temp_entity)
-        humid_state = self._get_safe_state(humid_entity)
+        # Moisture Check
+        if val is None:
+            irrigation.async_cancel(entry_id, zone.id)
+            trace("moisture_unavailable", ACTION_KEEP)
+            return
+        if zone.id == MAIN_ZONE and self.safe_hold and self.anomalies.problem("moisture"):
+            irrigation.async_cancel(entry_id, zone.id)
+            trace("sensor_anomaly", ACTION_KEEP)
+            return
 
-        if not temp_state or not humid_state:
-             if not temp_state: _LOGGER.debug("Climate logic halted: Temp sensor %s not ready", temp_entity)
-             if not humid_state: _LOGGER.debug("Climate logic halted: Humidity sensor %s not ready", humid_entity)
+        if val < target:
+            rule = "moisture_low"
+            run = zone.watering.duration_for(target, val, duration) if self.predictive_watering else None
+            message = f"{zone.label} eingeschaltet (Bodenfeuchte {val}% < {target}%)"
+        else:
+            eta = zone.watering.seconds_until(target, now.timestamp()) if self.predictive_watering else None
+            if eta is None or eta > WATERING_LEAD:
+                irrigation.async_cancel(entry_id, zone.id)
+                trace("moisture_ok", ACTION_KEEP)
+                return
+            # Water before the crossing, the sensor lags behind the root zone
+            rule = "moisture_predicted"
+            run = zone.watering.duration_for(target, val, duration)
+            message = f"{zone.label} eingeschaltet (Vorhersage: {target}% in {eta / 60:.0f} min, {run:.0f}s)"
+
+        # The scheduler starts the pump once a slot is free, driest zone first
+        irrigation.async_request(
+            entry_id, zone.id, target - val, run or duration,
+            lambda: self._async_start_zone(zone, rule, run, message),
+        )
+        trace(f"{rule}_queued", ACTION_KEEP)
+
+    async def _async_start_zone(self, zone: WaterZone, rule: str, run: float | None, message: str) -> bool:
+        """Turn a zone's pump on once the irrigation scheduler grants the slot."""
+        pump_entity = self.entities.entity_id(zone.pump_key)
+        if not self.master_switch_on or not pump_entity or zone.pump_start_time is not None:
+            return False
+        if not self._power_granted("pump", pump_entity):
+            # Back into the irrigation queue, the zone asks again on the next tick
+            return False
+        now = dt_util.now()
+        started = time.perf_counter()
+        _LOGGER.info("Starting Pump %s (%s).", pump_entity, rule)
+        self.add_log(message)
+        await self.hass.services.async_call("homeassistant", "turn_on", {"entity_id": pump_entity})
+        zone.pump_start_time = now
+        zone.pump_run_duration = run
+        self.trace.record(
+            now.timestamp(), zone.subsystem, rule, ACTION_ON, (time.perf_counter() - started) * 1000,
+            lambda: ({"run_duration": run}, {"soak": zone.soak}),
+        )
+        return True
+
+    async def _async_update_climate_logic(self, now: datetime.datetime, snapshot: SensorSnapshot):
+        started = time.perf_counter()
+        temp_entity = self.entities.entity_id(CONF_TEMP_SENSOR)
+        humid_entity = self.entities.entity_id(CONF_HUMIDITY_SENSOR)
+
+        current_temp = snapshot.temp
+        current_humid = snapshot.humidity
+
+        if current_temp is None or current_humid is None:
+             if current_temp is None: _LOGGER.debug("Climate logic halted: Temp sensor %s not ready", temp_entity)
+             if current_humid is None: _LOGGER.debug("Climate logic halted: Humidity sensor %s not ready", humid_entity)
+             details = lambda: ({"temp": current_temp, "humidity": current_humid}, {})
+             for subsystem in ("fan", "humidifier"):
+                 self.trace.record(now.timestamp(), subsystem, "sensor_unavailable", ACTION_KEEP, 0.0, details)
              return
 
-        try:
-            current_temp = float(temp_state.state)
-            current_humid = float(humid_state.state)
-        except ValueError:
+        if self.safe_hold and (self.anomalies.problem("temp") or self.anomalies.problem("humidity")):
+            await self._async_hold_climate(now, snapshot, started)
             return
 
-        svp = 0.61078 * math.exp((17.27 * current_temp) / (current_temp + 237.3))
-        self.vpd = svp * (1 - current_humid / 100)
-
-        if fan_entity:
-            fan_state = self._get_safe_state(fan_entity)
-            if fan_state:
-                is_fan_on = fan_state.state == "on"
-                should_fan_on = False
-
-                if current_temp > target_temp or current_humid > max_humidity:
-                    should_fan_on = True
-                elif current_temp < (target_temp - temp_hysteresis) and current_humid < (max_humidity - fan_hysteresis):
-                    should_fan_on = False
-                else:
-                     should_fan_on = is_fan_on
-
-                if should_fan_on and not is_fan_on:
-                     self.add_log(f"Abluft eingeschaltet (T={current_temp}°, H={current_humid}%)")
-                     await self.hass.services.async_call("homeassistant", "turn_on", {"entity_id": fan_entity})
-                elif not should_fan_on and is_fan_on:
-                     self.add_log(f"Abluft ausgeschaltet (T={current_temp}°, H={current_humid}%)")
-                     await self.hass.services.async_call("homeassistant", "turn_off", {"entity_id": fan_entity})
-
-        # Humidifier Pulse Logic
-        if not humidifier_entity:
+        fan_on = snapshot.fan_on if self.entities.entity_id(CONF_FAN_ENTITY) else None
+        humidifier_on = snapshot.humidifier_on if self.entities.entity_id(CONF_HUMIDIFIER_ENTITY) else None
+        if humidifier_on is False:
+            self.humidifier_start_time = None
+        # Soak Time Check (10 min)
+        soak_done = (now - self.last_humidifier_stop_time).total_seconds() >= 600 if self.last_humidifier_stop_time else True
+
+        batch: ClimateBatchEngine | None = self.hass.data.get(DATA_CLIMATE_BATCH)
+        if batch and batch.active:
+            # Decided together with all other boxes, transitions come back via async_apply_climate.
+            # The VPD is needed now for telemetry and the live state of this tick.
+            self.vpd = SVP_TABLE.vpd(current_temp, current_humid, self.climate_setpoints.leaf_offset)
+            batch.async_submit(self, now, snapshot, fan_on, humidifier_on, soak_done)
             return
 
-        humidifier_state = self._get_safe_state(humidifier_entity)
-        if not humidifier_state:
+        decision = decide_climate(self.climate_setpoints, current_temp, current_humid, fan_on, humidifier_on, soak_done)
+        await self.async_apply_climate(now, snapshot, decision, started)
+
+    async def _async_hold_climate(self, now: datetime.datetime, snapshot: SensorSnapshot, started: float):
+        """Ventilate and stop humidifying while a climate sensor looks faulty."""
+        fan_entity = self.entities.entity_id(CONF_FAN_ENTITY)
+        fan_action = ACTION_KEEP
+        if fan_entity and snapshot.fan_on is False and self._power_granted("fan", fan_entity):
+            await self.hass.services.async_call("homeassistant", "turn_on", {"entity_id": fan_entity})
+            fan_action = ACTION_ON
+        humidifier_entity = self.entities.entity_id(CONF_HUMIDIFIER_ENTITY)
+        humidifier_action = ACTION_KEEP
+        if humidifier_entity and snapshot.humidifier_on:
+            await self.hass.services.async_call("homeassistant", "turn_off", {"entity_id": humidifier_entity})
+            self.last_humidifier_stop_time = now
+            self.humidifier_start_time = None
+            self._async_save_state()
+            humidifier_action = ACTION_OFF
+        details = lambda: (
+            {"temp": snapshot.temp, "humidity": snapshot.humidity, "problems": dict(self.anomalies.problems)}, {},
+        )
+        latency = (time.perf_counter() - started) * 1000
+        self.trace.record(now.timestamp(), "fan", "sensor_anomaly", fan_action, latency, details)
+        self.trace.record(now.timestamp(), "humidifier", "sensor_anomaly", humidifier_action, latency, details)
+
+    @callback
+    def _async_anomalies_changed(self):
+        problems = self.anomalies.problems
+        if not problems:
+            self.add_log("Sensoren wieder plausibel")
             return
+        text = ", ".join(f"{ANOMALY_LABELS[channel]}: {'/'.join(reasons)}" for channel, reasons in problems.items())
+        hold = " - Sicherer Zustand aktiv" if self.safe_hold else ""
+        _LOGGER.warning("Sensor anomaly in %s: %s", self.entry.title, text)
+        self.add_log(f"Sensorproblem ({text}){hold}")
+
+    def _compile_climate_setpoints(self) -> ClimateSetpoints:
+        """Collect the climate parameters of the current phase (setpoints per phase, hysteresis per box)."""
+        profile = self.phase_profile
+        return ClimateSetpoints(
+            vpd_mode=self._get_config_value(CONF_CLIMATE_MODE, CLIMATE_MODE_HUMIDITY) == CLIMATE_MODE_VPD,
+            target_temp=profile.target_temp,
+            max_humidity=profile.max_humidity,
+            target_humidity=profile.target_humidity,
+            humidity_hysteresis=self._get_config_value(CONF_HUMIDITY_HYSTERESIS, DEFAULT_HUMIDITY_HYSTERESIS, float),
+            temp_hysteresis=self._get_config_value(CONF_TEMP_HYSTERESIS, DEFAULT_TEMP_HYSTERESIS, float),
+            fan_hysteresis=self._get_config_value(CONF_FAN_HYSTERESIS, DEFAULT_FAN_HYSTERESIS, float),
+            leaf_offset=self._get_config_value(CONF_LEAF_TEMP_OFFSET, DEFAULT_LEAF_TEMP_OFFSET, float),
+            vpd_min=profile.vpd_min,
+            vpd_max=profile.vpd_max,
+            vpd_hysteresis=self._get_config_value(CONF_VPD_HYSTERESIS, DEFAULT_VPD_HYSTERESIS, float),
+        )
 
-        is_humidifier_on = humidifier_state.state not in ["off", "unavailable", "unknown"]
+    async def async_apply_climate(
+        self, now: datetime.datetime, snapshot: SensorSnapshot, decision: ClimateDecision, started: float | None = None
+    ):
+        """Switch fan and humidifier as decided and keep the humidifier timers."""
+        if started is None:
+            started = time.perf_counter()
+        self.vpd = decision.vpd
+        sp = self.climate_setpoints
+        current_temp = snapshot.temp
+        current_humid = snapshot.humidity
+        vpd_text = f"VPD={decision.vpd:.2f}, " if sp.vpd_mode else ""
+
+        fan_entity = self.entities.entity_id(CONF_FAN_ENTITY)
+        fan_action, fan_rule = decision.fan, decision.fan_rule
+        if fan_action == TURN_ON and not self._power_granted("fan", fan_entity):
+            fan_action, fan_rule = KEEP, "power_wait"
+        if fan_action == TURN_ON:
+            self.add_log(f"Abluft eingeschaltet ({vpd_text}T={current_temp}°, H={current_humid}%)")
+            await self.hass.services.async_call("homeassistant", "turn_on", {"entity_id": fan_entity})
+        elif fan_action == TURN_OFF:
+            self.add_log(f"Abluft ausgeschaltet ({vpd_text}T={current_temp}°, H={current_humid}%)")
+            await self.hass.services.async_call("homeassistant", "turn_off", {"entity_id": fan_entity})
+        self._trace_climate(now, snapshot, decision, "fan", fan_action, fan_rule, started)
 
-        if is_humidifier_on:
-             if current_humid >= target_humidity:
-                  _LOGGER.info("Humidity reached target (%.1f >= %.1f). Turning OFF.", current_humid, target_humidity)
-                  self.add_log(f"Luftbefeuchter ausgeschaltet (H={current_humid}% >= {target_humidity}%)")
-                  await self.hass.services.async_call("homeassistant", "turn_off", {"entity_id": humidifier_entity})
-                  self.last_humidifier_stop_time = now
-                  self.humidifier_start_time = None
-        else:
-             # Humidifier is OFF
-             self.humidifier_start_time = None
-             
-             # Soak Time Check (10 min)
-             if self.last_humidifier_stop_time:
-                 time_off = (now - self.last_humidifier_stop_time).total_seconds()
-                 if time_off < 600: # 600s = 10 min
-                      return
-
-             # Sensor Check
-             # Humidifier starts at target - hysteresis
-             start_threshold = target_humidity - humidity_hysteresis
-             if current_humid < start_threshold:
-                  _LOGGER.info("Humidity low (%.1f < %.1f). Starting Humidifier.", current_humid, start_threshold)
-                  self.add_log(f"Luftbefeuchter eingeschaltet (H={current_humid}% < {start_threshold}%)")
-                  await self.hass.services.async_call("homeassistant", "turn_on", {"entity_id": humidifier_entity})
-                  self.humidifier_start_time = now
+        # Humidifier Pulse Logic
+        humidifier_entity = self.entities.entity_id(CONF_HUMIDIFIER_ENTITY)
+        if not humidifier_entity or snapshot.humidifier_on is None:
+            return
+
+        humidifier_action, humidifier_rule = decision.humidifier, decision.humidifier_rule
+        if humidifier_action == TURN_ON and not self._power_granted("humidifier", humidifier_entity):
+            humidifier_action, humidifier_rule = KEEP, "power_wait"
+        if humidifier_action == TURN_OFF:
+            if sp.vpd_mode:
+                vpd_target = (sp.vpd_min + sp.vpd_max) / 2
+                _LOGGER.info("VPD reached target (%.2f <= %.2f). Turning OFF humidifier.", decision.vpd, vpd_target)
+                self.add_log(f"Luftbefeuchter ausgeschaltet (VPD={decision.vpd:.2f} <= {vpd_target:.2f})")
+            else:
+                _LOGGER.info("Humidity reached target (%.1f >= %.1f). Turning OFF.", current_humid, sp.target_humidity)
+                self.add_log(f"Luftbefeuchter ausgeschaltet (H={current_humid}% >= {sp.target_humidity}%)")
+            await self.hass.services.async_call("homeassistant", "turn_off", {"entity_id": humidifier_entity})
+            self.last_humidifier_stop_time = now
+            self.humidifier_start_time = None
+        elif humidifier_action == TURN_ON:
+            if sp.vpd_mode:
+                _LOGGER.info("VPD high (%.2f > %.2f). Starting Humidifier.", decision.vpd, sp.vpd_max)
+                self.add_log(f"Luftbefeuchter eingeschaltet (VPD={decision.vpd:.2f} > {sp.vpd_max:.2f})")
+            else:
+                start_threshold = sp.target_humidity - sp.humidity_hysteresis
+                _LOGGER.info("Humidity low (%.1f < %.1f). Starting Humidifier.", current_humid, start_threshold)
+                self.add_log(f"Luftbefeuchter eingeschaltet (H={current_humid}% < {start_threshold}%)")
+            await self.hass.services.async_call("homeassistant", "turn_on", {"entity_id": humidifier_entity})
+            self.humidifier_start_time = now
+        self._trace_climate(now, snapshot, decision, "humidifier", humidifier_action, humidifier_rule, started)
+
+    @callback
+    def async_record_climate(
+        self, now: datetime.datetime, snapshot: SensorSnapshot, decision: ClimateDecision, started: float
+    ):
+        """Keep a decision without transitions (the batch path of async_apply_climate)."""
+        self.vpd = decision.vpd
+        self._trace_climate(now, snapshot, decision, "fan", KEEP, decision.fan_rule, started)
+        self._trace_climate(now, snapshot, decision, "humidifier", KEEP, decision.humidifier_rule, started)
+
+    def _trace_climate(self, now, snapshot, decision, subsystem, action, rule, started):
+        if not rule or rule == "unavailable":
+            return
+        self.trace.record(
+            now.timestamp(), subsystem, rule,
+            ACTION_ON if action == TURN_ON else ACTION_OFF if action == TURN_OFF else ACTION_KEEP,
+            (time.perf_counter() - started) * 1000,
+            lambda: (
+                {"temp": snapshot.temp, "humidity": snapshot.humidity, "vpd": round(decision.vpd, 3),
+                 "fan_on": snapshot.fan_on, "humidifier_on": snapshot.humidifier_on},
+                self.climate_setpoints.as_dict(),
+            ),
+        )
 
     def set_master_switch(self, state: bool):
         self.master_switch_on = state
-        self.hass.async_create_task(self._async_update_logic(dt_util.now()))
+        # Before the staggered start the first tick picks this up
+        if self._started:
+            self.hass.async_create_task(self._async_update_logic(dt_util.now()))
 
     def set_phase(self, phase: str):
         self.current_phase = phase
-        self.hass.async_create_task(self._async_update_logic(dt_util.now()))
+        self.climate_setpoints = self._compile_climate_setpoints()
+        if self._started:
+            self.runtime.async_set_phase(self.phase_key)
+            self.hass.async_create_task(self._async_update_logic(dt_util.now()))
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     await hass.http.async_register_static_paths([
         StaticPathConfig("/local_grow_box", hass.config.path("custom_components/local_grow_box/frontend"), True)
     ])
+    # Version the module URL by content hash so browsers only re-download on real changes
+    asset = await hass.async_add_executor_job(
+        load_panel_asset, hass.config.path("custom_components/local_grow_box/frontend", PANEL_FILENAME)
+    )
+    hass.http.register_view(GrowBoxPanelView(asset))
+    hass.http.register_view(GrowExportView())
+    batch = ClimateBatchEngine(hass)
+    batch.async_setup()
+    hass.data[DATA_CLIMATE_BATCH] = batch
+    scheduler = DisplayScheduler(hass)
+    await scheduler.async_setup()
+    hass.data[DATA_DISPLAY] = scheduler
+    irrigation = IrrigationScheduler(hass)
+    await irrigation.async_setup()
+    hass.data[DATA_IRRIGATION] = irrigation
+    power = PowerBudget(hass)
+    await power.async_setup()
+    hass.data[DATA_POWER] = power
+
+    async def _async_profile(call: ServiceCall) -> None:
+        await async_handle_profile(hass, call)
+
+    hass.services.async_register(DOMAIN, SERVICE_PROFILE, _async_profile, schema=SERVICE_PROFILE_SCHEMA)
+
+    async def _async_loadtest(call: ServiceCall) -> None:
+        await async_handle_loadtest(hass, call, {
+            "get_config": ws_get_config,
+            "get_logs": ws_get_logs,
+            "update_config": ws_update_config,
+            "upload_image": ws_upload_image,
+        })
+
+    hass.services.async_register(DOMAIN, SERVICE_LOADTEST, _async_loadtest, schema=SERVICE_LOADTEST_SCHEMA)
     img_path = hass.config.path("www", "local_grow_box_images")
-    if not os.path.exists(img_path):
-        os.makedirs(img_path)
+    await hass.async_add_executor_job(lambda: os.makedirs(img_path, exist_ok=True))
     await panel_custom.async_register_panel(
         hass, webcomponent_name="local-grow-box-panel", frontend_url_path="grow-room",
-        module_url=f"/local_grow_box/local-grow-box-panel.js?v={int(dt_util.now().timestamp())}",
+        module_url=asset.url,
         sidebar_title="Grow Room", sidebar_icon="mdi:sprout", require_admin=False,
     )
 
@@ -607,13 +1158,31 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
         websocket_api.async_register_command(hass, ws_upload_image)
         websocket_api.async_register_command(hass, ws_update_config)
         websocket_api.async_register_command(hass, ws_get_config)
+        websocket_api.async_register_command(hass, ws_get_box)
         websocket_api.async_register_command(hass, ws_get_logs)
+        websocket_api.async_register_command(hass, ws_subscribe_state)
+        websocket_api.async_register_command(hass, ws_get_telemetry)
+        websocket_api.async_register_command(hass, ws_get_runtime)
+        websocket_api.async_register_command(hass, ws_reset_runtime)
+        websocket_api.async_register_command(hass, ws_get_phases)
+        websocket_api.async_register_command(hass, ws_set_phase_profile)
+        websocket_api.async_register_command(hass, ws_delete_phase_profile)
+        websocket_api.async_register_command(hass, ws_get_grow_plan)
+        websocket_api.async_register_command(hass, ws_set_grow_plan)
+        websocket_api.async_register_command(hass, ws_get_trace)
+        websocket_api.async_register_command(hass, ws_get_irrigation)
+        websocket_api.async_register_command(hass, ws_set_irrigation)
+        websocket_api.async_register_command(hass, ws_get_water_zones)
+        websocket_api.async_register_command(hass, ws_set_water_zones)
+        websocket_api.async_register_command(hass, ws_get_power)
+        websocket_api.async_register_command(hass, ws_set_power)
     except Exception as e:
         _LOGGER.warning("Failed to register websocket commands in async_setup (might be duplicate): %s", e)
     
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    started = time.monotonic()
     hass.data.setdefault(DOMAIN, {})
     
     # FAILSAFE: Ensure commands are registered even if async_setup didn't run or failed
@@ -621,23 +1190,63 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         websocket_api.async_register_command(hass, ws_upload_image)
         websocket_api.async_register_command(hass, ws_update_config)
         websocket_api.async_register_command(hass, ws_get_config)
+        websocket_api.async_register_command(hass, ws_get_box)
         websocket_api.async_register_command(hass, ws_get_logs)
+        websocket_api.async_register_command(hass, ws_subscribe_state)
+        websocket_api.async_register_command(hass, ws_get_telemetry)
+        websocket_api.async_register_command(hass, ws_get_runtime)
+        websocket_api.async_register_command(hass, ws_reset_runtime)
+        websocket_api.async_register_command(hass, ws_get_phases)
+        websocket_api.async_register_command(hass, ws_set_phase_profile)
+        websocket_api.async_register_command(hass, ws_delete_phase_profile)
+        websocket_api.async_register_command(hass, ws_get_grow_plan)
+        websocket_api.async_register_command(hass, ws_set_grow_plan)
+        websocket_api.async_register_command(hass, ws_get_trace)
+        websocket_api.async_register_command(hass, ws_get_irrigation)
+        websocket_api.async_register_command(hass, ws_set_irrigation)
+        websocket_api.async_register_command(hass, ws_get_water_zones)
+        websocket_api.async_register_command(hass, ws_set_water_zones)
+        websocket_api.async_register_command(hass, ws_get_power)
+        websocket_api.async_register_command(hass, ws_set_power)
     except Exception:
         pass # Expected if already registered
 
     manager = GrowBoxManager(hass, entry)
+    slot = len(hass.data[DOMAIN])
     hass.data[DOMAIN][entry.entry_id] = manager
-    await manager.async_setup()
+    await manager.async_setup(slot)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    manager.startup_timings["setup_entry"] = round(time.monotonic() - started, 4)
+    _LOGGER.debug(
+        "Grow box %s set up in %.3fs, first tick in %.2fs",
+        entry.title, manager.startup_timings["setup_entry"], manager.startup_timings["first_tick_delay"],
+    )
     return True
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     manager = hass.data[DOMAIN].pop(entry.entry_id)
     manager.async_unload()
+    # Written before returning, so a reload continues the state, runtime totals and open telemetry buckets
+    await manager.async_write_state()
+    await manager.runtime.async_unload()
+    await manager.telemetry.async_unload()
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete stored telemetry and runtime counters when a grow box is removed."""
+    await hass.async_add_executor_job(TelemetryStore(hass, entry.entry_id).remove)
+    await RuntimeCounters(hass, entry.entry_id, None, {}).async_remove()
+    await Store(hass, STATE_STORAGE_VERSION, f"{DOMAIN}_state_{entry.entry_id}").async_remove()
+    if DATA_DISPLAY in hass.data:
+        hass.data[DATA_DISPLAY].async_release(entry.entry_id)
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    # Skip the reload if the running manager already applied the change (e.g. entity rename)
+    manager = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if manager and manager.config == {**entry.data, **entry.options}:
+        return
     await hass.config_entries.async_reload(entry.entry_id)
 
 @websocket_api.websocket_command({
@@ -646,6 +1255,7 @@ async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     vol.Required("config"): dict,
 })
 @websocket_api.async_response
+@profiled
 async def ws_update_config(hass, connection, msg):
     """Handle config update."""
     entry_id = msg["entry_id"]
@@ -681,6 +1291,7 @@ async def ws_update_config(hass, connection, msg):
     vol.Required("image"): str, # Base64 encoded
 })
 @websocket_api.async_response
+@profiled
 async def ws_upload_image(hass, connection, msg):
     """Handle image upload."""
     device_id = msg["device_id"]
@@ -740,6 +1351,7 @@ async def ws_upload_image(hass, connection, msg):
     vol.Required("entry_id"): str,
 })
 @websocket_api.async_response
+@profiled
 async def ws_get_config(hass, connection, msg):
     """Handle config get."""
     entry_id = msg["entry_id"]
@@ -752,16 +1364,367 @@ async def ws_get_config(hass, connection, msg):
     data = {**entry.data, **entry.options}
     connection.send_result(msg["id"], {"config": data})
 
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/get_box",
+    vol.Required("entry_id"): str,
+})
+@callback
+@profiled
+def ws_get_box(hass, connection, msg):
+    """Return the resolved entities and effective setpoints of a box."""
+    manager = hass.data.get(DOMAIN, {}).get(msg["entry_id"])
+    if not manager:
+        connection.send_error(msg["id"], "not_found", "Entry not found")
+        return
+    connection.send_result(msg["id"], manager.box_config())
+
 @websocket_api.websocket_command({
     vol.Required("type"): "local_grow_box/get_logs",
     vol.Required("entry_id"): str,
 })
 @websocket_api.async_response
+@profiled
 async def ws_get_logs(hass, connection, msg):
     """Handle get logs."""
     entry_id = msg["entry_id"]
     manager = hass.data[DOMAIN].get(entry_id)
     if manager:
-        connection.send_result(msg["id"], {"logs": manager.logs})
+        connection.send_result(msg["id"], {"logs": await manager.async_load_logs()})
     else:
         connection.send_result(msg["id"], {"logs": []})
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/get_telemetry",
+    vol.Required("entry_id"): str,
+    vol.Optional("start"): str,
+    vol.Optional("end"): str,
+    vol.Optional("resolution"): vol.In(list(TIERS_BY_NAME)),
+})
+@websocket_api.async_response
+@profiled
+async def ws_get_telemetry(hass, connection, msg):
+    """Handle telemetry query. Defaults to the current phase up to now."""
+    manager = hass.data.get(DOMAIN, {}).get(msg["entry_id"])
+    if not manager:
+        connection.send_error(msg["id"], "not_found", "Entry not found")
+        return
+
+    start = dt_util.parse_datetime(msg["start"]) if "start" in msg else manager.phase_start_date
+    end = dt_util.parse_datetime(msg["end"]) if "end" in msg else dt_util.now()
+    if start is None or end is None:
+        connection.send_error(msg["id"], "invalid_format", "Invalid start or end")
+        return
+    if start.tzinfo is None:
+        start = dt_util.as_local(start)
+    if end.tzinfo is None:
+        end = dt_util.as_local(end)
+
+    # Make sure the latest samples are on disk before reading
+    await manager.telemetry.async_flush()
+    tier = TIERS_BY_NAME.get(msg.get("resolution"))
+    data = await hass.async_add_executor_job(
+        manager.telemetry.read, int(start.timestamp()), int(end.timestamp()), tier
+    )
+    connection.send_result(msg["id"], data)
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/get_runtime",
+    vol.Required("entry_id"): str,
+})
+@callback
+@profiled
+def ws_get_runtime(hass, connection, msg):
+    """Return runtime (s) and energy (kWh) per actuator, lifetime and current phase."""
+    manager = hass.data.get(DOMAIN, {}).get(msg["entry_id"])
+    if not manager:
+        connection.send_error(msg["id"], "not_found", "Entry not found")
+        return
+    connection.send_result(msg["id"], manager.runtime.as_dict())
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/reset_runtime",
+    vol.Required("entry_id"): str,
+})
+@callback
+@profiled
+def ws_reset_runtime(hass, connection, msg):
+    """Reset the phase runtime and energy counters. Lifetime totals are kept."""
+    manager = hass.data.get(DOMAIN, {}).get(msg["entry_id"])
+    if not manager:
+        connection.send_error(msg["id"], "not_found", "Entry not found")
+        return
+    manager.runtime.async_reset_phase()
+    manager.add_log("Laufzeit: Phasen-Zähler zurückgesetzt")
+    connection.send_result(msg["id"], manager.runtime.as_dict())
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/get_phases",
+    vol.Required("entry_id"): str,
+})
+@callback
+@profiled
+def ws_get_phases(hass, connection, msg):
+    """Return all phase profiles of a box in display order."""
+    manager = hass.data.get(DOMAIN, {}).get(msg["entry_id"])
+    if not manager:
+        connection.send_error(msg["id"], "not_found", "Entry not found")
+        return
+    connection.send_result(msg["id"], {
+        "current": manager.current_phase,
+        "builtin": list(BUILTIN_IDS),
+        "phases": manager.phases.as_list(),
+    })
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/set_phase_profile",
+    vol.Required("entry_id"): str,
+    vol.Required("profile"): PROFILE_SCHEMA,
+})
+@callback
+@profiled
+def ws_set_phase_profile(hass, connection, msg):
+    """Create or update a phase profile. Empty values fall back to the box settings."""
+    entry = hass.config_entries.async_get_entry(msg["entry_id"])
+    if not entry:
+        connection.send_error(msg["id"], "not_found", "Entry not found")
+        return
+    profile = dict(msg["profile"])
+    phase_id = profile.pop("id")
+    profiles = {**(entry.options.get(CONF_PHASE_PROFILES) or {}), phase_id: profile}
+    # The update listener reloads the box with the new profiles
+    hass.config_entries.async_update_entry(entry, options={**entry.options, CONF_PHASE_PROFILES: profiles})
+    connection.send_result(msg["id"], {"profiles": profiles})
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/delete_phase_profile",
+    vol.Required("entry_id"): str,
+    vol.Required("phase_id"): str,
+})
+@callback
+@profiled
+def ws_delete_phase_profile(hass, connection, msg):
+    """Delete a custom phase, or reset a built-in phase to its defaults."""
+    entry = hass.config_entries.async_get_entry(msg["entry_id"])
+    if not entry:
+        connection.send_error(msg["id"], "not_found", "Entry not found")
+        return
+    phase_id = msg["phase_id"]
+    manager = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if manager and phase_id == manager.current_phase and phase_id not in BUILTIN_IDS:
+        connection.send_error(msg["id"], "in_use", "Phase is currently active")
+        return
+    profiles = dict(entry.options.get(CONF_PHASE_PROFILES) or {})
+    if profiles.pop(phase_id, None) is not None:
+        hass.config_entries.async_update_entry(entry, options={**entry.options, CONF_PHASE_PROFILES: profiles})
+    connection.send_result(msg["id"], {"profiles": profiles})
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/get_grow_plan",
+    vol.Required("entry_id"): str,
+})
+@callback
+@profiled
+def ws_get_grow_plan(hass, connection, msg):
+    """Return the grow plan and the transitions still ahead."""
+    manager = hass.data.get(DOMAIN, {}).get(msg["entry_id"])
+    if not manager:
+        connection.send_error(msg["id"], "not_found", "Entry not found")
+        return
+    connection.send_result(msg["id"], {
+        "plan": manager.config.get(CONF_GROW_PLAN) or [],
+        "transitions": [transition.as_dict() for transition in manager.transitions],
+    })
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/set_grow_plan",
+    vol.Required("entry_id"): str,
+    vol.Required("plan"): PLAN_SCHEMA,
+})
+@callback
+@profiled
+def ws_set_grow_plan(hass, connection, msg):
+    """Store a grow plan. An empty plan turns automatic advancement off."""
+    entry = hass.config_entries.async_get_entry(msg["entry_id"])
+    if not entry:
+        connection.send_error(msg["id"], "not_found", "Entry not found")
+        return
+    hass.config_entries.async_update_entry(entry, options={**entry.options, CONF_GROW_PLAN: msg["plan"]})
+    connection.send_result(msg["id"], {"plan": msg["plan"]})
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/get_trace",
+    vol.Required("entry_id"): str,
+    vol.Optional("start"): str,
+    vol.Optional("end"): str,
+    vol.Optional("subsystem"): str,
+})
+@callback
+@profiled
+def ws_get_trace(hass, connection, msg):
+    """Return the decision records between start and end, oldest first."""
+    manager = hass.data.get(DOMAIN, {}).get(msg["entry_id"])
+    if not manager:
+        connection.send_error(msg["id"], "not_found", "Entry not found")
+        return
+    bounds = []
+    for key in ("start", "end"):
+        value = dt_util.parse_datetime(msg[key]) if key in msg else None
+        if key in msg and value is None:
+            connection.send_error(msg["id"], "invalid_format", f"Invalid {key}")
+            return
+        if value is not None and value.tzinfo is None:
+            value = dt_util.as_local(value)
+        bounds.append(value.timestamp() if value else None)
+    connection.send_result(msg["id"], {"records": manager.trace.query(*bounds, msg.get("subsystem"))})
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/get_irrigation",
+})
+@callback
+@profiled
+def ws_get_irrigation(hass, connection, msg):
+    """Return the irrigation scheduler settings, running pumps and queue."""
+    connection.send_result(msg["id"], hass.data[DATA_IRRIGATION].as_dict())
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/set_irrigation",
+    vol.Required("max_concurrent"): vol.All(vol.Coerce(int), vol.Range(min=1, max=50)),
+})
+@callback
+@profiled
+def ws_set_irrigation(hass, connection, msg):
+    """Set how many pumps may run at once across all boxes."""
+    irrigation: IrrigationScheduler = hass.data[DATA_IRRIGATION]
+    irrigation.async_set_max_concurrent(msg["max_concurrent"])
+    connection.send_result(msg["id"], irrigation.as_dict())
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/get_water_zones",
+    vol.Required("entry_id"): str,
+})
+@callback
+@profiled
+def ws_get_water_zones(hass, connection, msg):
+    """Return the additional irrigation zones and the predictions of all zones."""
+    manager = hass.data.get(DOMAIN, {}).get(msg["entry_id"])
+    if not manager:
+        connection.send_error(msg["id"], "not_found", "Entry not found")
+        return
+    connection.send_result(msg["id"], {
+        "zones": manager.config.get(CONF_WATER_ZONES) or [],
+        "state": {zone_id: {**zone.as_dict(), "watering": manager.watering_predictions(zone_id)}
+                  for zone_id, zone in manager.zones.items()},
+    })
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/set_water_zones",
+    vol.Required("entry_id"): str,
+    vol.Required("zones"): ZONES_SCHEMA,
+})
+@callback
+@profiled
+def ws_set_water_zones(hass, connection, msg):
+    """Store the additional irrigation zones of a box."""
+    entry = hass.config_entries.async_get_entry(msg["entry_id"])
+    if not entry:
+        connection.send_error(msg["id"], "not_found", "Entry not found")
+        return
+    # The update listener reloads the box with the new zones
+    hass.config_entries.async_update_entry(entry, options={**entry.options, CONF_WATER_ZONES: msg["zones"]})
+    connection.send_result(msg["id"], {"zones": msg["zones"]})
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/get_power",
+})
+@callback
+@profiled
+def ws_get_power(hass, connection, msg):
+    """Return the power budget: limit, load, inrush and queued turn-ons."""
+    connection.send_result(msg["id"], hass.data[DATA_POWER].as_dict())
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/set_power",
+    vol.Required("circuit_limit"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Optional("inrush_factor", default=POWER_INRUSH_FACTOR): vol.All(vol.Coerce(float), vol.Range(min=1, max=20)),
+})
+@callback
+@profiled
+def ws_set_power(hass, connection, msg):
+    """Set the circuit limit shared by all boxes (0 turns the budget off)."""
+    power: PowerBudget = hass.data[DATA_POWER]
+    power.async_set_settings(msg["circuit_limit"], msg["inrush_factor"])
+    connection.send_result(msg["id"], power.as_dict())
+
+class LiveStateForwarder:
+    """Coalesce live state changes for one websocket subscription."""
+
+    def __init__(self, hass, connection, msg_id, entry_id, min_interval):
+        """Initialize the forwarder."""
+        self.hass = hass
+        self._connection = connection
+        self._msg_id = msg_id
+        self._entry_id = entry_id
+        self._min_interval = min_interval
+        self._pending = {}
+        self._last_sent = 0.0
+        self._cancel_timer = None
+
+    @callback
+    def async_on_changes(self, entry_id, changes):
+        """Queue changes for a box and flush when the rate limit allows."""
+        if self._entry_id and entry_id != self._entry_id:
+            return
+        self._pending.setdefault(entry_id, {}).update(changes)
+        if self._cancel_timer:
+            return
+        delay = self._min_interval - (time.monotonic() - self._last_sent)
+        if delay <= 0:
+            self._async_flush()
+        else:
+            self._cancel_timer = async_call_later(self.hass, delay, self._async_flush)
+
+    @callback
+    def _async_flush(self, _now=None):
+        self._cancel_timer = None
+        if not self._pending:
+            return
+        self._last_sent = time.monotonic()
+        self._connection.send_message(websocket_api.event_message(self._msg_id, {"boxes": self._pending}))
+        self._pending = {}
+
+    @callback
+    def async_cancel(self):
+        """Drop pending changes and stop the flush timer."""
+        if self._cancel_timer:
+            self._cancel_timer()
+            self._cancel_timer = None
+        self._pending = {}
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/subscribe_state",
+    vol.Optional("entry_id"): str,
+    vol.Optional("min_interval", default=LIVE_STATE_MIN_INTERVAL): vol.All(vol.Coerce(float), vol.Range(min=0.2, max=60)),
+})
+@callback
+@profiled
+def ws_subscribe_state(hass, connection, msg):
+    """Subscribe to compact per-box live state deltas."""
+    entry_id = msg.get("entry_id")
+    forwarder = LiveStateForwarder(hass, connection, msg["id"], entry_id, msg["min_interval"])
+    remove_dispatcher = async_dispatcher_connect(hass, SIGNAL_LIVE_STATE, forwarder.async_on_changes)
+
+    @callback
+    def unsubscribe():
+        remove_dispatcher()
+        forwarder.async_cancel()
+
+    connection.subscriptions[msg["id"]] = unsubscribe
+    connection.send_result(msg["id"])
+
+    # Initial snapshot so the panel does not wait for the next change
+    snapshot = {
+        manager_id: manager.live_state
+        for manager_id, manager in hass.data.get(DOMAIN, {}).items()
+        if (not entry_id or manager_id == entry_id) and manager.live_state
+    }
+    connection.send_message(websocket_api.event_message(msg["id"], {"boxes": snapshot}))
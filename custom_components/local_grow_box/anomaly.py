@@ -0,0 +1,253 @@
+"""Streaming anomaly detection on the sensor inputs of Local Grow Box.
+
+Each sensor gets a detector that is updated in O(1) per state change:
+flatline (no value change for too long), rate of change over at least
+ANOMALY_RATE_WINDOW (physically implausible jumps) and a Welford z-score
+against the running mean and variance. Steps within the sensor
+resolution are never a problem: they count as no rate and the standard
+deviation of the z-score is floored at the resolution. Outliers are
+kept out of the statistics, so one spike cannot widen the band. If the
+new level persists, it replaces the old one.
+"""
+from __future__ import annotations
+
+import datetime
+import math
+from collections import deque
+from collections.abc import Callable
+
+from homeassistant.core import State, callback
+
+from .const import (
+    CONF_TEMP_SENSOR, CONF_HUMIDITY_SENSOR, CONF_MOISTURE_SENSOR, ANOMALY_LIMITS,
+    ANOMALY_Z_LIMIT, ANOMALY_MIN_SAMPLES, ANOMALY_MAX_WEIGHT, ANOMALY_ACCEPT_AFTER, ANOMALY_RATE_WINDOW,
+)
+from .entities import EntityTracker
+from .snapshot import state_as_float
+
+# Config key -> channel name (as in snapshot and telemetry)
+CHANNELS = {
+    CONF_TEMP_SENSOR: "temp",
+    CONF_HUMIDITY_SENSOR: "humidity",
+    CONF_MOISTURE_SENSOR: "moisture",
+}
+
+REASON_FLATLINE = "flatline"
+REASON_RATE = "rate_of_change"
+REASON_OUTLIER = "outlier"
+
+
+class StreamDetector:
+    """Flatline, rate-of-change and z-score detection for one sensor."""
+
+    __slots__ = (
+        "flatline", "max_rate", "resolution", "value", "ts", "recent", "flat_since", "n", "mean", "m2",
+        "z", "rate", "outliers", "rate_exceeded", "flat",
+    )
+
+    def __init__(self, flatline: float, max_rate: float, resolution: float):
+        """Initialize the detector. max_rate is in units per minute."""
+        self.flatline = flatline
+        self.max_rate = max_rate
+        self.resolution = resolution
+        self.value: float | None = None
+        # (ts, value) from the newest reading at least ANOMALY_RATE_WINDOW old on
+        self.recent: deque[tuple[float, float]] = deque()
+        self.ts = 0.0
+        self.flat_since = 0.0
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.z = 0.0
+        self.rate = 0.0
+        self.outliers = 0
+        self.rate_exceeded = False
+        self.flat = False
+
+    def seed(self, ts: float, value: float, changed: float) -> None:
+        """Start from the current state without judging it."""
+        self.value, self.ts, self.flat_since = value, ts, changed
+        self.recent = deque([(ts, value)])
+        self._learn(value)
+
+    def add(self, ts: float, value: float) -> None:
+        """Feed a new reading."""
+        if self.value is None:
+            self.seed(ts, value, ts)
+            return
+        # Back-to-back readings would turn one resolution step into a huge rate
+        recent = self.recent
+        while len(recent) > 1 and ts - recent[1][0] >= ANOMALY_RATE_WINDOW:
+            recent.popleft()
+        ref_ts, ref_value = recent[0]
+        change = value - ref_value
+        self.rate = change / (max(ts - ref_ts, ANOMALY_RATE_WINDOW) / 60)
+        self.rate_exceeded = abs(change) > self.resolution and abs(self.rate) > self.max_rate
+        recent.append((ts, value))
+        if value != self.value:
+            self.flat_since = ts
+            self.flat = False
+        self.value, self.ts = value, ts
+
+        # After a flat run the variance is near zero; a resolution step is no outlier
+        std = max(math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0, self.resolution)
+        self.z = (value - self.mean) / std if std > 0 else 0.0
+        if self.n >= ANOMALY_MIN_SAMPLES and abs(self.z) > ANOMALY_Z_LIMIT:
+            self.outliers += 1
+            if self.outliers < ANOMALY_ACCEPT_AFTER:
+                return
+            # The level really moved: start the statistics over from here
+            self.n, self.mean, self.m2 = 0, 0.0, 0.0
+        self.outliers = 0
+        self._learn(value)
+
+    def _learn(self, value: float) -> None:
+        # Welford update, then cap the weight of the past so the band follows slow drift
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+        if self.n > ANOMALY_MAX_WEIGHT:
+            self.m2 *= ANOMALY_MAX_WEIGHT / self.n
+            self.n = ANOMALY_MAX_WEIGHT
+
+    def as_state(self) -> dict:
+        """Return what a restart needs to continue (see restore)."""
+        return {"value": self.value, "flat_since": self.flat_since, "n": self.n, "mean": self.mean, "m2": self.m2}
+
+    def restore(self, state: dict) -> None:
+        """Continue from a saved state. Must run after seeding from the current value."""
+        self.n, self.mean, self.m2 = state["n"], state["mean"], state["m2"]
+        if self.value is not None and self.value == state["value"]:
+            # Unchanged across the restart: the flatline keeps counting
+            self.flat_since = min(self.flat_since, state["flat_since"])
+
+    def check(self, ts: float) -> None:
+        """Update the flatline and rate flags (time passes without state changes)."""
+        self.flat = self.value is not None and ts - self.flat_since >= self.flatline
+        if self.rate_exceeded and ts - self.ts >= ANOMALY_RATE_WINDOW:
+            # A jump that then holds for a whole window is a step, no ongoing change
+            self.rate_exceeded = False
+
+    @property
+    def reasons(self) -> tuple[str, ...]:
+        """Return the active problems."""
+        reasons = []
+        if self.flat:
+            reasons.append(REASON_FLATLINE)
+        if self.rate_exceeded:
+            reasons.append(REASON_RATE)
+        if self.outliers:
+            reasons.append(REASON_OUTLIER)
+        return tuple(reasons)
+
+    def as_dict(self) -> dict:
+        """Return the detector state (for attributes and diagnostics)."""
+        return {
+            "reasons": list(self.reasons),
+            "value": self.value,
+            "mean": round(self.mean, 3),
+            "std": round(math.sqrt(self.m2 / (self.n - 1)), 3) if self.n > 1 else None,
+            "z": round(self.z, 2),
+            "rate_per_min": round(self.rate, 3),
+            "samples": self.n,
+            "flat_since": datetime.datetime.fromtimestamp(self.flat_since, datetime.timezone.utc).isoformat()
+            if self.value is not None else None,
+        }
+
+
+class AnomalyMonitor:
+    """Run a detector per configured sensor of a box."""
+
+    def __init__(self, entities: EntityTracker):
+        """Initialize the monitor."""
+        self._entities = entities
+        self.detectors: dict[str, StreamDetector] = {}
+        self._problems: dict[str, tuple[str, ...]] = {}
+        self._listeners: list[Callable[[], None]] = []
+        self._unsub = None
+
+    @callback
+    def async_setup(self) -> None:
+        """Create detectors for the configured sensors and follow their states."""
+        for key, channel in CHANNELS.items():
+            if not self._entities.is_configured(key):
+                continue
+            flatline, max_rate, resolution = ANOMALY_LIMITS[channel]
+            detector = StreamDetector(flatline, max_rate, resolution)
+            state = self._entities.state(key)
+            value = state_as_float(state)
+            if value is not None:
+                detector.seed(state.last_updated.timestamp(), value, state.last_changed.timestamp())
+            self.detectors[channel] = detector
+        self._unsub = self._entities.async_add_listener(self._async_state_changed)
+
+    @callback
+    def _async_state_changed(self, key: str, old: State | None, new: State | None) -> None:
+        channel = CHANNELS.get(key)
+        if channel is None or channel not in self.detectors:
+            return
+        value = state_as_float(new)
+        if value is None:
+            return
+        self.detectors[channel].add(new.last_updated.timestamp(), value)
+        self._async_publish()
+
+    @callback
+    def async_check(self, now: datetime.datetime) -> None:
+        """Advance the flatline timers; called from the control tick."""
+        ts = now.timestamp()
+        for detector in self.detectors.values():
+            detector.check(ts)
+        self._async_publish()
+
+    @callback
+    def _async_publish(self) -> None:
+        problems = {channel: d.reasons for channel, d in self.detectors.items() if d.reasons}
+        if problems == self._problems:
+            return
+        self._problems = problems
+        for listener in self._listeners:
+            listener()
+
+    def problem(self, channel: str) -> tuple[str, ...]:
+        """Return the active problems of a channel."""
+        return self._problems.get(channel, ())
+
+    @property
+    def problems(self) -> dict[str, tuple[str, ...]]:
+        """Return the active problems of all channels."""
+        return self._problems
+
+    @callback
+    def async_add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call listener() when the set of problems changes."""
+        self._listeners.append(listener)
+
+        @callback
+        def remove() -> None:
+            self._listeners.remove(listener)
+
+        return remove
+
+    def as_state(self) -> dict:
+        """Return the detector statistics for a warm restart."""
+        return {channel: detector.as_state() for channel, detector in self.detectors.items()}
+
+    @callback
+    def async_restore(self, state: dict) -> None:
+        """Continue the statistics of a previous run. Must run after async_setup."""
+        for channel, saved in state.items():
+            if channel in self.detectors:
+                self.detectors[channel].restore(saved)
+
+    def as_dict(self) -> dict:
+        """Return all detectors (for diagnostics)."""
+        return {channel: detector.as_dict() for channel, detector in self.detectors.items()}
+
+    @callback
+    def async_unload(self) -> None:
+        """Stop following the sensors."""
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
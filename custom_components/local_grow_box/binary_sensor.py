@@ -0,0 +1,80 @@
+"""Binary sensor platform for Local Grow Box."""
+from __future__ import annotations
+
+import logging
+
+from homeassistant.components.binary_sensor import BinarySensorDeviceClass, BinarySensorEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+CHANNEL_NAMES = {
+    "temp": "Temperature Sensor Problem",
+    "humidity": "Humidity Sensor Problem",
+    "moisture": "Soil Moisture Sensor Problem",
+}
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the binary sensor platform."""
+    manager = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(
+        GrowBoxSensorProblem(manager, entry.entry_id, channel) for channel in manager.anomalies.detectors
+    )
+
+
+class GrowBoxSensorProblem(BinarySensorEntity):
+    """On while the anomaly detector of an input sensor reports a problem."""
+
+    _attr_has_entity_name = True
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = False
+    # Detector statistics are for inspection only, the recorder keeps the state and reasons
+    _unrecorded_attributes = frozenset({"value", "mean", "std", "z", "rate_per_min", "samples"})
+
+    def __init__(self, manager, entry_id, channel):
+        """Initialize the sensor."""
+        self.manager = manager
+        self._entry_id = entry_id
+        self._channel = channel
+        self._attr_name = CHANNEL_NAMES[channel]
+        self._attr_unique_id = f"{entry_id}_{channel}_problem"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device info."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._entry_id)},
+            name=self.manager.entry.title,
+            manufacturer="Local Grow Box",
+            model="Grow Box Controller",
+        )
+
+    @property
+    def is_on(self) -> bool:
+        """Return true if the sensor looks faulty."""
+        return bool(self.manager.anomalies.problem(self._channel))
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the reasons and the detector statistics."""
+        return self.manager.anomalies.detectors[self._channel].as_dict()
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the problem state of the detector."""
+        self.async_on_remove(self.manager.anomalies.async_add_listener(self._async_problems_changed))
+
+    @callback
+    def _async_problems_changed(self) -> None:
+        self.async_write_ha_state()
@@ -0,0 +1,311 @@
+"""Climate rules for Local Grow Box, per box and batched across all boxes."""
+from __future__ import annotations
+
+import datetime
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import DOMAIN, BATCH_MIN_BOXES
+from .profiler import profiled
+from .psychrometrics import SVP_TABLE, np
+from .snapshot import SensorSnapshot
+
+if TYPE_CHECKING:
+    from . import GrowBoxManager
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_CLIMATE_BATCH = f"{DOMAIN}_climate_batch"
+
+# Actuator actions
+KEEP = 0
+TURN_ON = 1
+TURN_OFF = -1
+
+# Actuator state columns: missing/unavailable, off, on
+STATE_MISSING = -1
+
+
+@dataclass(frozen=True, slots=True)
+class ClimateSetpoints:
+    """Climate parameters of a box, compiled once per phase."""
+
+    vpd_mode: bool
+    target_temp: float
+    max_humidity: float
+    target_humidity: float
+    humidity_hysteresis: float
+    temp_hysteresis: float
+    fan_hysteresis: float
+    leaf_offset: float
+    vpd_min: float
+    vpd_max: float
+    vpd_hysteresis: float
+
+    def as_dict(self) -> dict:
+        """Return a JSON friendly representation."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@dataclass(frozen=True, slots=True)
+class ClimateDecision:
+    """Result of one climate evaluation.
+
+    The rules name the condition that decided (for the decision trace).
+    """
+
+    vpd: float
+    fan: int = KEEP
+    humidifier: int = KEEP
+    fan_rule: str = field(default="", compare=False)
+    humidifier_rule: str = field(default="", compare=False)
+
+
+def decide_climate(
+    sp: ClimateSetpoints,
+    temp: float,
+    humidity: float,
+    fan_on: bool | None,
+    humidifier_on: bool | None,
+    soak_done: bool,
+) -> ClimateDecision:
+    """Evaluate fan hysteresis and humidifier start/stop for one box.
+
+    fan_on/humidifier_on are None if the actuator is missing or unavailable.
+    soak_done tells if the humidifier pause after its last run is over.
+    """
+    vpd = SVP_TABLE.vpd(temp, humidity, sp.leaf_offset)
+
+    fan = KEEP
+    fan_rule = "unavailable"
+    if fan_on is not None:
+        # VPD below the band means too humid; temperature and mold limit apply in both modes
+        if temp > sp.target_temp:
+            should_fan_on, fan_rule = True, "temp_high"
+        elif humidity > sp.max_humidity:
+            should_fan_on, fan_rule = True, "humidity_high"
+        elif sp.vpd_mode and vpd < sp.vpd_min:
+            should_fan_on, fan_rule = True, "vpd_low"
+        elif (
+            temp < (sp.target_temp - sp.temp_hysteresis)
+            and humidity < (sp.max_humidity - sp.fan_hysteresis)
+            and (not sp.vpd_mode or vpd > sp.vpd_min + sp.vpd_hysteresis)
+        ):
+            should_fan_on, fan_rule = False, "below_hysteresis"
+        else:
+            should_fan_on, fan_rule = fan_on, "within_hysteresis"
+        if should_fan_on and not fan_on:
+            fan = TURN_ON
+        elif not should_fan_on and fan_on:
+            fan = TURN_OFF
+
+    humidifier = KEEP
+    humidifier_rule = "unavailable"
+    if humidifier_on is not None:
+        if sp.vpd_mode:
+            # VPD above the band means too dry: humidify back to the middle of the band
+            stop = vpd <= (sp.vpd_min + sp.vpd_max) / 2 or humidity >= sp.max_humidity
+            start = vpd > sp.vpd_max and humidity < sp.max_humidity
+            stop_rule, start_rule = "vpd_reached", "vpd_high"
+        else:
+            # Humidifier starts at target - hysteresis
+            stop = humidity >= sp.target_humidity
+            start = humidity < sp.target_humidity - sp.humidity_hysteresis
+            stop_rule, start_rule = "humidity_reached", "humidity_low"
+        if humidifier_on:
+            humidifier_rule = stop_rule if stop else "humidifying"
+            if stop:
+                humidifier = TURN_OFF
+        elif not soak_done:
+            humidifier_rule = "soak"
+        else:
+            humidifier_rule = start_rule if start else "idle"
+            if start:
+                humidifier = TURN_ON
+
+    return ClimateDecision(vpd, fan, humidifier, fan_rule, humidifier_rule)
+
+
+def _table_svp(temp):
+    """Vectorized SvpTable.svp for in-range values (same operation order)."""
+    pos = (temp - SVP_TABLE.low) / SVP_TABLE.step
+    values = np.asarray(SVP_TABLE._values)
+    index = np.minimum(pos.astype(np.int64), len(values) - 2)
+    frac = pos - index
+    lower = values[index]
+    return lower + (values[index + 1] - lower) * frac
+
+
+def decide_climate_batch(setpoints: dict, temp, humidity, fan_state, humidifier_state, soak_done):
+    """Evaluate decide_climate() for all boxes in one vectorized pass.
+
+    setpoints maps ClimateSetpoints field names to columns, states use
+    STATE_MISSING/0/1. Returns (vpd, fan, humidifier, fan_rule,
+    humidifier_rule) columns.
+    """
+    sp = setpoints
+    leaf = temp + sp["leaf_offset"]
+    in_range = (
+        (temp >= SVP_TABLE.low) & (temp < SVP_TABLE.high)
+        & (leaf >= SVP_TABLE.low) & (leaf < SVP_TABLE.high)
+    )
+    safe_temp = np.where(in_range, temp, SVP_TABLE.low)
+    safe_leaf = np.where(in_range, leaf, SVP_TABLE.low)
+    vpd = _table_svp(safe_leaf) - _table_svp(safe_temp) * humidity / 100
+    # Outside the table the scalar path computes SVP exactly; match it bit for bit
+    for i in np.flatnonzero(~in_range):
+        vpd[i] = SVP_TABLE.vpd(float(temp[i]), float(humidity[i]), float(sp["leaf_offset"][i]))
+
+    vpd_mode = sp["vpd_mode"]
+    fan_on = fan_state == 1
+    temp_high = temp > sp["target_temp"]
+    humidity_high = humidity > sp["max_humidity"]
+    vpd_low = vpd_mode & (vpd < sp["vpd_min"])
+    hot = temp_high | humidity_high | vpd_low
+    cool = (
+        (temp < (sp["target_temp"] - sp["temp_hysteresis"]))
+        & (humidity < (sp["max_humidity"] - sp["fan_hysteresis"]))
+        & (~vpd_mode | (vpd > sp["vpd_min"] + sp["vpd_hysteresis"]))
+    )
+    should = np.where(hot, True, np.where(cool, False, fan_on))
+    fan_missing = fan_state == STATE_MISSING
+    fan = np.where(fan_missing, KEEP, should.astype(np.int8) - fan_on.astype(np.int8))
+    # Same order as the if/elif chain of decide_climate()
+    fan_rule = np.select(
+        [fan_missing, temp_high, humidity_high, vpd_low, cool],
+        ["unavailable", "temp_high", "humidity_high", "vpd_low", "below_hysteresis"],
+        "within_hysteresis",
+    )
+
+    humidifier_on = humidifier_state == 1
+    stop = np.where(
+        vpd_mode,
+        (vpd <= (sp["vpd_min"] + sp["vpd_max"]) / 2) | (humidity >= sp["max_humidity"]),
+        humidity >= sp["target_humidity"],
+    )
+    start = np.where(
+        vpd_mode,
+        (vpd > sp["vpd_max"]) & (humidity < sp["max_humidity"]),
+        humidity < sp["target_humidity"] - sp["humidity_hysteresis"],
+    )
+    humidifier = np.where(
+        humidifier_on,
+        np.where(stop, TURN_OFF, KEEP),
+        np.where(soak_done & start, TURN_ON, KEEP),
+    )
+    humidifier_missing = humidifier_state == STATE_MISSING
+    humidifier = np.where(humidifier_missing, KEEP, humidifier)
+    stop_rule = np.where(vpd_mode, "vpd_reached", "humidity_reached")
+    start_rule = np.where(vpd_mode, "vpd_high", "humidity_low")
+    humidifier_rule = np.select(
+        [humidifier_missing, humidifier_on & stop, humidifier_on, ~soak_done, start],
+        ["unavailable", stop_rule, "humidifying", "soak", start_rule],
+        "idle",
+    )
+    return vpd, fan, humidifier, fan_rule, humidifier_rule
+
+
+def _state(value: bool | None) -> int:
+    return STATE_MISSING if value is None else int(value)
+
+
+class ClimateBatchEngine:
+    """Evaluate the climate of all boxes in one NumPy pass per second.
+
+    Boxes submit their readings from their own tick; the engine decides for
+    all of them at once and hands the transitions back to the boxes. The
+    other boxes only record their decision.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the engine."""
+        self.hass = hass
+        self.enabled = np is not None
+        self._pending: dict[str, tuple] = {}
+        self._setpoint_cache: tuple | None = None
+        self.stats = {"runs": 0, "boxes": 0, "transitions": 0}
+        self._unsub = None
+
+    @property
+    def active(self) -> bool:
+        """Return True if boxes should submit instead of deciding themselves."""
+        return self.enabled and len(self.hass.data.get(DOMAIN, {})) >= BATCH_MIN_BOXES
+
+    @callback
+    def async_setup(self) -> None:
+        """Start the batch interval."""
+        if not self.enabled:
+            _LOGGER.debug("NumPy not available, climate is evaluated per box")
+            return
+        self._unsub = async_track_time_interval(self.hass, self._async_run, timedelta(seconds=1))
+
+    @callback
+    def async_submit(
+        self, manager: GrowBoxManager, now: datetime.datetime, snapshot: SensorSnapshot,
+        fan_on: bool | None, humidifier_on: bool | None, soak_done: bool,
+    ) -> None:
+        """Queue the latest readings of a box for the next batch."""
+        self._pending[manager.entry.entry_id] = (manager, now, snapshot, fan_on, humidifier_on, soak_done)
+
+    def _setpoint_columns(self, managers: list) -> dict:
+        key = tuple((id(m), m.climate_setpoints) for m in managers)
+        if self._setpoint_cache is None or self._setpoint_cache[0] != key:
+            columns = {
+                name: np.array([getattr(m.climate_setpoints, name) for m in managers])
+                for name in ClimateSetpoints.__slots__
+            }
+            self._setpoint_cache = (key, columns)
+        return self._setpoint_cache[1]
+
+    @callback
+    @profiled
+    def _async_run(self, _now=None) -> None:
+        if not self._pending:
+            return
+        loaded = self.hass.data.get(DOMAIN, {})
+        rows = [row for entry_id, row in self._pending.items() if loaded.get(entry_id) is row[0]]
+        self._pending = {}
+        rows = [row for row in rows if row[0].master_switch_on]
+        if not rows:
+            return
+
+        started = time.perf_counter()
+        managers = [row[0] for row in rows]
+        setpoints = self._setpoint_columns(managers)
+        temp = np.array([row[2].temp for row in rows], dtype=float)
+        humidity = np.array([row[2].humidity for row in rows], dtype=float)
+        fan_state = np.array([_state(row[3]) for row in rows], dtype=np.int8)
+        humidifier_state = np.array([_state(row[4]) for row in rows], dtype=np.int8)
+        soak_done = np.array([row[5] for row in rows], dtype=bool)
+        vpd, fan, humidifier, fan_rule, humidifier_rule = decide_climate_batch(
+            setpoints, temp, humidity, fan_state, humidifier_state, soak_done
+        )
+
+        self.stats["runs"] += 1
+        self.stats["boxes"] = len(rows)
+        for i, (manager, now, snapshot, *_inputs) in enumerate(rows):
+            decision = ClimateDecision(
+                float(vpd[i]), int(fan[i]), int(humidifier[i]), str(fan_rule[i]), str(humidifier_rule[i])
+            )
+            if decision.fan != KEEP or decision.humidifier != KEEP:
+                self.stats["transitions"] += 1
+                self.hass.async_create_task(manager.async_apply_climate(now, snapshot, decision, started))
+            else:
+                manager.async_record_climate(now, snapshot, decision, started)
+
+    def as_dict(self) -> dict:
+        """Return engine state and counters (for diagnostics)."""
+        return {"enabled": self.enabled, "active": self.active, **self.stats}
+
+    @callback
+    def async_unload(self) -> None:
+        """Stop the batch interval."""
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
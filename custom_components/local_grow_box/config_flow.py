@@ -30,7 +30,20 @@ from .const import (
     CONF_PUMP_DURATION,
     CONF_TARGET_MOISTURE,
     CONF_LIGHT_START_HOUR,
+    CONF_LIGHT_RAMP,
     CONF_PHASE_START_DATE,
+    CONF_LIGHT_WATTS,
+    CONF_FAN_WATTS,
+    CONF_PUMP_WATTS,
+    CONF_HUMIDIFIER_WATTS,
+    CONF_CLIMATE_MODE,
+    CLIMATE_MODES,
+    CONF_ANOMALY_ACTION,
+    ANOMALY_ACTIONS,
+    CONF_WATERING_MODE,
+    WATERING_MODES,
+    CONF_LEAF_TEMP_OFFSET,
+    CONF_VPD_HYSTERESIS,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -151,11 +164,28 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             vol.Optional(CONF_HUMIDITY_HYSTERESIS, description={"suggested_value": get_val(CONF_HUMIDITY_HYSTERESIS)}): vol.Coerce(float),
             vol.Optional(CONF_TEMP_HYSTERESIS, description={"suggested_value": get_val(CONF_TEMP_HYSTERESIS)}): vol.Coerce(float),
             vol.Optional(CONF_FAN_HYSTERESIS, description={"suggested_value": get_val(CONF_FAN_HYSTERESIS)}): vol.Coerce(float),
+            vol.Optional(CONF_CLIMATE_MODE, description={"suggested_value": get_val(CONF_CLIMATE_MODE)}): selector.SelectSelector(
+                selector.SelectSelectorConfig(options=CLIMATE_MODES)
+            ),
+            vol.Optional(CONF_LEAF_TEMP_OFFSET, description={"suggested_value": get_val(CONF_LEAF_TEMP_OFFSET)}): vol.Coerce(float),
+            vol.Optional(CONF_VPD_HYSTERESIS, description={"suggested_value": get_val(CONF_VPD_HYSTERESIS)}): vol.Coerce(float),
             vol.Optional(CONF_MAX_HUMIDITY, description={"suggested_value": get_val(CONF_MAX_HUMIDITY)}): vol.Coerce(float),
+            vol.Optional(CONF_ANOMALY_ACTION, description={"suggested_value": get_val(CONF_ANOMALY_ACTION)}): selector.SelectSelector(
+                selector.SelectSelectorConfig(options=ANOMALY_ACTIONS)
+            ),
             vol.Optional(CONF_TARGET_MOISTURE, description={"suggested_value": get_val(CONF_TARGET_MOISTURE)}): vol.Coerce(float),
             vol.Optional(CONF_PUMP_DURATION, description={"suggested_value": get_val(CONF_PUMP_DURATION)}): vol.Coerce(int),
+            vol.Optional(CONF_WATERING_MODE, description={"suggested_value": get_val(CONF_WATERING_MODE)}): selector.SelectSelector(
+                selector.SelectSelectorConfig(options=WATERING_MODES)
+            ),
             vol.Optional(CONF_LIGHT_START_HOUR, description={"suggested_value": get_val(CONF_LIGHT_START_HOUR)}): vol.All(vol.Coerce(int), vol.Range(min=0, max=23)),
+            vol.Optional(CONF_LIGHT_RAMP, description={"suggested_value": get_val(CONF_LIGHT_RAMP)}): vol.All(vol.Coerce(int), vol.Range(min=0, max=240)),
             vol.Optional(CONF_PHASE_START_DATE, description={"suggested_value": get_val(CONF_PHASE_START_DATE)}): str,
+            # Nameplate power for energy accounting
+            vol.Optional(CONF_LIGHT_WATTS, description={"suggested_value": get_val(CONF_LIGHT_WATTS)}): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(CONF_FAN_WATTS, description={"suggested_value": get_val(CONF_FAN_WATTS)}): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(CONF_PUMP_WATTS, description={"suggested_value": get_val(CONF_PUMP_WATTS)}): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(CONF_HUMIDIFIER_WATTS, description={"suggested_value": get_val(CONF_HUMIDIFIER_WATTS)}): vol.All(vol.Coerce(float), vol.Range(min=0)),
         }
 
         return self.async_show_form(
@@ -52,13 +52,42 @@ CONF_CUSTOM2_HOURS = "custom2_phase_hours"
 CONF_CUSTOM3_NAME = "custom3_phase_name"
 CONF_CUSTOM3_HOURS = "custom3_phase_hours"
 
+# Per-phase setpoints: phase id -> {name, light_hours, target_temp, ...}
+CONF_PHASE_PROFILES = "phase_profiles"
+
+# Grow Plan: [{"phase": id, "days": n}, ...], advances the phase automatically
+CONF_GROW_PLAN = "grow_plan"
+
+# Climate Control Mode
+CONF_CLIMATE_MODE = "climate_mode"
+CLIMATE_MODE_HUMIDITY = "humidity" # Fan/humidifier follow the humidity setpoints
+CLIMATE_MODE_VPD = "vpd" # Fan/humidifier follow the phase VPD band
+CLIMATE_MODES = [CLIMATE_MODE_HUMIDITY, CLIMATE_MODE_VPD]
+CONF_ANOMALY_ACTION = "anomaly_action"
+ANOMALY_ACTION_NOTIFY = "notify" # Only report sensor problems
+ANOMALY_ACTION_HOLD = "hold" # Also hold the affected actuators in a safe state
+ANOMALY_ACTIONS = [ANOMALY_ACTION_NOTIFY, ANOMALY_ACTION_HOLD]
+CONF_WATERING_MODE = "watering_mode"
+WATERING_MODE_THRESHOLD = "threshold" # Water below the target for the fixed pump duration
+WATERING_MODE_PREDICTIVE = "predictive" # Water ahead of the predicted crossing, sized by the learned gain
+WATERING_MODES = [WATERING_MODE_THRESHOLD, WATERING_MODE_PREDICTIVE]
+CONF_LEAF_TEMP_OFFSET = "leaf_temp_offset" # In °C, leaf relative to air
+CONF_VPD_HYSTERESIS = "vpd_hysteresis" # In kPa
+
 # Advanced Features
 CONF_PUMP_DURATION = "pump_duration" # In seconds
 CONF_MOISTURE_SENSOR = "moisture_sensor"
 CONF_TARGET_MOISTURE = "target_moisture" # In %
 CONF_LIGHT_START_HOUR = "light_start_hour"
+CONF_LIGHT_RAMP = "light_ramp" # In minutes of sunrise/sunset dimming, 0 switches hard
 CONF_PHASE_START_DATE = "phase_start_date"
 
+# Energy Accounting (nameplate power in W)
+CONF_LIGHT_WATTS = "light_watts"
+CONF_FAN_WATTS = "fan_watts"
+CONF_PUMP_WATTS = "pump_watts"
+CONF_HUMIDIFIER_WATTS = "humidifier_watts"
+
 # Defaults
 DEFAULT_TARGET_TEMP = 24.0
 DEFAULT_MAX_HUMIDITY = 60.0
@@ -71,6 +100,75 @@ DEFAULT_HUMIDITY_HYSTERESIS = 2.0
 DEFAULT_TEMP_HYSTERESIS = 1.0
 DEFAULT_FAN_HYSTERESIS = 2.0
 DEFAULT_LIGHT_START_HOUR = 18
+DEFAULT_LEAF_TEMP_OFFSET = 0.0
+DEFAULT_VPD_HYSTERESIS = 0.1
+DEFAULT_VPD_MIN = 0.8
+DEFAULT_VPD_MAX = 1.2
+
+# Live State Push (Panel)
+SIGNAL_LIVE_STATE = f"{DOMAIN}_live_state"
+LIVE_STATE_MIN_INTERVAL = 1.0 # In seconds, max push rate per subscription
+
+# Startup
+STARTUP_STAGGER = 0.5 # In seconds between consecutive boxes
+STARTUP_SPREAD = 10.0 # In seconds, stagger wraps around after this
+STARTUP_JITTER = 0.5 # In seconds, random extra delay per box
+
+# ESPHome Displays (shared by all boxes)
+DISPLAY_PUSH_INTERVAL = 1.0 # In seconds between scheduler runs
+DISPLAY_MAX_CALLS = 2 # Service calls per scheduler run, regardless of box count
+DISPLAY_REFRESH = 60.0 # In seconds, unchanged pages are re-sent after this
+DISPLAY_ROTATE = 10.0 # In seconds per window when boxes exceed the display pages
+
+# Fleet-wide Climate Batch (needs NumPy)
+BATCH_MIN_BOXES = 8 # Below this, boxes evaluate their climate themselves
+
+# Decision Trace
+TRACE_CAPACITY = 500 # Records kept per box
+TRACE_SAMPLE_INTERVAL = 300 # In seconds, unchanged decisions are recorded at most this often
+
+# Sensor Anomaly Detection
+ANOMALY_LIMITS = { # Channel: (flatline after s, max change per minute, sensor resolution)
+    "temp": (6 * 3600, 2.0, 0.1),
+    "humidity": (3 * 3600, 10.0, 1.0),
+    "moisture": (24 * 3600, 5.0, 1.0),
+}
+ANOMALY_RATE_WINDOW = 60 # In seconds, the rate of change is measured over at least this long
+ANOMALY_Z_LIMIT = 4.0 # Readings further from the running mean are outliers
+ANOMALY_MIN_SAMPLES = 30 # Readings before the z-score is trusted
+ANOMALY_MAX_WEIGHT = 1000 # Readings of history the running statistics weigh at most
+ANOMALY_ACCEPT_AFTER = 5 # Consecutive outliers that become the new normal
+
+# Predictive Watering
+WATERING_MIN_SAMPLES = 6 # Moisture readings before the drying trend is used
+WATERING_MIN_SPAN = 3600 # In seconds of readings before the drying trend is used
+WATERING_SETTLE = 900 # In seconds after a pump run until the moisture rise is measured
+WATERING_GAIN_WEIGHT = 0.3 # Weight of the latest watering in the gain estimate
+WATERING_OVERSHOOT = 3.0 # In %, watering aims this far above the target
+WATERING_DURATION_RANGE = (0.5, 2.0) # Sized pump runs stay within these factors of the pump duration
+WATERING_LEAD = 600 # In seconds, predictive mode starts this long before the predicted crossing
+
+# Irrigation Zones
+CONF_WATER_ZONES = "water_zones" # Additional pump/moisture zones of a box
+DEFAULT_SOAK = 900 # In seconds a zone rests after watering
+IRRIGATION_MAX_CONCURRENT = 1 # Default pumps running at once across all boxes
+IRRIGATION_DISPATCH_INTERVAL = 1.0 # In seconds between scheduler runs
+IRRIGATION_GRACE = 30 # In seconds a granted slot outlives its pump duration before it is reclaimed
+
+# Light Ramp (dimmable lights)
+LIGHT_RAMP_STEPS = 6 # Brightness steps per ramp for lights without transition support
+LIGHT_RAMP_MIN_PCT = 5 # Brightness in % a sunrise starts and a sunset ends at
+
+# Warm Restart
+STATE_SAVE_DELAY = 10 # In seconds, controller state changes are written at most this often
+STATE_CHECKPOINT_INTERVAL = 300 # In seconds between saves of the slowly changing filter state
+PHASE_HISTORY_SIZE = 100 # Past phases kept in the controller state (for exports)
+
+# Power Budget (shared circuit of all boxes)
+POWER_CIRCUIT_LIMIT = 0.0 # In W, default circuit limit; 0 turns the budget off
+POWER_INRUSH_FACTOR = 2.0 # Startup draw as a multiple of the nameplate power
+POWER_INRUSH_TIME = 2.0 # In seconds a switched-on load draws its inrush power
+POWER_REQUEST_TIMEOUT = 5.0 # In seconds a waiting turn-on is dropped if not asked for again
 
 # Phase Defaults (Hours of Light)
 PHASE_LIGHT_HOURS = {
@@ -80,3 +178,12 @@ PHASE_LIGHT_HOURS = {
     PHASE_DRYING: 0,
     PHASE_CURING: 0,
 }
+
+# Phase Defaults (VPD band in kPa)
+PHASE_VPD_BANDS = {
+    PHASE_SEEDLING: (0.4, 0.8),
+    PHASE_VEGETATIVE: (0.8, 1.2),
+    PHASE_FLOWERING: (1.2, 1.6),
+    PHASE_DRYING: (0.8, 1.0),
+    PHASE_CURING: (0.5, 0.7),
+}
@@ -0,0 +1,48 @@
+"""Diagnostics support for Local Grow Box."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .climate import DATA_CLIMATE_BATCH
+from .display import DATA_DISPLAY
+from .irrigation import DATA_IRRIGATION
+from .power import DATA_POWER
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    manager = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    data: dict[str, Any] = {
+        "config": {**entry.data, **entry.options},
+    }
+    if manager is None:
+        return data
+
+    data["manager"] = {
+        "master_switch_on": manager.master_switch_on,
+        "current_phase": manager.current_phase,
+        "phase_profile": manager.phase_profile.as_dict(),
+        "transitions": [transition.as_dict() for transition in manager.transitions],
+        "phase_history": manager.phase_history,
+        "days_in_phase": manager.days_in_phase,
+        "startup_timings": manager.startup_timings,
+        "live_state": manager.live_state,
+        "snapshot": manager.snapshot.as_dict() if manager.snapshot else None,
+        "runtime": manager.runtime.as_dict(),
+        "light_ramp": manager.light_ramp.as_dict() if manager.light_ramp else None,
+        "trace": manager.trace.as_dict(),
+        "anomalies": manager.anomalies.as_dict(),
+        "watering": {zone_id: manager.watering_predictions(zone_id) for zone_id in manager.zones},
+        "zones": {zone_id: zone.as_dict() for zone_id, zone in manager.zones.items()},
+        "power": hass.data[DATA_POWER].as_dict() if DATA_POWER in hass.data else None,
+        "irrigation": hass.data[DATA_IRRIGATION].as_dict() if DATA_IRRIGATION in hass.data else None,
+        "display": hass.data[DATA_DISPLAY].as_dict() if DATA_DISPLAY in hass.data else None,
+        "climate_batch": hass.data[DATA_CLIMATE_BATCH].as_dict() if DATA_CLIMATE_BATCH in hass.data else None,
+    }
+    return data
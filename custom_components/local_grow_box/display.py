@@ -0,0 +1,170 @@
+"""ESPHome display paging for Local Grow Box."""
+from __future__ import annotations
+
+import datetime
+import logging
+import time
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+
+from .profiler import profiled
+from .const import (
+    DOMAIN, DISPLAY_PUSH_INTERVAL, DISPLAY_MAX_CALLS, DISPLAY_REFRESH, DISPLAY_ROTATE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_DISPLAY = f"{DOMAIN}_display"
+STORAGE_VERSION = 1
+SERVICE_MARKER = "growbox_display"
+SERVICE_ROOM = "_update_room_"
+
+
+def discover_displays(services: dict) -> dict[str, int]:
+    """Return connected displays as basename -> number of room pages."""
+    displays: dict[str, int] = {}
+    for service in services:
+        if SERVICE_MARKER not in service or SERVICE_ROOM not in service:
+            continue
+        basename, page = service.rsplit(SERVICE_ROOM, 1)
+        if page.isdigit():
+            displays[basename] = max(displays.get(basename, 0), int(page))
+    return displays
+
+
+def layout_pages(slots: list[int], displays: dict[str, int], rotation: int) -> dict[str, int]:
+    """Map display services to the slot they show.
+
+    Every display mirrors all boxes while they fit on one display. Beyond
+    that the boxes are spread over the displays in slot order, and if they
+    still don't fit, the displays page through them window by window.
+    """
+    if not slots or not displays:
+        return {}
+    names = sorted(displays)
+    pages = min(displays.values())
+    last = max(slots)
+    layout = {}
+    if last <= pages:
+        for name in names:
+            for slot in slots:
+                layout[f"{name}{SERVICE_ROOM}{slot}"] = slot
+        return layout
+
+    # Slide a window of capacity slots over all slots, wrapping around so every page stays filled
+    capacity = pages * len(names)
+    offset = rotation * capacity % last if last > capacity else 0
+    for slot in slots:
+        position = (slot - 1 - offset) % last
+        if position < capacity:
+            name = names[position // pages]
+            layout[f"{name}{SERVICE_ROOM}{position % pages + 1}"] = slot
+    return layout
+
+
+class DisplayScheduler:
+    """Own the display slots of all boxes and rate-limit the ESPHome calls."""
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}_display_slots")
+        self.slots: dict[str, int] = {}
+        self._data: dict[str, dict] = {}
+        self._sent: dict[str, tuple[dict, float]] = {}
+        self._cursor = 0
+        self._unsub = None
+
+    async def async_setup(self) -> None:
+        """Load the slot map and start pushing."""
+        data = await self._store.async_load()
+        if data is None:
+            # First run: keep the assignment earlier versions derived from the entry order
+            entries = sorted(self.hass.config_entries.async_entries(DOMAIN), key=lambda e: e.entry_id)
+            self.slots = {entry.entry_id: i + 1 for i, entry in enumerate(entries)}
+            self._store.async_delay_save(self._data_to_save, 1)
+        else:
+            self.slots = data.get("slots", {})
+        self._unsub = async_track_time_interval(
+            self.hass, self._async_tick, timedelta(seconds=DISPLAY_PUSH_INTERVAL)
+        )
+
+    def _data_to_save(self) -> dict:
+        return {"slots": self.slots}
+
+    @callback
+    def async_slot(self, entry_id: str) -> int:
+        """Return the slot of a box, allocating the lowest free one."""
+        if entry_id not in self.slots:
+            used = set(self.slots.values())
+            slot = 1
+            while slot in used:
+                slot += 1
+            self.slots[entry_id] = slot
+            self._store.async_delay_save(self._data_to_save, 1)
+        return self.slots[entry_id]
+
+    @callback
+    def async_release(self, entry_id: str) -> None:
+        """Free the slot of a removed box."""
+        self._data.pop(entry_id, None)
+        if self.slots.pop(entry_id, None) is not None:
+            self._store.async_delay_save(self._data_to_save, 1)
+
+    @callback
+    def async_update(self, entry_id: str, data: dict) -> None:
+        """Set the latest page content of a box. Sent by the next free tick."""
+        self._data[entry_id] = data
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        """Stop showing an unloaded box (its slot is kept)."""
+        self._data.pop(entry_id, None)
+
+    @callback
+    @profiled
+    def _async_tick(self, now: datetime.datetime) -> None:
+        if not self._data:
+            return
+        displays = discover_displays(self.hass.services.async_services().get("esphome", {}))
+        by_slot = {self.async_slot(entry_id): entry_id for entry_id in self._data}
+        rotation = int(time.time() // DISPLAY_ROTATE)
+        layout = layout_pages(sorted(by_slot), displays, rotation)
+        if not layout:
+            return
+
+        # Round-robin over all pages, sending at most DISPLAY_MAX_CALLS that are stale
+        services = sorted(layout)
+        mono = time.monotonic()
+        sent = 0
+        for offset in range(len(services)):
+            index = (self._cursor + offset) % len(services)
+            service = services[index]
+            data = self._data[by_slot[layout[service]]]
+            last = self._sent.get(service)
+            if last and last[0] == data and mono - last[1] < DISPLAY_REFRESH:
+                continue
+            self._sent[service] = (data, mono)
+            self.hass.async_create_task(self._async_push(service, data))
+            sent += 1
+            if sent >= DISPLAY_MAX_CALLS:
+                self._cursor = index + 1
+                break
+
+    async def _async_push(self, service: str, data: dict) -> None:
+        try:
+            await self.hass.services.async_call("esphome", service, data)
+        except HomeAssistantError as err:
+            _LOGGER.debug("Failed to update display %s: %s", service, err)
+            self._sent.pop(service, None)
+        except Exception as err:
+            _LOGGER.error("Unexpected error updating display %s: %s", service, err)
+            self._sent.pop(service, None)
+
+    def as_dict(self) -> dict:
+        """Return slots and pending state (for diagnostics)."""
+        return {"slots": dict(self.slots), "active": sorted(self._data), "pages_sent": len(self._sent)}
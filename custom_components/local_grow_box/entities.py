@@ -0,0 +1,189 @@
+"""Resolved entity handles for Local Grow Box."""
+from __future__ import annotations
+
+import logging
+from typing import Callable
+
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import (
+    async_track_entity_registry_updated_event,
+    async_track_state_change_event,
+)
+
+from .const import (
+    CONF_LIGHT_ENTITY, CONF_FAN_ENTITY, CONF_PUMP_ENTITY, CONF_HUMIDIFIER_ENTITY,
+    CONF_TEMP_SENSOR, CONF_HUMIDITY_SENSOR, CONF_MOISTURE_SENSOR,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Config keys that reference entities the control loop reads or switches
+TRACKED_KEYS = (
+    CONF_LIGHT_ENTITY,
+    CONF_FAN_ENTITY,
+    CONF_PUMP_ENTITY,
+    CONF_HUMIDIFIER_ENTITY,
+    CONF_TEMP_SENSOR,
+    CONF_HUMIDITY_SENSOR,
+    CONF_MOISTURE_SENSOR,
+)
+
+# Domains tried, in order, for ids configured without a domain
+BARE_ID_DOMAINS = ("sensor", "switch", "binary_sensor")
+
+
+class EntityHandle:
+    """A configured entity reference resolved to a concrete entity id."""
+
+    __slots__ = ("key", "entity_id", "candidates", "state")
+
+    def __init__(self, key: str, candidates: tuple[str, ...]):
+        """Initialize the handle."""
+        self.key = key
+        self.entity_id: str | None = None
+        self.candidates = candidates
+        self.state: State | None = None
+
+
+class EntityTracker:
+    """Resolve configured entities once and keep their latest state cached."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config: dict,
+        on_rename: Callable[[dict[str, str]], None] | None = None,
+        extra: dict[str, str] | None = None,
+    ):
+        """Initialize the tracker.
+
+        extra maps additional keys (e.g. irrigation zones) to entity references.
+        """
+        self.hass = hass
+        self._refs = {**{key: config.get(key) for key in TRACKED_KEYS}, **(extra or {})}
+        self._on_rename = on_rename
+        self._handles: dict[str, EntityHandle] = {}
+        self._by_entity_id: dict[str, list[EntityHandle]] = {}
+        self._unsub_state = None
+        self._unsub_registry = None
+        self._listeners: list[Callable[[str, State | None, State | None], None]] = []
+
+    @callback
+    def async_setup(self) -> None:
+        """Resolve all configured references and start tracking them."""
+        registry = er.async_get(self.hass)
+        for key, raw in self._refs.items():
+            if not raw:
+                continue
+            if "." in raw:
+                candidates = (raw,)
+            else:
+                candidates = tuple(f"{domain}.{raw}" for domain in BARE_ID_DOMAINS)
+            handle = EntityHandle(key, candidates)
+            for candidate in candidates:
+                if registry.async_get(candidate) or self.hass.states.get(candidate):
+                    self._resolve(handle, candidate)
+                    break
+            else:
+                _LOGGER.debug("Entity for %s not found yet: %s", key, raw)
+            self._handles[key] = handle
+        self._async_track()
+
+    def _resolve(self, handle: EntityHandle, entity_id: str) -> None:
+        handle.entity_id = entity_id
+        handle.candidates = (entity_id,)
+        handle.state = self.hass.states.get(entity_id)
+
+    @callback
+    def _async_track(self) -> None:
+        self._async_untrack()
+        self._by_entity_id = {}
+        for handle in self._handles.values():
+            for candidate in handle.candidates:
+                self._by_entity_id.setdefault(candidate, []).append(handle)
+        if not self._by_entity_id:
+            return
+        self._unsub_state = async_track_state_change_event(
+            self.hass, list(self._by_entity_id), self._async_state_changed
+        )
+        resolved = [h.entity_id for h in self._handles.values() if h.entity_id]
+        if resolved:
+            self._unsub_registry = async_track_entity_registry_updated_event(
+                self.hass, list(set(resolved)), self._async_registry_updated
+            )
+
+    @callback
+    def _async_untrack(self) -> None:
+        if self._unsub_state:
+            self._unsub_state()
+            self._unsub_state = None
+        if self._unsub_registry:
+            self._unsub_registry()
+            self._unsub_registry = None
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        entity_id = event.data["entity_id"]
+        new_state = event.data["new_state"]
+        retrack = False
+        for handle in self._by_entity_id.get(entity_id, ()):
+            if handle.entity_id is None:
+                # First candidate of a bare id that shows up wins
+                self._resolve(handle, entity_id)
+                retrack = True
+            if handle.entity_id == entity_id:
+                handle.state = new_state
+                for listener in self._listeners:
+                    listener(handle.key, event.data["old_state"], new_state)
+        if retrack:
+            self._async_track()
+
+    @callback
+    def _async_registry_updated(self, event: Event) -> None:
+        data = event.data
+        if data.get("action") != "update" or "old_entity_id" not in data:
+            return
+        old_id, new_id = data["old_entity_id"], data["entity_id"]
+        renamed = {}
+        for handle in self._by_entity_id.get(old_id, ()):
+            self._resolve(handle, new_id)
+            renamed[handle.key] = new_id
+        if not renamed:
+            return
+        _LOGGER.info("Tracked entity renamed: %s -> %s", old_id, new_id)
+        self._async_track()
+        if self._on_rename:
+            self._on_rename(renamed)
+
+    @callback
+    def async_add_listener(
+        self, listener: Callable[[str, State | None, State | None], None]
+    ) -> Callable[[], None]:
+        """Call listener(key, old_state, new_state) on every tracked state change."""
+        self._listeners.append(listener)
+
+        @callback
+        def remove() -> None:
+            self._listeners.remove(listener)
+
+        return remove
+
+    def is_configured(self, key: str) -> bool:
+        """Return True if the config key references an entity (resolved or not)."""
+        return key in self._handles
+
+    def state(self, key: str) -> State | None:
+        """Return the latest cached state for a config key."""
+        handle = self._handles.get(key)
+        return handle.state if handle else None
+
+    def entity_id(self, key: str) -> str | None:
+        """Return the resolved entity id for a config key."""
+        handle = self._handles.get(key)
+        return handle.entity_id if handle else None
+
+    @callback
+    def async_unload(self) -> None:
+        """Stop tracking."""
+        self._async_untrack()
@@ -0,0 +1,194 @@
+"""Streaming export of a grow cycle for Local Grow Box."""
+from __future__ import annotations
+
+import csv
+import datetime
+import heapq
+import io
+import json
+import logging
+import math
+import zlib
+from itertools import islice
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .telemetry import ACTUATORS, CHANNELS, TIERS, TIERS_BY_NAME, Tier, TelemetryStore
+
+_LOGGER = logging.getLogger(__name__)
+
+CHUNK_ROWS = 1000  # Rows formatted per executor job
+EXPORT_FORMATS = ("csv", "ndjson")
+
+
+def export_columns(tier: Tier) -> list[str]:
+    """Return the data columns of a tier (after time and kind)."""
+    if tier is TIERS[0]:
+        return [*CHANNELS, *ACTUATORS, "message"]
+    columns = ["count"]
+    for channel in CHANNELS:
+        columns += [f"{channel}_mean", f"{channel}_min", f"{channel}_max"]
+    columns += [f"{actuator}_on_seconds" for actuator in ACTUATORS]
+    return [*columns, "message"]
+
+
+def parse_log_line(line: str):
+    """Return (timestamp, message) of a stored log line, None if unparsable."""
+    if not line.startswith("[") or "] " not in line:
+        return None
+    stamp, message = line[1:].split("] ", 1)
+    try:
+        when = datetime.datetime.strptime(stamp, "%d.%m.%Y %H:%M:%S")
+    except ValueError:
+        return None
+    return int(when.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE).timestamp()), message
+
+
+def _clean(value):
+    if isinstance(value, float):
+        return None if math.isnan(value) else round(value, 3)
+    return value
+
+
+class ExportProducer:
+    """Format export rows lazily, one chunk per call."""
+
+    def __init__(self, store: TelemetryStore, tier: Tier, start: int, end: int, logs: list, fmt: str, compress: bool):
+        """Initialize the producer. logs is a list of (timestamp, message) in range."""
+        self._tier = tier
+        self._fmt = fmt
+        self._columns = export_columns(tier)
+        self._records = store.iter_records(tier, start, end)
+        telemetry = ((record[0], "telemetry", record) for record in self._records)
+        log_rows = ((ts, "log", message) for ts, message in sorted(logs))
+        self._rows = heapq.merge(telemetry, log_rows, key=lambda row: row[0])
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+        self._header_done = fmt != "csv"
+        self.done = False
+
+    def _values(self, kind, payload) -> list:
+        if kind == "log":
+            return [None] * (len(self._columns) - 1) + [payload]
+        values = list(payload[1:])
+        if self._tier is TIERS[0]:
+            flags = values.pop()
+            values += [bool(flags & (1 << i)) for i in range(len(ACTUATORS))]
+        return [_clean(v) for v in values] + [None]
+
+    def next_chunk(self) -> bytes:
+        """Return the next encoded chunk. Blocking."""
+        buf = io.StringIO()
+        writer = csv.writer(buf) if self._fmt == "csv" else None
+        if not self._header_done:
+            writer.writerow(["time", "kind", *self._columns])
+            self._header_done = True
+
+        written = 0
+        for ts, kind, payload in islice(self._rows, CHUNK_ROWS):
+            written += 1
+            when = datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).isoformat()
+            values = self._values(kind, payload)
+            if writer:
+                writer.writerow([when, kind, *("" if v is None else v for v in values)])
+            else:
+                row = {"time": when, "kind": kind}
+                row.update((k, v) for k, v in zip(self._columns, values) if v is not None)
+                buf.write(json.dumps(row, ensure_ascii=False))
+                buf.write("\n")
+        if written < CHUNK_ROWS:
+            self.done = True
+
+        data = buf.getvalue().encode("utf-8")
+        if self._compressor:
+            data = self._compressor.compress(data)
+            if self.done:
+                data += self._compressor.flush()
+        return data
+
+    def close(self):
+        """Release the memory-mapped segment. Blocking."""
+        self._records.close()
+
+
+class GrowExportView(HomeAssistantView):
+    """Stream a box's telemetry and action log as CSV or NDJSON."""
+
+    url = "/api/local_grow_box/export/{entry_id}"
+    name = "api:local_grow_box:export"
+
+    async def get(self, request: web.Request, entry_id: str) -> web.StreamResponse:
+        """Handle the export.
+
+        Query: start/end (ISO, default the phase range), phase=current or a
+        phase id (its latest recorded run), format=csv|ndjson,
+        resolution=raw|1m|15m|1h, gzip=1, logs=0. Past phases are known from
+        the phase changes recorded in the controller state.
+        """
+        hass = request.app["hass"]
+        manager = hass.data.get(DOMAIN, {}).get(entry_id)
+        if manager is None:
+            return self.json_message("Entry not found", 404)
+
+        query = request.query
+        fmt = query.get("format", "csv")
+        if fmt not in EXPORT_FORMATS:
+            return self.json_message("Invalid format", 400)
+
+        period = manager.phase_period(query.get("phase", "current"))
+        if period is None:
+            return self.json_message("No recorded run of this phase", 404)
+        start, end = period
+        try:
+            if "start" in query:
+                start = dt_util.parse_datetime(query["start"])
+            if "end" in query:
+                end = dt_util.parse_datetime(query["end"])
+        except ValueError:
+            start = None
+        if start is None or end is None:
+            return self.json_message("Invalid start or end", 400)
+        if start.tzinfo is None:
+            start = dt_util.as_local(start)
+        if end.tzinfo is None:
+            end = dt_util.as_local(end)
+        start_ts, end_ts = int(start.timestamp()), int(end.timestamp())
+
+        tier = TIERS_BY_NAME.get(query.get("resolution", ""))
+        if tier is None:
+            # Finest tier whose retention still covers the start
+            tier = manager.telemetry.pick_tier(start_ts, end_ts, max_points=2**62)
+
+        logs = []
+        if query.get("logs", "1") != "0":
+            for line in await manager.async_load_logs():
+                parsed = parse_log_line(line)
+                if parsed and start_ts <= parsed[0] < end_ts:
+                    logs.append(parsed)
+
+        compress = query.get("gzip") == "1"
+        filename = f"grow_box_{entry_id}_{start.date().isoformat()}.{fmt}"
+        headers = {hdrs.CONTENT_DISPOSITION: f'attachment; filename="{filename}{".gz" if compress else ""}"'}
+        content_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+        if compress:
+            content_type = "application/gzip"
+
+        await manager.telemetry.async_flush()
+        producer = ExportProducer(manager.telemetry, tier, start_ts, end_ts, logs, fmt, compress)
+
+        response = web.StreamResponse(headers=headers)
+        response.content_type = content_type
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+        try:
+            while not producer.done:
+                chunk = await hass.async_add_executor_job(producer.next_chunk)
+                if chunk:
+                    await response.write(chunk)
+        finally:
+            await hass.async_add_executor_job(producer.close)
+        await response.write_eof()
+        return response
@@ -1,3 +1,522 @@
+// Phase defaults when the backend sends no phase profiles
+const PHASE_HOURS = { seedling: 18, vegetative: 18, flowering: 12, drying: 0, curing: 0 };
+const PHASES = [
+    { id: 'seedling', label: '🌱 Keimling' },
+    { id: 'vegetative', label: '🌿 Wachstum' },
+    { id: 'flowering', label: '🌸 Blüte' },
+    { id: 'drying', label: '🍂 Trocknen' },
+    { id: 'curing', label: '🏺 Veredelung' }
+];
+const PHASE_ICONS = { seedling: '🌱', vegetative: '🌿', flowering: '🌸', drying: '🍂', curing: '🏺' };
+const PHASE_VPD = {
+    seedling: { min: 0.4, max: 0.8 },
+    vegetative: { min: 0.8, max: 1.2 },
+    flowering: { min: 1.2, max: 1.6 },
+    drying: { min: 0.8, max: 1.0 },
+    curing: { min: 0.5, max: 0.7 }
+};
+
+const STAT_BARS = [
+    { key: 'temp', label: 'Temperatur', unit: '°C', min: 10, max: 45, color: '#ef4444' },
+    { key: 'hum', label: 'Luftfeuchte', unit: '%', min: 20, max: 90, color: '#3b82f6' },
+    { key: 'vpd', label: 'VPD', unit: 'kPa', min: 0, max: 3.0, color: '#10b981' },
+    { key: 'soil', label: 'Bodenfeuchte', unit: '%', min: 0, max: 100, color: '#8b5cf6' }
+];
+
+const NO_IMAGE_URL = 'https://upload.wikimedia.org/wikipedia/commons/1/14/No_Image_Available.jpg';
+
+// Write a text, class, style or attribute only if it differs from the last write,
+// so nodes whose value did not change are never touched
+function patchNode(node, prop, value) {
+    if (!node) return;
+    const last = node._patched || (node._patched = {});
+    if (last[prop] === value) return;
+    last[prop] = value;
+    if (prop === 'text') node.textContent = value;
+    else if (prop === 'class') node.className = value;
+    else if (prop.startsWith('style.')) node.style[prop.slice(6)] = value;
+    else node.setAttribute(prop, value);
+}
+
+// Collect the nodes marked with data-ref
+function collectRefs(root) {
+    const refs = {};
+    root.querySelectorAll('[data-ref]').forEach(node => { refs[node.dataset.ref] = node; });
+    return refs;
+}
+
+/**
+ * Overview card of one box. The DOM is built once; update() compares the
+ * backing entities and the live state with the last update and patches
+ * only the value nodes that changed.
+ */
+class GrowBoxCard {
+    constructor(panel, device) {
+        this.panel = panel;
+        this.device = device;
+        const o = device.options;
+        this._entities = {
+            master: device.entities.master,
+            pump: device.entities.pump,
+            days: device.entities.days,
+            phase: device.entities.phase,
+            vpd: device.entities.vpd,
+            light: o.light_entity,
+            fan: o.fan_entity,
+            humidifier: o.humidifier_entity,
+            temp: o.temp_sensor,
+            hum: o.humidity_sensor,
+            soil: o.moisture_sensor,
+            camera: o.camera_entity
+        };
+        this._states = {};
+        this._live = null;
+        this._stream = null;
+
+        // Phase profiles from the backend, the built-in list if unavailable
+        this._phases = device.phases
+            ? device.phases.map(p => ({ id: p.id, label: `${PHASE_ICONS[p.id] || '🪴'} ${p.name}`, profile: p }))
+            : PHASES;
+
+        // Next automatic phase change (grow plan)
+        const upcoming = device.growPlan?.transitions?.[0];
+        this._nextTransition = upcoming
+            ? ` · ${this._phases.find(p => p.id === upcoming.to)?.label || upcoming.to} ab ${new Date(upcoming.at).toLocaleDateString('de-DE')}`
+            : '';
+
+        this.el = document.createElement('div');
+        this.el.className = 'card';
+        this._build();
+    }
+
+    _statBar(bar) {
+        return `
+            <div style="margin-bottom:12px;">
+                <div class="stat-row" style="margin-bottom:4px;">
+                    <span class="stat-label">${bar.label} <span data-ref="${bar.key}-target" style="font-size:10px; opacity:0.7;"></span></span>
+                    <span class="stat-value" data-ref="${bar.key}-value">--</span>
+                </div>
+                <div class="bar-bg" data-ref="${bar.key}-bar" style="position:relative;">
+                    <div data-ref="${bar.key}-zone" style="position:absolute; height:100%; background:rgba(255,255,255,0.3); z-index:1;"></div>
+                    <div class="bar-fill" data-ref="${bar.key}-fill" style="width:0%; background-color:${bar.color}; position:relative; z-index:2; opacity:0.8;"></div>
+                </div>
+            </div>
+        `;
+    }
+
+    _infoBox(key, label) {
+        return `
+            <div class="info-box">
+                <div class="info-icon" data-ref="${key}-icon"></div>
+                <div class="info-content">
+                    <div class="info-label">${label}</div>
+                    <div class="info-val" data-ref="${key}-val"></div>
+                </div>
+            </div>
+        `;
+    }
+
+    _build() {
+        const device = this.device;
+        const o = device.options;
+        const bars = STAT_BARS.filter(bar => bar.key !== 'soil' || o.moisture_sensor);
+
+        this.el.innerHTML = `
+            <div class="card-image" data-ref="image">
+                <img data-ref="img" onerror="this.src='${NO_IMAGE_URL}'">
+                <div class="live-badge" data-ref="live-badge" style="display:none;">LIVE</div>
+                <div style="position:absolute; bottom:0; left:0; right:0; padding:12px; background:linear-gradient(to top, rgba(0,0,0,0.9), transparent); display:flex; justify-content:space-between; align-items:end;">
+                    <div>
+                         <select class="phase-select" data-ref="phase" style="
+                            background: rgba(0,0,0,0.6);
+                            border: 1px solid rgba(255,255,255,0.2);
+                            color: white;
+                            padding: 4px 8px;
+                            border-radius: 4px;
+                            font-size: 14px;
+                            cursor: pointer;
+                            outline: none;
+                         ">
+                            ${this._phases.map(p => `<option value="${p.id}">${p.label}</option>`).join('')}
+                        </select>
+                        <div data-ref="days" style="color:white; font-weight:500; font-size:13px; margin-top:6px; margin-left:2px; text-shadow: 0 1px 2px rgba(0,0,0,0.8);"></div>
+                    </div>
+                </div>
+            </div>
+
+            <div class="card-header">
+                <div class="card-title">${device.name}</div>
+                <div data-ref="status"></div>
+            </div>
+
+            <div class="card-body">
+                ${bars.map(bar => this._statBar(bar)).join('')}
+
+                <div style="margin-top:16px; border-top:1px solid rgba(255,255,255,0.05); padding-top:16px; display:grid; grid-template-columns: 1fr 1fr; gap:12px;">
+                    <div class="info-box">
+                        <div class="info-icon" data-ref="light-icon"></div>
+                        <div class="info-content">
+                            <div class="info-label">Licht</div>
+                            <div class="info-val" style="font-size:12px;">
+                                <span data-ref="light-val"></span><br><span data-ref="light-schedule" style="font-size:10px; opacity:0.7"></span>
+                            </div>
+                        </div>
+                    </div>
+
+                    ${this._infoBox('fan', 'Abluft')}
+                    ${o.pump_entity ? this._infoBox('pump', 'Pumpe') : ''}
+                    ${o.humidifier_entity ? this._infoBox('humidifier', 'Befeuchter') : `
+                    <div class="info-box" style="opacity:0.4;">
+                        <div class="info-icon">🌫️</div>
+                        <div class="info-content">
+                            <div class="info-label">Befeuchter</div>
+                            <div class="info-val">Nicht konfiguriert</div>
+                        </div>
+                    </div>
+                    `}
+                </div>
+            </div>
+
+            <div class="controls">
+                <button class="btn" data-ref="btn-master">⚡ Master</button>
+                ${o.pump_entity ? '<button class="btn" data-ref="btn-pump">💧 Pumpe</button>' : ''}
+                ${o.humidifier_entity ? '<button class="btn" data-ref="btn-humidifier">💦 Befeuchter</button>' : ''}
+                <button class="btn" data-ref="btn-upload">📷 Bild</button>
+            </div>
+        `;
+        this.refs = collectRefs(this.el);
+        const r = this.refs;
+        const panel = this.panel;
+
+        // Events
+        r['btn-master'].onclick = () => panel._toggle(device.entities.master);
+        if (r['btn-pump']) r['btn-pump'].onclick = () => panel._toggle(device.entities.pump || o.pump_entity);
+        if (r['btn-humidifier']) r['btn-humidifier'].onclick = () => panel._toggle(device.entities.humidifier || o.humidifier_entity);
+        r['btn-upload'].onclick = () => panel._triggerUpload(device.id);
+        r.image.style.cursor = 'pointer';
+        r.image.onclick = (e) => {
+            // Prevent click if clicking the select or badge
+            if (e.target.tagName === 'SELECT' || e.target.closest('.phase-select')) return;
+            panel._openCameraModal(this._imgUrl, device.name, this._stream ? this._states.camera : null);
+        };
+
+        // Phase Change Event
+        r.phase.onchange = async (e) => {
+            const newPhase = e.target.value;
+            if (confirm(`Phase wirklich auf "${this._phases.find(p => p.id === newPhase).label}" ändern?`)) {
+                try {
+                    await panel._hass.callWS({
+                        type: 'local_grow_box/update_config',
+                        entry_id: device.entryId,
+                        config: { current_phase: newPhase }
+                    });
+                    panel._fetchDevices();
+                } catch (err) {
+                    alert("Fehler beim Ändern der Phase: " + err);
+                }
+            } else {
+                e.target.value = this._phase; // Revert
+            }
+        };
+    }
+
+    update(force = false) {
+        const hass = this.panel._hass;
+        const live = this.panel._live[this.device.entryId] || {};
+
+        // hass replaces the state object of an entity only when it changes
+        const states = {};
+        let changed = force || live !== this._live;
+        Object.entries(this._entities).forEach(([key, entityId]) => {
+            states[key] = entityId ? hass.states[entityId] : undefined;
+            if (states[key] !== this._states[key]) changed = true;
+        });
+        if (!changed) return;
+        this._states = states;
+        this._live = live;
+
+        const device = this.device;
+        const r = this.refs;
+
+        // Data (live values pushed by the backend win over hass.states)
+        const isOn = (key) => states[key]?.state === 'on';
+        const getVal = (key) => {
+            const s = states[key];
+            return s && !isNaN(s.state) ? Math.round(parseFloat(s.state) * 100) / 100 : null;
+        };
+        // Fix: Prioritize options over sensor state to avoid stale data after update
+        const currentPhase = device.options.current_phase || states.phase?.state || 'vegetative';
+        this._phase = currentPhase;
+        const profile = this._phases.find(p => p.id === currentPhase)?.profile;
+
+        if (r.phase.value !== currentPhase) r.phase.value = currentPhase;
+        patchNode(r.days, 'text', `Tag ${live.days ?? (states.days?.state || 0)}${this._nextTransition}`);
+
+        const masterOn = isOn('master');
+        patchNode(r.status, 'class', `status-badge ${masterOn ? 'online' : 'offline'}`);
+        patchNode(r.status, 'text', masterOn ? '● Online' : '○ Offline');
+
+        // Symmetric Target Zones (+/- Hysteresis)
+        const setpoints = device.box?.setpoints;
+        const targetHum = setpoints ? setpoints.target_humidity : parseFloat(device.options.target_humidity || 65);
+        const targetTemp = setpoints ? setpoints.target_temp : parseFloat(device.options.target_temp || 24);
+        const humHysteresis = setpoints ? setpoints.humidity_hysteresis : parseFloat(device.options.humidity_hysteresis || 2);
+        const tempHysteresis = setpoints ? setpoints.temp_hysteresis : parseFloat(device.options.temp_hysteresis || 1);
+        const targets = {
+            temp: { min: targetTemp - tempHysteresis, max: targetTemp + tempHysteresis },
+            hum: { min: targetHum - humHysteresis, max: targetHum + humHysteresis },
+            vpd: profile ? { min: profile.vpd_min, max: profile.vpd_max } : PHASE_VPD[currentPhase] || null
+        };
+        const values = {
+            temp: live.temp ?? getVal('temp'),
+            hum: live.hum ?? getVal('hum'),
+            vpd: live.vpd ?? getVal('vpd'),
+            soil: live.soil ?? getVal('soil')
+        };
+        STAT_BARS.forEach(bar => this._patchStatBar(bar, values[bar.key], targets[bar.key]));
+
+        this._patchLight(live.light ?? isOn('light'), currentPhase, profile);
+
+        const fanOn = isOn('fan');
+        patchNode(r['fan-icon'], 'text', fanOn ? '🌪️' : '💨');
+        patchNode(r['fan-val'], 'text', fanOn ? 'An' : 'Aus');
+        const pumpOn = isOn('pump');
+        patchNode(r['pump-icon'], 'text', pumpOn ? '💧' : '⛔');
+        patchNode(r['pump-val'], 'text', pumpOn ? 'Läuft' : 'Aus');
+        const humidifierOn = isOn('humidifier');
+        patchNode(r['humidifier-icon'], 'text', humidifierOn ? '💦' : '🌫️');
+        patchNode(r['humidifier-val'], 'text', humidifierOn ? 'An' : 'Aus');
+
+        patchNode(r['btn-master'], 'class', masterOn ? 'btn active' : 'btn');
+        patchNode(r['btn-pump'], 'class', pumpOn ? 'btn active' : 'btn');
+        patchNode(r['btn-humidifier'], 'class', humidifierOn ? 'btn active' : 'btn');
+
+        this._patchImage(hass, states.camera);
+    }
+
+    _patchStatBar(bar, val, targetRange) {
+        const r = this.refs;
+        if (!r[`${bar.key}-value`]) return;
+        patchNode(r[`${bar.key}-value`], 'text', val === null ? '--' : `${val} ${bar.unit}`);
+        patchNode(r[`${bar.key}-bar`], 'style.visibility', val === null ? 'hidden' : 'visible');
+        const pct = (v) => Math.min(100, Math.max(0, ((v - bar.min) / (bar.max - bar.min)) * 100));
+        if (val !== null) patchNode(r[`${bar.key}-fill`], 'style.width', `${pct(val)}%`);
+
+        // Target Area Rendering
+        const zone = r[`${bar.key}-zone`];
+        const showTarget = targetRange && val !== null;
+        patchNode(zone, 'style.display', showTarget ? 'block' : 'none');
+        patchNode(r[`${bar.key}-target`], 'text', showTarget ? `(Ziel: ${targetRange.min}-${targetRange.max})` : '');
+        if (showTarget) {
+            patchNode(zone, 'style.left', `${pct(targetRange.min)}%`);
+            patchNode(zone, 'style.width', `${pct(targetRange.max) - pct(targetRange.min)}%`);
+        }
+    }
+
+    _patchLight(isLightOn, currentPhase, profile) {
+        const r = this.refs;
+        const startHour = profile ? profile.light_start_hour : parseInt(this.device.options.light_start_hour || 18);
+        const duration = profile ? profile.light_hours : (PHASE_HOURS[currentPhase] || 12);
+
+        // Format Schedule Display (e.g. 13:00 - 07:00)
+        const endTotal = startHour + duration;
+        const endH = Math.floor(endTotal % 24);
+        const endM = Math.floor((endTotal % 1) * 60);
+
+        const now = new Date();
+        const start = new Date(now);
+        start.setHours(startHour, 0, 0, 0);
+        let startTime = start.getTime();
+        let endTime = startTime + (duration * 3600 * 1000);
+        if (now.getHours() < startHour) {
+            startTime -= 24 * 3600 * 1000;
+            endTime -= 24 * 3600 * 1000;
+        }
+
+        const nowTime = now.getTime();
+        const isLightTime = nowTime >= startTime && nowTime < endTime;
+        const untilMs = isLightTime ? endTime - nowTime : startTime + 24 * 3600 * 1000 - nowTime;
+        const hrs = Math.floor(untilMs / (1000 * 60 * 60));
+        const mins = Math.floor((untilMs % (1000 * 60 * 60)) / (1000 * 60));
+
+        let lightInfo;
+        if (isLightTime) {
+            lightInfo = isLightOn ? `An (noch ${hrs}h ${mins}m)` : 'Aus (Sollte AN sein!)';
+        } else {
+            lightInfo = isLightOn ? 'An (Sollte AUS sein!)' : `Aus (Start in ${hrs}h ${mins}m)`;
+        }
+        patchNode(r['light-icon'], 'text', isLightOn ? '💡' : '🌑');
+        patchNode(r['light-val'], 'text', lightInfo);
+        patchNode(r['light-schedule'], 'text', `${startHour}:00 - ${endH}:${endM.toString().padStart(2, '0')}`);
+    }
+
+    _patchImage(hass, camStateObj) {
+        const r = this.refs;
+        // Image Logic with Cache Busting (Persisted)
+        this._imgUrl = camStateObj
+            ? camStateObj.attributes.entity_picture
+            : `/local/local_grow_box_images/${this.device.id}.jpg?v=${this.device.options.image_version || 0}`;
+        patchNode(r.img, 'src', this._imgUrl);
+        patchNode(r.img, 'style.display', camStateObj ? 'none' : '');
+        patchNode(r['live-badge'], 'style.display', camStateObj ? '' : 'none');
+
+        // The livestream is created once and only handed the new camera state
+        if (camStateObj && !this._stream) {
+            const stream = document.createElement('ha-camera-stream');
+            stream.muted = true;
+            stream.allowExoplayer = true;
+            stream.style.cssText = "width:100%; height:100%; object-fit:cover; display:block; pointer-events:none; position:absolute; top:0; left:0; opacity:0.8;";
+            r.image.insertBefore(stream, r.image.firstChild);
+            this._stream = stream;
+        } else if (!camStateObj && this._stream) {
+            this._stream.remove();
+            this._stream = null;
+        }
+        if (this._stream && this._stream.stateObj !== camStateObj) {
+            this._stream.hass = hass;
+            this._stream.stateObj = camStateObj;
+        }
+    }
+}
+
+const STAT_CHARTS = [
+    { key: 'temp', label: '🌡️ Temperatur', color: '#ef4444', unit: '°C' },
+    { key: 'hum', label: '💧 Luftfeuchte', color: '#3b82f6', unit: '%' },
+    { key: 'vpd', label: '🍃 VPD', color: '#10b981', unit: 'kPa' },
+    { key: 'soil', label: '🪴 Bodenfeuchte', color: '#8b5cf6', unit: '%' }
+];
+
+/**
+ * Statistics card of one box. Current values are patched like on the
+ * overview; a chart SVG is only rebuilt when its history series changes.
+ */
+class GrowBoxStatsCard {
+    constructor(panel, device) {
+        this.panel = panel;
+        this.device = device;
+        const sensors = {
+            temp: device.options.temp_sensor,
+            hum: device.options.humidity_sensor,
+            vpd: device.entities.vpd,
+            soil: device.options.moisture_sensor
+        };
+        this.charts = STAT_CHARTS
+            .filter(chart => sensors[chart.key])
+            .map(chart => ({ ...chart, entityId: sensors[chart.key], state: null, series: null }));
+
+        this.el = document.createElement('div');
+        this.el.className = 'card';
+        this.el.style.padding = '24px';
+        this.el.style.display = 'block';
+        this.el.innerHTML = `
+            <div style="border-bottom: 1px dashed rgba(255,255,255,0.1); padding-bottom: 15px; margin-bottom: 20px;">
+                <h3 style="margin:0; font-size:20px; color:#38bdf8;">${device.name}</h3>
+            </div>
+            <div style="display: flex; flex-direction: column; gap: 10px;">
+                ${this.charts.map(chart => `
+                    <div class="chart-row" data-entity="${chart.entityId}" style="margin-bottom: 20px; text-align: left; cursor: pointer;">
+                        <div style="display: flex; justify-content: space-between; align-items: flex-end; margin-bottom: 8px;">
+                            <h4 style="color: ${chart.color}; margin: 0; font-size: 1.0em; text-transform: uppercase;">${chart.label}</h4>
+                            <span data-ref="${chart.key}-value" style="color: #fff; font-size: 1.1em; font-weight: bold;"></span>
+                        </div>
+                        <div data-ref="${chart.key}-chart"></div>
+                    </div>
+                `).join('')}
+            </div>
+            <div style="margin-top: 20px; text-align: left; padding: 15px; background: rgba(0,0,0,0.3); border-radius: 8px;">
+                <h4 style="margin: 0; color: var(--text-secondary); font-size: 0.85em;">Klicke auf einen Graphen, um die detaillierte Ansicht von Home Assistant zu öffnen.</h4>
+            </div>
+        `;
+        this.refs = collectRefs(this.el);
+        this.el.querySelectorAll('.chart-row').forEach(c => {
+            c.onclick = () => panel._showMoreInfo(c.dataset.entity);
+        });
+    }
+
+    update(force = false) {
+        const panel = this.panel;
+        this.charts.forEach(chart => {
+            const state = panel._hass.states[chart.entityId];
+            const series = panel.historyData[chart.entityId];
+            if (series === undefined && !panel.fetchingHistory[chart.entityId]) {
+                panel.fetchingHistory[chart.entityId] = true;
+                panel.fetchHistoryData(chart.entityId);
+            }
+            if (!force && state === chart.state && series === chart.series) return;
+
+            // The SVG is only rebuilt when the series changed, not on every new state
+            if (series !== chart.series) {
+                this.refs[`${chart.key}-chart`].innerHTML = this._chartBody(chart, series);
+            }
+            chart.state = state;
+            chart.series = series;
+
+            const points = (series || []).filter(d => !isNaN(parseFloat(d.state)));
+            const value = state ? state.state : (points.length ? points[points.length - 1].state : '-');
+            const unit = state?.attributes.unit_of_measurement || chart.unit;
+            patchNode(this.refs[`${chart.key}-value`], 'text', `${value} ${unit}`);
+        });
+    }
+
+    _chartBody(chart, data) {
+        if (data === undefined) {
+            return `<div style="height: 150px; display: flex; align-items: center; justify-content: center; color: var(--text-secondary); background: rgba(0,0,0,0.2); border-radius: 8px; border: 1px solid rgba(255,255,255,0.05);">Lade ${chart.label}...</div>`;
+        }
+
+        const validData = data.filter(d => !isNaN(parseFloat(d.state)));
+        if (validData.length === 0) {
+            return `<div style="height: 120px; display: flex; align-items: center; justify-content: center; color: var(--text-secondary); background: rgba(0,0,0,0.2); border-radius: 8px; border: 1px solid rgba(255,255,255,0.05);">Keine Verlaufsdaten für ${chart.label} gefunden.</div>`;
+        }
+
+        const values = validData.map(d => parseFloat(d.state));
+        const times = validData.map(d => new Date(d.last_changed).getTime());
+
+        const minVal = Math.min(...values);
+        let maxVal = Math.max(...values);
+        if (minVal === maxVal) maxVal = minVal + 1;
+        const minTime = Math.min(...times);
+        let maxTime = Math.max(...times);
+        if (minTime === maxTime) maxTime = minTime + 1000;
+
+        const rangeY = maxVal - minVal;
+        const rangeX = maxTime - minTime;
+        const width = 600;
+        const height = 120;
+        const padding = 20;
+
+        const points = validData.map((d, i) => {
+            const x = ((times[i] - minTime) / rangeX) * width;
+            const y = height - (((values[i] - minVal) / rangeY) * height);
+            return `${x},${y}`;
+        });
+
+        const pathData = `M ${points[0]} L ${points.join(' L ')}`;
+        const fillPathData = `M ${points[0].split(',')[0]},${height} L ${points.join(' L ')} L ${points[points.length - 1].split(',')[0]},${height} Z`;
+        const safeId = chart.entityId.replace(/\./g, '_');
+
+        return `
+            <div style="position: relative; height: ${height + padding * 2}px; border-radius: 8px; background: rgba(0,0,0,0.2); border: 1px solid rgba(255,255,255,0.05); overflow: hidden;">
+                <svg viewBox="0 -${padding} ${width} ${height + padding * 2}" preserveAspectRatio="none" style="width: 100%; height: 100%; display: block;">
+                    <defs>
+                        <linearGradient id="grad_${safeId}" x1="0%" y1="0%" x2="0%" y2="100%">
+                            <stop offset="0%" style="stop-color:${chart.color};stop-opacity:0.4" />
+                            <stop offset="100%" style="stop-color:${chart.color};stop-opacity:0.0" />
+                        </linearGradient>
+                    </defs>
+                    <path d="${fillPathData}" fill="url(#grad_${safeId})" />
+                    <path d="${pathData}" fill="none" stroke="${chart.color}" stroke-width="2" vector-effect="non-scaling-stroke" stroke-linejoin="round" stroke-linecap="round"/>
+                </svg>
+                <div style="position: absolute; top: 10px; left: 10px; color: rgba(255,255,255,0.8); font-size: 0.8em; font-weight: bold;">
+                    MAX: ${maxVal.toFixed(2)}
+                </div>
+                <div style="position: absolute; bottom: 10px; left: 10px; color: rgba(255,255,255,0.4); font-size: 0.8em;">
+                    MIN: ${minVal.toFixed(2)}
+                </div>
+            </div>
+        `;
+    }
+}
+
 class LocalGrowBoxPanel extends HTMLElement {
     constructor() {
         super();
@@ -7,6 +526,58 @@ class LocalGrowBoxPanel extends HTMLElement {
         this._draft = {}; // entryId -> { key: value }
         this.historyData = {};
         this.fetchingHistory = {};
+        this._live = {}; // entryId -> compact live state pushed by the backend
+        this._liveUnsub = null;
+        this._clockTimer = null;
+        this._cards = []; // Cards of the overview or statistics tab, patched in place
+    }
+
+    connectedCallback() {
+        if (this._initialized) this._subscribeLive();
+    }
+
+    disconnectedCallback() {
+        this._unsubscribeLive();
+    }
+
+    async _subscribeLive() {
+        if (this._liveUnsub || !this._hass) return;
+        this._liveUnsub = true; // Guard against concurrent subscribe calls
+        try {
+            this._liveUnsub = await this._hass.connection.subscribeMessage(
+                (msg) => this._onLiveState(msg),
+                { type: 'local_grow_box/subscribe_state' }
+            );
+        } catch (e) {
+            console.warn("Live state subscription failed", e);
+            this._liveUnsub = null; // Cards still follow the hass updates
+        }
+        // Countdown texts (light timer) still need a slow refresh without any state change
+        if (!this._clockTimer) {
+            this._clockTimer = setInterval(() => {
+                if (this._activeTab === 'overview') this._refreshCards(true);
+            }, 60000);
+        }
+    }
+
+    _unsubscribeLive() {
+        if (typeof this._liveUnsub === 'function') this._liveUnsub();
+        this._liveUnsub = null;
+        if (this._clockTimer) {
+            clearInterval(this._clockTimer);
+            this._clockTimer = null;
+        }
+    }
+
+    _onLiveState(msg) {
+        if (!msg || !msg.boxes) return;
+        let changed = false;
+        Object.entries(msg.boxes).forEach(([entryId, delta]) => {
+            this._live[entryId] = { ...(this._live[entryId] || {}), ...delta };
+            changed = true;
+        });
+        // Only cards of boxes whose values changed touch the DOM
+        if (changed) this._refreshCards();
     }
 
     set hass(hass) {
@@ -31,6 +602,7 @@ class LocalGrowBoxPanel extends HTMLElement {
         if (!this._initialized) {
             this._initialized = true;
             this._fetchDevices();
+            this._subscribeLive();
         }
 
         // Re-render logic
@@ -50,8 +622,13 @@ class LocalGrowBoxPanel extends HTMLElement {
                 return;
             }
 
-            // Overview and Statistics get live updates
-            this._render();
+            // Overview and Statistics cards are built once and only patch the
+            // values whose entities changed (see GrowBoxCard.update).
+            if (!this.shadowRoot || !this.shadowRoot.querySelector('.header')) {
+                this._render();
+            } else {
+                this._refreshCards();
+            }
         }
     }
 
@@ -70,6 +647,12 @@ class LocalGrowBoxPanel extends HTMLElement {
             const entities = await this._hass.callWS({ type: 'config/entity_registry/list' });
             const entries = await this._hass.callWS({ type: 'config_entries/get', domain: 'local_grow_box' });
             // console.log("Fetched entries:", entries);
+            try {
+                this._irrigation = await this._hass.callWS({ type: 'local_grow_box/get_irrigation' });
+                this._power = await this._hass.callWS({ type: 'local_grow_box/get_power' });
+            } catch (e) {
+                console.warn("[FETCH] Failed to fetch irrigation/power settings:", e);
+            }
 
             // Filter: Look for devices with identifiers matching our domain
             const myDevices = devices.filter(d =>
@@ -98,6 +681,52 @@ class LocalGrowBoxPanel extends HTMLElement {
                     }
                 }
 
+                // Effective setpoints with defaults applied (formerly Master Control attributes)
+                let box = null;
+                if (entry) {
+                    try {
+                        box = await this._hass.callWS({
+                            type: 'local_grow_box/get_box',
+                            entry_id: entry.entry_id
+                        });
+                    } catch (e) {
+                        console.warn(`[FETCH] Failed to fetch box for ${device.name}:`, e);
+                    }
+                }
+
+                // Phase profiles (built-in and custom, with their setpoints) and the grow plan
+                let phases = null;
+                let growPlan = { plan: [], transitions: [] };
+                if (entry) {
+                    try {
+                        const phaseResp = await this._hass.callWS({
+                            type: 'local_grow_box/get_phases',
+                            entry_id: entry.entry_id
+                        });
+                        phases = phaseResp.phases;
+                        growPlan = await this._hass.callWS({
+                            type: 'local_grow_box/get_grow_plan',
+                            entry_id: entry.entry_id
+                        });
+                    } catch (e) {
+                        console.warn(`[FETCH] Failed to fetch phases for ${device.name}:`, e);
+                    }
+                }
+
+                // Additional irrigation zones
+                let waterZones = [];
+                if (entry) {
+                    try {
+                        const zoneResp = await this._hass.callWS({
+                            type: 'local_grow_box/get_water_zones',
+                            entry_id: entry.entry_id
+                        });
+                        waterZones = zoneResp.zones;
+                    } catch (e) {
+                        console.warn(`[FETCH] Failed to fetch water zones for ${device.name}:`, e);
+                    }
+                }
+
                 const findEntity = (uniqueIdSuffix) => {
                     const ent = deviceEntities.find(e => e.unique_id.endsWith(uniqueIdSuffix));
                     return ent ? ent.entity_id : null;
@@ -108,6 +737,10 @@ class LocalGrowBoxPanel extends HTMLElement {
                     id: device.id,
                     entryId: entry ? entry.entry_id : null,
                     options: combinedOptions,
+                    box: box,
+                    phases: phases,
+                    growPlan: growPlan,
+                    waterZones: waterZones,
                     entities: {
                         phase: findEntity('_phase'),
                         master: findEntity('_master_switch'),
@@ -458,11 +1091,17 @@ class LocalGrowBoxPanel extends HTMLElement {
         });
     }
 
+    _refreshCards(force = false) {
+        if (!this._hass) return;
+        this._cards.forEach(card => card.update(force));
+    }
+
     _updateContent() {
         const container = this.shadowRoot.getElementById('main-content');
         if (!container || !this._devices) return;
 
         container.innerHTML = '';
+        this._cards = [];
 
         if (this._activeTab === 'overview') {
             this._renderOverview(container);
@@ -487,305 +1126,12 @@ class LocalGrowBoxPanel extends HTMLElement {
 
         const grid = document.createElement('div');
         grid.className = 'grid';
-
-        // Phase Hours Map (default)
-        const PHASE_HOURS = {
-            'seedling': 18,
-            'vegetative': 18,
-            'flowering': 12,
-            'drying': 0,
-            'curing': 0
-        };
-        const PHASES = [
-            { id: 'seedling', label: '🌱 Keimling' },
-            { id: 'vegetative', label: '🌿 Wachstum' },
-            { id: 'flowering', label: '🌸 Blüte' },
-            { id: 'drying', label: '🍂 Trocknen' },
-            { id: 'curing', label: '🏺 Veredelung' }
-        ];
-
         this._devices.forEach(device => {
-            const card = document.createElement('div');
-            card.className = 'card';
-
-            // Data
-            const masterState = this._hass.states[device.entities.master];
-            const pumpState = this._hass.states[device.entities.pump];
-            const daysInPhase = this._hass.states[device.entities.days]?.state || 0;
-            // Fix: Prioritize options over sensor state to avoid stale data after update
-            const currentPhase = device.options.current_phase || this._hass.states[device.entities.phase]?.state || 'vegetative';
-
-            // --- Light Timer Logic ---
-            // --- Light Timer Logic ---
-            let lightInfo = "Unbekannt";
-            // Use ACTUAL state for the icon/visual
-            const realLightState = this._hass.states[device.options.light_entity]?.state;
-            const isLightOn = realLightState === 'on';
-            // Variable used by rendering for Icon/Color
-            let lightStatus = isLightOn ? 'on' : 'off';
-
-            const startHour = parseInt(device.options.light_start_hour || 18);
-            let duration = PHASE_HOURS[currentPhase] || 12;
-            if (device.options[`${currentPhase}_hours`]) duration = parseFloat(device.options[`${currentPhase}_hours`]);
-
-            // Format Schedule Display (e.g. 13:00 - 07:00)
-            const endTotal = startHour + duration;
-            const endH = Math.floor(endTotal % 24);
-            const endM = Math.floor((endTotal % 1) * 60);
-            // Simple check: if duration is integer, don't show :00 for end if you want cleaner look, but consistency is good.
-            const fmtSchedule = `${startHour}:00 - ${endH}:${endM.toString().padStart(2, '0')}`;
-
-            const now = new Date();
-            const start = new Date(now);
-            start.setHours(startHour, 0, 0, 0);
-
-            let startTime = start.getTime();
-            let endTime = startTime + (duration * 3600 * 1000);
-
-            if (now.getHours() < startHour) {
-                startTime -= 24 * 3600 * 1000;
-                endTime -= 24 * 3600 * 1000;
-            }
-
-            const nowTime = now.getTime();
-            const isLightTime = nowTime >= startTime && nowTime < endTime;
-
-            if (isLightTime) {
-                const remainingMs = endTime - nowTime;
-                const hrs = Math.floor(remainingMs / (1000 * 60 * 60));
-                const mins = Math.floor((remainingMs % (1000 * 60 * 60)) / (1000 * 60));
-
-                if (isLightOn) {
-                    lightInfo = `An (noch ${hrs}h ${mins}m)<br><span style="font-size:10px; opacity:0.7">${fmtSchedule}</span>`;
-                } else {
-                    lightInfo = `Aus (Sollte AN sein!)<br><span style="font-size:10px; opacity:0.7">${fmtSchedule}</span>`;
-                }
-            } else {
-                let nextStart = startTime + 24 * 3600 * 1000;
-                if (nowTime > endTime) {
-                    nextStart = startTime + 24 * 3600 * 1000;
-                }
-                const untilStart = nextStart - nowTime;
-                const hrs = Math.floor(untilStart / (1000 * 60 * 60));
-                const mins = Math.floor((untilStart % (1000 * 60 * 60)) / (1000 * 60));
-
-                if (isLightOn) {
-                    lightInfo = `An (Sollte AUS sein!)<br><span style="font-size:10px; opacity:0.7">${fmtSchedule}</span>`;
-                } else {
-                    lightInfo = `Aus (Start in ${hrs}h ${mins}m)<br><span style="font-size:10px; opacity:0.7">${fmtSchedule}</span>`;
-                }
-            }
-
-
-
-            // Image Logic with Cache Busting (Persisted)
-            const imgVer = device.options.image_version || 0;
-            let imgUrl = `/local/local_grow_box_images/${device.id}.jpg?v=${imgVer}`;
-            let isLive = false;
-            let camStateObj = null;
-            if (device.options.camera_entity) {
-                camStateObj = this._hass.states[device.options.camera_entity];
-                if (camStateObj) {
-                    imgUrl = camStateObj.attributes.entity_picture;
-                    isLive = true;
-                }
-            }
-
-            // Calculations for Bars
-            const getVal = (entity) => {
-                if (!entity) return null;
-                const s = this._hass.states[entity];
-                return s && !isNaN(s.state) ? Math.round(parseFloat(s.state) * 100) / 100 : null;
-            }
-
-            const temp = getVal(device.options.temp_sensor);
-            const hum = getVal(device.options.humidity_sensor);
-            const vpd = getVal(device.entities.vpd);
-
-            const targetHum = parseFloat(device.options.target_humidity || 65);
-            const targetTemp = parseFloat(device.options.target_temp || 24);
-            const humHysteresis = parseFloat(device.options.humidity_hysteresis || 2);
-            const tempHysteresis = parseFloat(device.options.temp_hysteresis || 1);
-            
-            // Symmetric Target Zones (+/- Hysteresis)
-            const humTarget = { min: targetHum - humHysteresis, max: targetHum + humHysteresis };
-            const tempTarget = { min: targetTemp - tempHysteresis, max: targetTemp + tempHysteresis };
-
-            let vpdTarget = null;
-            if (currentPhase === 'seedling') vpdTarget = { min: 0.4, max: 0.8 };
-            else if (currentPhase === 'vegetative') vpdTarget = { min: 0.8, max: 1.2 };
-            else if (currentPhase === 'flowering') vpdTarget = { min: 1.2, max: 1.6 };
-            else if (currentPhase === 'drying') vpdTarget = { min: 0.8, max: 1.0 };
-            else if (currentPhase === 'curing') vpdTarget = { min: 0.5, max: 0.7 };
-
-            // Phase Options HTML
-            const phaseOptions = PHASES.map(p =>
-                `<option value="${p.id}" ${currentPhase === p.id ? 'selected' : ''}>${p.label}</option>`
-            ).join('');
-
-            card.innerHTML = `
-                <div class="card-image">
-                    <img src="${imgUrl}" onerror="this.src='https://upload.wikimedia.org/wikipedia/commons/1/14/No_Image_Available.jpg'">
-                    ${isLive ? '<div class="live-badge">LIVE</div>' : ''}
-                    <div style="position:absolute; bottom:0; left:0; right:0; padding:12px; background:linear-gradient(to top, rgba(0,0,0,0.9), transparent); display:flex; justify-content:space-between; align-items:end;">
-                        <div>
-                             <select class="phase-select" id="phase-select-${device.id}" style="
-                                background: rgba(0,0,0,0.6); 
-                                border: 1px solid rgba(255,255,255,0.2); 
-                                color: white; 
-                                padding: 4px 8px; 
-                                border-radius: 4px; 
-                                font-size: 14px;
-                                cursor: pointer;
-                                outline: none;
-                             ">
-                                ${phaseOptions}
-                            </select>
-                            <div style="color:white; font-weight:500; font-size:13px; margin-top:6px; margin-left:2px; text-shadow: 0 1px 2px rgba(0,0,0,0.8);">Tag ${daysInPhase}</div>
-                        </div>
-                    </div>
-                </div>
-                
-                <div class="card-header">
-                    <div class="card-title">${device.name}</div>
-                    <div class="status-badge ${masterState && masterState.state === 'on' ? 'online' : 'offline'}">
-                        ${masterState && masterState.state === 'on' ? '● Online' : '○ Offline'}
-                    </div>
-                </div>
-                
-                <div class="card-body">
-                    ${this._renderStatBar('Temperatur', temp, '°C', 10, 45, '#ef4444', '🌡️', tempTarget)}
-                    ${this._renderStatBar('Luftfeuchte', hum, '%', 20, 90, '#3b82f6', '💧', humTarget)}
-                    ${this._renderStatBar('VPD', vpd, 'kPa', 0, 3.0, '#10b981', '🍃', vpdTarget)}
-                    
-                    ${device.options.moisture_sensor ? this._renderStatBar('Bodenfeuchte', getVal(device.options.moisture_sensor), '%', 0, 100, '#8b5cf6', '🪴') : ''}
-                    
-                    <div style="margin-top:16px; border-top:1px solid rgba(255,255,255,0.05); padding-top:16px; display:grid; grid-template-columns: 1fr 1fr; gap:12px;">
-                        
-                        <div class="info-box">
-                            <div class="info-icon">${lightStatus === 'on' ? '💡' : '🌑'}</div>
-                            <div class="info-content">
-                                <div class="info-label">Licht</div>
-                                <div class="info-val" style="font-size:12px;">${lightInfo}</div>
-                            </div>
-                        </div>
-
-                         <div class="info-box">
-                            <div class="info-icon">${this._hass.states[device.options.fan_entity]?.state === 'on' ? '🌪️' : '💨'}</div>
-                            <div class="info-content">
-                                <div class="info-label">Abluft</div>
-                                <div class="info-val">${this._hass.states[device.options.fan_entity]?.state === 'on' ? 'An' : 'Aus'}</div>
-                            </div>
-                        </div>
-                        
-                        ${device.options.pump_entity ? `
-                        <div class="info-box">
-                            <div class="info-icon">${pumpState?.state === 'on' ? '💧' : '⛔'}</div>
-                            <div class="info-content">
-                                <div class="info-label">Pumpe</div>
-                                <div class="info-val">${pumpState?.state === 'on' ? 'Läuft' : 'Aus'}</div>
-                            </div>
-                        </div>
-                        ` : ''}
-
-                        ${device.options.humidifier_entity ? `
-                         <div class="info-box">
-                            <div class="info-icon">${this._hass.states[device.options.humidifier_entity]?.state === 'on' ? '💦' : '🌫️'}</div>
-                            <div class="info-content">
-                                <div class="info-label">Befeuchter</div>
-                                <div class="info-val">${this._hass.states[device.options.humidifier_entity]?.state === 'on' ? 'An' : 'Aus'}</div>
-                            </div>
-                        </div>
-                        ` : `
-                        <div class="info-box" style="opacity:0.4;">
-                            <div class="info-icon">🌫️</div>
-                            <div class="info-content">
-                                <div class="info-label">Befeuchter</div>
-                                <div class="info-val">Nicht konfiguriert</div>
-                            </div>
-                        </div>
-                        `}
-                    </div>
-                </div>
-                
-                <div class="controls">
-                    <button class="btn ${masterState?.state === 'on' ? 'active' : ''}" id="btn-master-${device.id}">
-                        ⚡ Master
-                    </button>
-                    ${device.options.pump_entity ? `
-                    <button class="btn ${pumpState?.state === 'on' ? 'active' : ''}" id="btn-pump-${device.id}">
-                        💧 Pumpe
-                    </button>
-                    ` : ''}
-                    ${device.options.humidifier_entity ? `
-                    <button class="btn ${this._hass.states[device.options.humidifier_entity]?.state === 'on' ? 'active' : ''}" id="btn-humid-${device.id}">
-                        💦 Befeuchter
-                    </button>
-                    ` : ''}
-                    <button class="btn" id="btn-upload-${device.id}">
-                        📷 Bild
-                    </button>
-                </div>
-            `;
-
-            // Events
-            const q = s => card.querySelector(s);
-            q(`#btn-master-${device.id}`).onclick = () => this._toggle(device.entities.master);
-            const btnPump = q(`#btn-pump-${device.id}`);
-            if (btnPump) btnPump.onclick = () => this._toggle(device.entities.pump || device.options.pump_entity);
-            const btnHumid = q(`#btn-humid-${device.id}`);
-            if (btnHumid) btnHumid.onclick = () => this._toggle(device.entities.humidifier || device.options.humidifier_entity);
-            q(`#btn-upload-${device.id}`).onclick = () => this._triggerUpload(device.id);
-            q('.card-image').style.cursor = 'pointer';
-            q('.card-image').onclick = (e) => {
-                // Prevent click if clicking the select or badge
-                if (e.target.tagName === 'SELECT' || e.target.closest('.phase-select')) return;
-                this._openCameraModal(imgUrl, device.name, camStateObj);
-            };
-
-            // Inject Livestream into Card if Live
-            if (isLive && camStateObj) {
-                const imgContainer = q('.card-image');
-                const oldImg = q('img');
-                if (oldImg) oldImg.style.display = 'none';
-
-                const stream = document.createElement('ha-camera-stream');
-                stream.hass = this._hass;
-                stream.stateObj = camStateObj;
-                stream.muted = true;
-                stream.allowExoplayer = true;
-                stream.style.cssText = "width:100%; height:100%; object-fit:cover; display:block; pointer-events:none; position:absolute; top:0; left:0; opacity:0.8;";
-
-                imgContainer.insertBefore(stream, imgContainer.firstChild);
-            }
-
-            // Phase Change Event
-            const phaseSelect = q(`#phase-select-${device.id}`);
-            phaseSelect.onchange = async (e) => {
-                const newPhase = e.target.value;
-                if (confirm(`Phase wirklich auf "${PHASES.find(p => p.id === newPhase).label}" ändern?`)) {
-                    try {
-                        await this._hass.callWS({
-                            type: 'local_grow_box/update_config',
-                            entry_id: device.entryId,
-                            config: { current_phase: newPhase }
-                        });
-                        // Optimistic update or wait for reload
-                        // setTimeout(() => this._fetchDevices(), 500); // Reload data
-                        // actually config update should trigger reload via HA events if wired? 
-                        // But _fetchDevices is manual. Let's trigger it.
-                        this._fetchDevices();
-                    } catch (err) {
-                        alert("Fehler beim Ändern der Phase: " + err);
-                    }
-                } else {
-                    e.target.value = currentPhase; // Revert
-                }
-            };
-
-            grid.appendChild(card);
+            const card = new GrowBoxCard(this, device);
+            card.update(true);
+            this._cards.push(card);
+            grid.appendChild(card.el);
         });
-
         container.appendChild(grid);
     }
 
@@ -834,36 +1180,6 @@ class LocalGrowBoxPanel extends HTMLElement {
         }
     }
 
-    _renderStatBar(label, val, unit, min, max, color, icon, targetRange) {
-        if (val === null) return `<div class="stat-row"><span class="stat-label">${label}</span><span class="stat-value">--</span></div>`;
-
-        const pct = Math.min(100, Math.max(0, ((val - min) / (max - min)) * 100));
-
-        // Target Area Rendering
-        let targetArea = '';
-        if (targetRange) {
-            const tMinPct = Math.min(100, Math.max(0, ((targetRange.min - min) / (max - min)) * 100));
-            const tMaxPct = Math.min(100, Math.max(0, ((targetRange.max - min) / (max - min)) * 100));
-            const width = tMaxPct - tMinPct;
-
-            targetArea = `<div style="position:absolute; left:${tMinPct}%; width:${width}%; height:100%; background:rgba(255,255,255,0.3); z-index:1;"></div>`;
-            label += ` <span style="font-size:10px; opacity:0.7;">(Ziel: ${targetRange.min}-${targetRange.max})</span>`;
-        }
-
-        return `
-            <div style="margin-bottom:12px;">
-                <div class="stat-row" style="margin-bottom:4px;">
-                    <span class="stat-label">${label}</span>
-                    <span class="stat-value">${val} ${unit}</span>
-                </div>
-                <div class="bar-bg" style="position:relative;">
-                    ${targetArea}
-                    <div class="bar-fill" style="width:${pct}%; background-color:${color}; position:relative; z-index:2; opacity:0.8;"></div>
-                </div>
-            </div>
-        `;
-    }
-
     _renderSettings(container) {
         this._devices.forEach(device => {
             const section = document.createElement('div');
@@ -1007,6 +1323,40 @@ class LocalGrowBoxPanel extends HTMLElement {
                 parent.appendChild(group);
             };
 
+            // DOM-based Helper for a fixed choice
+            const appendChoice = (parent, label, configKey, choices, icon = '') => {
+                const group = document.createElement('div');
+                group.className = 'form-group';
+                group.style.marginBottom = '12px';
+
+                const lbl = document.createElement('label');
+                lbl.className = 'form-label';
+                lbl.style.display = 'flex';
+                lbl.style.alignItems = 'center';
+                lbl.style.gap = '8px';
+                lbl.innerHTML = `${icon ? `<span style="font-size:16px;">${icon}</span>` : ''} ${label}`;
+                group.appendChild(lbl);
+
+                const select = document.createElement('select');
+                select.style.marginTop = '4px';
+                const draftVal = this._draft[device.entryId] && this._draft[device.entryId][configKey];
+                const value = (draftVal !== undefined) ? draftVal : (device.options[configKey] || choices[0].value);
+                choices.forEach(c => {
+                    const opt = document.createElement('option');
+                    opt.value = c.value;
+                    opt.innerText = c.label;
+                    opt.selected = c.value === value;
+                    select.appendChild(opt);
+                });
+                select.addEventListener('change', (e) => {
+                    if (!this._draft[device.entryId]) this._draft[device.entryId] = {};
+                    this._draft[device.entryId][configKey] = e.target.value;
+                });
+
+                group.appendChild(select);
+                parent.appendChild(group);
+            };
+
             // NEW: Card Helper
             const createCard = (title, icon) => {
                 const card = document.createElement('div');
@@ -1045,6 +1395,12 @@ class LocalGrowBoxPanel extends HTMLElement {
             appendInput(cardKlimaValues.body, 'Feuchte Hysterese (Befeuchter %)', 'humidity_hysteresis', 'number', '🔄');
             appendInput(cardKlimaValues.body, 'Abluft-Limit (Max %)', 'max_humidity', 'number', '🌪️');
             appendInput(cardKlimaValues.body, 'Abluft Hysterese (%)', 'fan_hysteresis', 'number', '💨');
+            appendChoice(cardKlimaValues.body, 'Regelung', 'climate_mode', [
+                { value: 'humidity', label: 'Luftfeuchte (Sollwerte)' },
+                { value: 'vpd', label: 'VPD (Band der Phase)' },
+            ], '🍃');
+            appendInput(cardKlimaValues.body, 'Blatt-Temperatur Offset (°C)', 'leaf_temp_offset', 'number', '🌿');
+            appendInput(cardKlimaValues.body, 'VPD Hysterese (kPa)', 'vpd_hysteresis', 'number', '🔄');
             settingsGrid.appendChild(cardKlimaValues.card);
 
             // Card 3: Bewässerung & Licht
@@ -1054,16 +1410,35 @@ class LocalGrowBoxPanel extends HTMLElement {
             appendSelector(cardWaterLight.body, 'Wasserpumpe', 'pump_entity', ['switch', 'input_boolean']);
             appendInput(cardWaterLight.body, 'Ziel Bodenfeuchte (%)', 'target_moisture', 'number', '🌱');
             appendInput(cardWaterLight.body, 'Pumpen Dauer (Sek)', 'pump_duration', 'number', '⏲️');
+            appendChoice(cardWaterLight.body, 'Bewässerung', 'watering_mode', [
+                { value: 'threshold', label: 'Unter Ziel-Bodenfeuchte (feste Dauer)' },
+                { value: 'predictive', label: 'Vorausschauend (gelernte Trocknung und Pumpleistung)' },
+            ], '📈');
             settingsGrid.appendChild(cardWaterLight.card);
 
             // Card 4: Zeitplan & Erweitert
             const cardAdvanced = createCard('Zeitplan & Erweitert', '📅');
             appendInput(cardAdvanced.body, 'Licht Start (Stunde 0-23)', 'light_start_hour', 'number', '☀️');
+            appendInput(cardAdvanced.body, 'Sonnenauf-/untergang (Min, 0 = aus)', 'light_ramp', 'number', '🌅');
             appendInput(cardAdvanced.body, 'Phasen Startdatum', 'phase_start_date', 'date', '🏁');
             appendSelector(cardAdvanced.body, 'Kamera', 'camera_entity', ['camera']);
+            appendChoice(cardAdvanced.body, 'Bei Sensorproblem', 'anomaly_action', [
+                { value: 'notify', label: 'Nur melden' },
+                { value: 'hold', label: 'Geräte sicher halten (Abluft an, Befeuchter/Pumpe aus)' },
+            ], '🛡️');
             settingsGrid.appendChild(cardAdvanced.card);
 
+            // Card 5: Energie
+            const cardEnergy = createCard('Energie (Leistung in Watt)', '⚡');
+            appendInput(cardEnergy.body, 'Licht (W)', 'light_watts', 'number', '💡');
+            appendInput(cardEnergy.body, 'Abluft (W)', 'fan_watts', 'number', '🌪️');
+            appendInput(cardEnergy.body, 'Pumpe (W)', 'pump_watts', 'number', '💧');
+            appendInput(cardEnergy.body, 'Luftbefeuchter (W)', 'humidifier_watts', 'number', '💨');
+            this._appendPowerBudget(cardEnergy.body, device);
+            settingsGrid.appendChild(cardEnergy.card);
+
             section.appendChild(settingsGrid);
+            this._appendWaterZones(section, device);
 
             // Save Button
             const btnDiv = document.createElement('div');
@@ -1081,64 +1456,254 @@ class LocalGrowBoxPanel extends HTMLElement {
         });
     }
 
+    _appendPowerBudget(parent, device) {
+        const inputStyle = "text-align:center; background:rgba(0,0,0,0.3); border:1px solid rgba(255,255,255,0.1); padding:6px; border-radius:6px;";
+        const block = document.createElement('div');
+        block.style.cssText = "margin-top:12px; padding-top:12px; border-top:1px solid rgba(255,255,255,0.05); display:flex; flex-wrap:wrap; align-items:flex-end; gap:8px; font-size:12px; color:var(--text-secondary);";
+        block.innerHTML = `
+            <label style="display:flex; flex-direction:column; gap:4px;">
+                Stromkreis Limit (W, alle Boxen, 0 = aus)
+                <input type="number" min="0" id="circuit-limit-${device.id}" value="${this._power?.circuit_limit ?? 0}" style="${inputStyle} width:96px;">
+            </label>
+            <label style="display:flex; flex-direction:column; gap:4px;">
+                Anlaufstrom-Faktor
+                <input type="number" min="1" step="0.1" id="inrush-${device.id}" value="${this._power?.inrush_factor ?? 2}" style="${inputStyle} width:64px;">
+            </label>
+            <button class="btn" id="save-power-${device.id}" style="width:auto; padding:8px 16px;">Übernehmen</button>
+        `;
+        block.querySelector(`#save-power-${device.id}`).onclick = async () => {
+            try {
+                this._power = await this._hass.callWS({
+                    type: 'local_grow_box/set_power',
+                    circuit_limit: parseFloat(block.querySelector(`#circuit-limit-${device.id}`).value) || 0,
+                    inrush_factor: parseFloat(block.querySelector(`#inrush-${device.id}`).value) || 2,
+                });
+            } catch (e) {
+                alert("Fehler beim Speichern: " + e.message);
+            }
+        };
+        parent.appendChild(block);
+    }
+
+    _appendWaterZones(section, device) {
+        const FIELDS = [
+            { key: 'name', label: 'Name', type: 'text', width: 120 },
+            { key: 'pump_entity', label: 'Pumpe', type: 'text', width: 200 },
+            { key: 'moisture_sensor', label: 'Bodenfeuchte Sensor', type: 'text', width: 200 },
+            { key: 'target_moisture', label: 'Ziel (%)', type: 'number', width: 64 },
+            { key: 'pump_duration', label: 'Dauer (Sek)', type: 'number', width: 64 },
+            { key: 'soak', label: 'Ruhezeit (Sek)', type: 'number', width: 72 },
+        ];
+        const inputStyle = "text-align:center; background:rgba(0,0,0,0.3); border:1px solid rgba(255,255,255,0.1); padding:6px; border-radius:6px;";
+        const renderZoneRow = (z) => `
+            <div class="zone-row" data-zone="${z.id}" style="display:flex; flex-wrap:wrap; align-items:flex-end; gap:12px; padding:8px 0; border-bottom:1px solid rgba(255,255,255,0.05);">
+                <div style="font-weight:500; min-width:80px;">${z.id}</div>
+                ${FIELDS.map(f => `
+                    <label style="display:flex; flex-direction:column; font-size:11px; color:var(--text-secondary); gap:4px;">
+                        ${f.label}
+                        <input type="${f.type}" data-field="${f.key}" value="${z[f.key] ?? ''}" style="${inputStyle} width:${f.width}px;">
+                    </label>
+                `).join('')}
+                <button class="btn" data-action="remove" style="width:auto; padding:6px 16px;">Entfernen</button>
+            </div>
+        `;
+
+        const block = document.createElement('div');
+        block.style.cssText = "max-width:1100px;";
+        block.innerHTML = `
+            <div class="section-title" style="margin-top:32px;">Bewässerungszonen</div>
+            <p style="color:var(--text-secondary); margin-bottom:12px; font-size:13px; line-height:1.5;">
+                Weitere Pumpen mit eigenem Bodenfeuchte Sensor. Leere Werte übernehmen die Phase.
+                <br>Alle Boxen teilen sich eine Warteschlange: die trockenste Zone gießt zuerst.
+            </p>
+            <div class="zone-rows">${(device.waterZones || []).map(renderZoneRow).join('')}</div>
+            <div style="margin-top:12px; display:flex; justify-content:flex-end; gap:8px;">
+                <input type="text" id="new-zone-${device.id}" placeholder="neue_zone" style="${inputStyle} width:160px;">
+                <button class="btn" id="add-zone-${device.id}" style="width:auto; padding:8px 24px;">Zone hinzufügen</button>
+                <button class="btn active" id="save-zones-${device.id}" style="width:auto; padding:8px 24px;">Zonen speichern</button>
+            </div>
+            <div style="margin-top:12px; display:flex; justify-content:flex-end; align-items:center; gap:8px; font-size:13px; color:var(--text-secondary);">
+                Max. gleichzeitige Pumpen (alle Boxen)
+                <input type="number" min="1" id="max-pumps-${device.id}" value="${this._irrigation?.max_concurrent ?? 1}" style="${inputStyle} width:64px;">
+                <button class="btn" id="save-pumps-${device.id}" style="width:auto; padding:8px 24px;">Übernehmen</button>
+            </div>
+        `;
+
+        const rows = block.querySelector('.zone-rows');
+        const bindRemove = (row) => {
+            row.querySelector('[data-action="remove"]').onclick = () => row.remove();
+        };
+        rows.querySelectorAll('.zone-row').forEach(bindRemove);
+        block.querySelector(`#add-zone-${device.id}`).onclick = () => {
+            const input = block.querySelector(`#new-zone-${device.id}`);
+            const id = input.value.trim().toLowerCase().replace(/[^a-z0-9_]/g, '_');
+            if (!id || id === 'main' || rows.querySelector(`[data-zone="${id}"]`)) return;
+            rows.insertAdjacentHTML('beforeend', renderZoneRow({ id, name: id }));
+            bindRemove(rows.lastElementChild);
+            input.value = '';
+        };
+        block.querySelector(`#save-zones-${device.id}`).onclick = async () => {
+            const zones = [...rows.querySelectorAll('.zone-row')].map(row => {
+                const zone = { id: row.dataset.zone };
+                row.querySelectorAll('input[data-field]').forEach(el => {
+                    zone[el.dataset.field] = el.value === '' ? null : el.value;
+                });
+                return zone;
+            });
+            try {
+                await this._hass.callWS({ type: 'local_grow_box/set_water_zones', entry_id: device.entryId, zones });
+                setTimeout(() => this._fetchDevices(), 1000);
+            } catch (e) {
+                alert("Fehler beim Speichern: " + e.message);
+            }
+        };
+        block.querySelector(`#save-pumps-${device.id}`).onclick = async () => {
+            try {
+                this._irrigation = await this._hass.callWS({
+                    type: 'local_grow_box/set_irrigation',
+                    max_concurrent: parseInt(block.querySelector(`#max-pumps-${device.id}`).value, 10),
+                });
+            } catch (e) {
+                alert("Fehler beim Speichern: " + e.message);
+            }
+        };
+        section.appendChild(block);
+    }
+
     _renderPhases(container) {
+        const FIELDS = [
+            { key: 'light_hours', label: 'Licht', unit: 'Std.' },
+            { key: 'light_start_hour', label: 'Start', unit: 'Uhr' },
+            { key: 'target_temp', label: 'Temp', unit: '°C' },
+            { key: 'target_humidity', label: 'Feuchte', unit: '%' },
+            { key: 'max_humidity', label: 'Max. Feuchte', unit: '%' },
+            { key: 'target_moisture', label: 'Boden', unit: '%' },
+            { key: 'pump_duration', label: 'Pumpe', unit: 'Sek' },
+            { key: 'vpd_min', label: 'VPD min', unit: 'kPa' },
+            { key: 'vpd_max', label: 'VPD max', unit: 'kPa' },
+        ];
+        const BUILTIN = ['seedling', 'vegetative', 'flowering', 'drying', 'curing'];
+        const inputStyle = "width:64px; text-align:center; font-weight:bold; background:rgba(0,0,0,0.3); border:1px solid rgba(255,255,255,0.1); padding:6px; border-radius:6px;";
+
         this._devices.forEach(device => {
             const section = document.createElement('div');
             section.className = 'settings-section';
 
-            const renderPhaseRow = (label, sub, icon, configKey, val) => `
-                <div style="
-                    display: flex; 
-                    align-items: center; 
-                    justify-content: space-between; 
-                    background: rgba(255,255,255,0.03); 
+            const renderPhaseRow = (p) => `
+                <div class="phase-row" data-phase="${p.id}" style="
+                    background: rgba(255,255,255,0.03);
                     border: 1px solid rgba(255,255,255,0.05);
-                    border-radius: 8px; 
-                    padding: 12px 16px; 
+                    border-radius: 8px;
+                    padding: 12px 16px;
                     margin-bottom: 8px;
                 ">
-                    <div style="display:flex; align-items:center; gap:16px;">
-                        <span style="font-size:24px;">${icon}</span>
-                        <div>
-                            <div style="font-weight:500; font-size:14px;">${label}</div>
-                            <div style="font-size:11px; color:var(--text-secondary);">${sub}</div>
+                    <div style="display:flex; align-items:center; justify-content:space-between; margin-bottom:8px;">
+                        <input type="text" data-field="name" value="${p.name}" style="font-weight:500; font-size:14px; background:transparent; border:none; color:inherit; width:200px;">
+                        <div style="display:flex; gap:8px;">
+                            <button class="btn active" data-action="save" style="width:auto; padding:6px 16px;">Speichern</button>
+                            <button class="btn" data-action="delete" style="width:auto; padding:6px 16px;">${BUILTIN.includes(p.id) ? 'Zurücksetzen' : 'Löschen'}</button>
                         </div>
                     </div>
-                    <div style="display:flex; align-items:center; gap:8px;">
-                        <input type="number" value="${val}" data-key="${configKey}" data-entry="${device.entryId}" 
-                            style="width:70px; text-align:center; font-weight:bold; background:rgba(0,0,0,0.3); border:1px solid rgba(255,255,255,0.1); padding:8px; border-radius:6px;">
-                        <span style="font-size:12px; color:var(--text-secondary); width:50px;">Std.</span>
+                    <div style="display:flex; flex-wrap:wrap; gap:12px;">
+                        ${FIELDS.map(f => `
+                            <label style="display:flex; flex-direction:column; font-size:11px; color:var(--text-secondary); gap:4px;">
+                                ${f.label} (${f.unit})
+                                <input type="number" data-field="${f.key}" value="${p[f.key] ?? ''}" style="${inputStyle}">
+                            </label>
+                        `).join('')}
                     </div>
                 </div>
             `;
 
+            const phases = device.phases || [];
+            const planText = (device.growPlan?.plan || []).map(s => s.days ? `${s.phase}:${s.days}` : s.phase).join(', ');
             section.innerHTML = `
                 <div class="section-title">${device.name} - Phasen Management</div>
                 <p style="color:var(--text-secondary); margin-bottom:24px; font-size:13px; line-height:1.5;">
-                    Definiere hier die tägliche Beleuchtungsdauer für jede Wachstumsphase. 
+                    Definiere hier Licht und Sollwerte für jede Wachstumsphase.
                     <br>Das System schaltet basierend auf der aktuellen Phase automatisch um.
                 </p>
 
-                <div style="display:flex; flex-direction:column; gap:8px; max-width:600px;">
-                    ${renderPhaseRow('Keimling', 'Hohe Luftfeuchte (65-80%), 20-25°C, sanftes Licht', '🌱', 'phase_seedling_hours', device.options.phase_seedling_hours !== undefined ? device.options.phase_seedling_hours : 18)}
-                    ${renderPhaseRow('Wachstum', 'Viel Stickstoff, 18h Licht, RLF 50-70%', '🌿', 'phase_vegetative_hours', device.options.phase_vegetative_hours !== undefined ? device.options.phase_vegetative_hours : 18)}
-                    ${renderPhaseRow('Blüte', '12h Licht zwingend, RLF <50% (Schimmelgefahr!), P-K Dünger', '🌸', 'phase_flowering_hours', device.options.phase_flowering_hours !== undefined ? device.options.phase_flowering_hours : 12)}
-                    ${renderPhaseRow('Trocknen', 'Dunkel & Kühl (18-20°C), 50-60% RLF, 10-14 Tage', '🍂', 'phase_drying_hours', device.options.phase_drying_hours !== undefined ? device.options.phase_drying_hours : 0)}
-                    ${renderPhaseRow('Veredelung', 'Im Glas/Bag, RLF stabil bei 58-62% halten', '🏺', 'phase_curing_hours', device.options.phase_curing_hours !== undefined ? device.options.phase_curing_hours : 0)}
+                <div style="display:flex; flex-direction:column; gap:8px; max-width:900px;">
+                    ${phases.map(renderPhaseRow).join('')}
                 </div>
-                
-                 <div style="margin-top:24px; max-width:600px; display:flex; justify-content:flex-end;">
-                    <button class="btn active" id="save-p-${device.id}" style="width:auto; display:inline-flex; padding:12px 32px;">
-                        Speichern
+
+                <div style="margin-top:24px; max-width:900px; display:flex; justify-content:flex-end; gap:8px;">
+                    <input type="text" id="new-phase-${device.id}" placeholder="neue_phase" style="${inputStyle} width:160px;">
+                    <button class="btn active" id="add-p-${device.id}" style="width:auto; display:inline-flex; padding:12px 32px;">
+                        Phase hinzufügen
                     </button>
                 </div>
+
+                <div class="section-title" style="margin-top:32px;">Grow-Plan (automatischer Phasenwechsel)</div>
+                <p style="color:var(--text-secondary); margin-bottom:12px; font-size:13px; line-height:1.5;">
+                    Reihenfolge als <code>phase:tage</code>, z.B. <code>seedling:14, vegetative:28, flowering:63, drying</code>.
+                    <br>Leer lassen, um den automatischen Wechsel abzuschalten.
+                </p>
+                <div style="max-width:900px; display:flex; gap:8px;">
+                    <input type="text" id="grow-plan-${device.id}" value="${planText}" style="flex:1; padding:8px; background:rgba(0,0,0,0.3); border:1px solid rgba(255,255,255,0.1); border-radius:6px;">
+                    <button class="btn active" id="save-plan-${device.id}" style="width:auto; padding:8px 24px;">Speichern</button>
+                </div>
+                <div style="margin-top:8px; font-size:12px; color:var(--text-secondary);">
+                    ${(device.growPlan?.transitions || []).map(t => `${new Date(t.at).toLocaleString('de-DE')}: ${t.from} → ${t.to}`).join('<br>')}
+                </div>
             `;
 
-            section.querySelector(`#save-p-${device.id}`).onclick = () => this._saveConfig_V2(section, device.entryId);
+            section.querySelector(`#save-plan-${device.id}`).onclick = async () => {
+                const text = section.querySelector(`#grow-plan-${device.id}`).value;
+                const plan = text.split(',').map(s => s.trim()).filter(Boolean).map(s => {
+                    const [phase, days] = s.split(':').map(x => x.trim());
+                    return days ? { phase, days: parseFloat(days) } : { phase };
+                });
+                try {
+                    await this._hass.callWS({ type: 'local_grow_box/set_grow_plan', entry_id: device.entryId, plan });
+                    setTimeout(() => this._fetchDevices(), 1000);
+                } catch (e) {
+                    alert("Fehler beim Speichern: " + e.message);
+                }
+            };
+
+            section.querySelectorAll('.phase-row').forEach(row => {
+                const phaseId = row.dataset.phase;
+                row.querySelector('[data-action="save"]').onclick = () => {
+                    const profile = { id: phaseId };
+                    row.querySelectorAll('input[data-field]').forEach(el => {
+                        profile[el.dataset.field] = el.value === '' ? null : el.value;
+                    });
+                    this._savePhaseProfile(device.entryId, profile);
+                };
+                row.querySelector('[data-action="delete"]').onclick = async () => {
+                    if (!confirm(`Phase "${phaseId}" wirklich ${BUILTIN.includes(phaseId) ? 'zurücksetzen' : 'löschen'}?`)) return;
+                    try {
+                        await this._hass.callWS({ type: 'local_grow_box/delete_phase_profile', entry_id: device.entryId, phase_id: phaseId });
+                        setTimeout(() => this._fetchDevices(), 1000);
+                    } catch (e) {
+                        alert("Fehler: " + e.message);
+                    }
+                };
+            });
+            section.querySelector(`#add-p-${device.id}`).onclick = () => {
+                const id = section.querySelector(`#new-phase-${device.id}`).value.trim().toLowerCase().replace(/[^a-z0-9_]/g, '_');
+                if (id) this._savePhaseProfile(device.entryId, { id, name: id });
+            };
             container.appendChild(section);
         });
     }
 
+    async _savePhaseProfile(entryId, profile) {
+        try {
+            await this._hass.callWS({ type: 'local_grow_box/set_phase_profile', entry_id: entryId, profile });
+            const toast = this.shadowRoot.getElementById('save-toast');
+            toast.classList.add('visible');
+            setTimeout(() => toast.classList.remove('visible'), 3000);
+            // The box reloads with the new profiles
+            setTimeout(() => this._fetchDevices(), 1000);
+        } catch (e) {
+            console.error("Save error:", e);
+            alert("Fehler beim Speichern: " + e.message);
+        }
+    }
+
     async _saveConfig_V2(section, entryId) {
         // Start with draft values if they exist
         const updates = { ...(this._draft && this._draft[entryId] ? this._draft[entryId] : {}) };
@@ -1230,7 +1795,7 @@ class LocalGrowBoxPanel extends HTMLElement {
                         if (device) {
                             if (!device.options) device.options = {};
                             device.options.image_version = result.version;
-                            this._updateContent(); // Instant visual update
+                            this._refreshCards(true); // Instant visual update
                         }
                     }
 
@@ -1529,9 +2094,8 @@ class LocalGrowBoxPanel extends HTMLElement {
             this.historyData = { ...this.historyData, [entityId]: [] };
         } finally {
             this.fetchingHistory[entityId] = false;
-            if (this._activeTab === 'statistics') {
-                this._updateContent();
-            }
+            // Only the chart of this entity is rebuilt
+            this._refreshCards();
         }
     }
 
@@ -1542,87 +2106,6 @@ class LocalGrowBoxPanel extends HTMLElement {
         this.dispatchEvent(event);
     }
 
-    _renderChart(entityId, colorHex, label, unit) {
-        if (!this.historyData[entityId] && !this.fetchingHistory[entityId]) {
-            this.fetchingHistory[entityId] = true;
-            this.fetchHistoryData(entityId);
-            return '<div style="height: 150px; display: flex; align-items: center; justify-content: center; color: var(--text-secondary); background: rgba(0,0,0,0.2); border-radius: 8px; border: 1px solid rgba(255,255,255,0.05); margin-bottom: 15px;">Lade ' + label + '...</div>';
-        }
-
-        const data = this.historyData[entityId] || [];
-        const currentState = this._hass && this._hass.states[entityId] ? this._hass.states[entityId].state : '-';
-
-        if (data.length === 0 || data.filter(d => !isNaN(parseFloat(d.state))).length === 0) {
-            return `
-                <div class="chart-row" data-entity="${entityId}" style="margin-bottom: 20px; text-align: left; cursor: pointer;">
-                    <div style="display: flex; justify-content: space-between; align-items: flex-end; margin-bottom: 8px;">
-                        <h4 style="color: ${colorHex}; margin: 0; font-size: 1.0em; text-transform: uppercase;">${label}</h4>
-                        <span style="color: #fff; font-size: 1.1em; font-weight: bold;">${currentState} ${unit}</span>
-                    </div>
-                    <div style="height: 120px; display: flex; align-items: center; justify-content: center; color: var(--text-secondary); background: rgba(0,0,0,0.2); border-radius: 8px; border: 1px solid rgba(255,255,255,0.05);">Keine Verlaufsdaten für ${label} gefunden.</div>
-                </div>
-            `;
-        }
-
-        const validData = data.filter(d => !isNaN(parseFloat(d.state)));
-        const values = validData.map(d => parseFloat(d.state));
-        const times = validData.map(d => new Date(d.last_changed).getTime());
-
-        const minVal = Math.min(...values);
-        let maxVal = Math.max(...values);
-        if (minVal === maxVal) maxVal = minVal + 1;
-        const minTime = Math.min(...times);
-        let maxTime = Math.max(...times);
-        if (minTime === maxTime) maxTime = minTime + 1000;
-
-        const rangeY = maxVal - minVal;
-        const rangeX = maxTime - minTime;
-        const width = 600;
-        const height = 120;
-        const padding = 20;
-
-        const points = validData.map(d => {
-            const x = ((new Date(d.last_changed).getTime() - minTime) / rangeX) * width;
-            const y = height - (((parseFloat(d.state) - minVal) / rangeY) * height);
-            return `${x},${y}`;
-        });
-
-        const pathData = `M ${points[0]} L ${points.join(' L ')}`;
-        const fillPathData = `M ${points[0].split(',')[0]},${height} L ${points.join(' L ')} L ${points[points.length - 1].split(',')[0]},${height} Z`;
-        const safeId = entityId.replace(/\./g, '_');
-
-        const lastState = validData[validData.length - 1].state;
-
-        return `
-            <div class="chart-row" data-entity="${entityId}" style="margin-bottom: 20px; text-align: left; cursor: pointer;">
-                <div style="display: flex; justify-content: space-between; align-items: flex-end; margin-bottom: 8px;">
-                    <h4 style="color: ${colorHex}; margin: 0; font-size: 1.0em; text-transform: uppercase;">${label}</h4>
-                    <span style="color: #fff; font-size: 1.1em; font-weight: bold;">
-                        ${lastState} ${unit}
-                    </span>
-                </div>
-                <div style="position: relative; height: ${height + padding * 2}px; border-radius: 8px; background: rgba(0,0,0,0.2); border: 1px solid rgba(255,255,255,0.05); overflow: hidden;">
-                    <svg viewBox="0 -${padding} ${width} ${height + padding * 2}" preserveAspectRatio="none" style="width: 100%; height: 100%; display: block;">
-                        <defs>
-                            <linearGradient id="grad_${safeId}" x1="0%" y1="0%" x2="0%" y2="100%">
-                                <stop offset="0%" style="stop-color:${colorHex};stop-opacity:0.4" />
-                                <stop offset="100%" style="stop-color:${colorHex};stop-opacity:0.0" />
-                            </linearGradient>
-                        </defs>
-                        <path d="${fillPathData}" fill="url(#grad_${safeId})" />
-                        <path d="${pathData}" fill="none" stroke="${colorHex}" stroke-width="2" vector-effect="non-scaling-stroke" stroke-linejoin="round" stroke-linecap="round"/>
-                    </svg>
-                    <div style="position: absolute; top: 10px; left: 10px; color: rgba(255,255,255,0.8); font-size: 0.8em; font-weight: bold;">
-                        MAX: ${maxVal.toFixed(2)}
-                    </div>
-                    <div style="position: absolute; bottom: 10px; left: 10px; color: rgba(255,255,255,0.4); font-size: 0.8em;">
-                        MIN: ${minVal.toFixed(2)}
-                    </div>
-                </div>
-            </div >
-            `;
-    }
-
     _renderStatistics(container) {
         if (!this._devices || this._devices.length === 0) {
             container.innerHTML = '<div style="text-align:center; padding:40px; color:var(--text-secondary);">Keine Grow Box gefunden. Bitte Integration hinzufügen.</div>';
@@ -1641,47 +2124,11 @@ class LocalGrowBoxPanel extends HTMLElement {
         const grid = statsDiv.querySelector('#stats-grid');
 
         this._devices.forEach(device => {
-            const tempSensor = device.options.temp_sensor;
-            const humSensor = device.options.humidity_sensor;
-            const vpdSensor = device.entities.vpd;
-            const moistSensor = device.options.moisture_sensor;
-
-            if (!tempSensor && !humSensor && !vpdSensor && !moistSensor) {
-                return;
-            }
-
-            const getUnit = (entityId, deflt) => {
-                if (!entityId || !this._hass || !this._hass.states[entityId]) return deflt;
-                return this._hass.states[entityId].attributes.unit_of_measurement || deflt;
-            };
-
-            const cardWrapper = document.createElement('div');
-            cardWrapper.className = 'card';
-            cardWrapper.style.padding = '24px';
-            cardWrapper.style.display = 'block';
-
-            cardWrapper.innerHTML = `
-                <div style="border-bottom: 1px dashed rgba(255,255,255,0.1); padding-bottom: 15px; margin-bottom: 20px;">
-                    <h3 style="margin:0; font-size:20px; color:#38bdf8;">${device.name}</h3>
-                </div>
-                <div style="display: flex; flex-direction: column; gap: 10px;">
-                    ${tempSensor ? this._renderChart(tempSensor, '#ef4444', '🌡️ Temperatur', getUnit(tempSensor, '°C')) : ''}
-                    ${humSensor ? this._renderChart(humSensor, '#3b82f6', '💧 Luftfeuchte', getUnit(humSensor, '%')) : ''}
-                    ${vpdSensor ? this._renderChart(vpdSensor, '#10b981', '🍃 VPD', getUnit(vpdSensor, 'kPa')) : ''}
-                    ${moistSensor ? this._renderChart(moistSensor, '#8b5cf6', '🪴 Bodenfeuchte', getUnit(moistSensor, '%')) : ''}
-                </div>
-                <div style="margin-top: 20px; text-align: left; padding: 15px; background: rgba(0,0,0,0.3); border-radius: 8px;">
-                    <h4 style="margin: 0; color: var(--text-secondary); font-size: 0.85em;">Klicke auf einen Graphen, um die detaillierte Ansicht von Home Assistant zu öffnen.</h4>
-                </div>
-            `;
-
-            // Attach listeners
-            const charts = cardWrapper.querySelectorAll('.chart-row');
-            charts.forEach(c => {
-                c.onclick = () => this._showMoreInfo(c.dataset.entity);
-            });
-
-            grid.appendChild(cardWrapper);
+            const card = new GrowBoxStatsCard(this, device);
+            if (card.charts.length === 0) return;
+            card.update(true);
+            this._cards.push(card);
+            grid.appendChild(card.el);
         });
 
         container.appendChild(statsDiv);
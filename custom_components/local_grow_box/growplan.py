@@ -0,0 +1,59 @@
+"""Grow plan calendar for Local Grow Box."""
+from __future__ import annotations
+
+import datetime
+from dataclasses import dataclass
+from datetime import timedelta
+
+import voluptuous as vol
+
+PLAN_STEP_SCHEMA = vol.Schema({
+    vol.Required("phase"): str,
+    vol.Optional("days"): vol.Any(None, vol.All(vol.Coerce(float), vol.Range(min=0))),
+})
+
+
+def _unique_phases(plan: list) -> list:
+    # The running phase is looked up by id, a repeated phase would restart the plan there
+    ids = [step["phase"] for step in plan]
+    if len(ids) != len(set(ids)):
+        raise vol.Invalid("Each phase may appear only once in the grow plan")
+    return plan
+
+
+# Ordered phase steps; the last step (or one without days) ends the plan
+PLAN_SCHEMA = vol.All([PLAN_STEP_SCHEMA], _unique_phases)
+
+
+@dataclass(frozen=True, slots=True)
+class Transition:
+    """A planned switch from one phase to the next."""
+
+    at: datetime.datetime
+    from_phase: str
+    to_phase: str
+
+    def as_dict(self) -> dict:
+        """Return a JSON friendly representation."""
+        return {"at": self.at.isoformat(), "from": self.from_phase, "to": self.to_phase}
+
+
+def compile_calendar(plan: list[dict], phase: str, start: datetime.datetime) -> list[Transition]:
+    """Return the transitions still ahead of a phase that started at start.
+
+    Empty if the phase is not part of the plan. Each transition starts the
+    clock of the next phase, so the instants add up along the plan.
+    """
+    ids = [step["phase"] for step in plan]
+    if phase not in ids:
+        return []
+    index = ids.index(phase)
+    transitions = []
+    at = start
+    for step, following in zip(plan[index:], plan[index + 1:]):
+        days = step.get("days")
+        if not days:
+            break
+        at = at + timedelta(days=days)
+        transitions.append(Transition(at, step["phase"], following["phase"]))
+    return transitions
@@ -0,0 +1,187 @@
+"""Integration-wide irrigation scheduler for Local Grow Box.
+
+Boxes sharing a reservoir or power circuit must not all start their pumps
+in the same second. Zones that need water request a slot here; the
+scheduler grants at most max_concurrent slots at once, driest zone first
+(largest moisture deficit, ties by request time).
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, IRRIGATION_DISPATCH_INTERVAL, IRRIGATION_GRACE, IRRIGATION_MAX_CONCURRENT
+from .profiler import profiled
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_IRRIGATION = f"{DOMAIN}_irrigation"
+STORAGE_VERSION = 1
+
+
+@dataclass(slots=True)
+class WaterRequest:
+    """A zone waiting for a pump slot."""
+
+    deficit: float
+    duration: float
+    requested: float
+    start: Callable[[], Awaitable[bool]]
+
+
+class IrrigationScheduler:
+    """Queue watering requests of all boxes and limit the pumps running at once."""
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}_irrigation")
+        self.max_concurrent = IRRIGATION_MAX_CONCURRENT
+        self._queue: dict[tuple[str, str], WaterRequest] = {}
+        # (entry_id, zone_id) -> monotonic time the slot is reclaimed if never released
+        self._running: dict[tuple[str, str], float] = {}
+        self._starting: set[tuple[str, str]] = set()
+        self.granted = 0
+        self.reclaimed = 0
+        self._unsub = None
+
+    async def async_setup(self) -> None:
+        """Load the settings and start dispatching."""
+        data = await self._store.async_load()
+        if data:
+            self.max_concurrent = data.get("max_concurrent", IRRIGATION_MAX_CONCURRENT)
+        self._unsub = async_track_time_interval(
+            self.hass, self._async_dispatch, timedelta(seconds=IRRIGATION_DISPATCH_INTERVAL)
+        )
+
+    def _data_to_save(self) -> dict:
+        return {"max_concurrent": self.max_concurrent}
+
+    @callback
+    def async_set_max_concurrent(self, value: int) -> None:
+        """Change the number of pumps allowed to run at once."""
+        self.max_concurrent = value
+        self._store.async_delay_save(self._data_to_save, 1)
+        self._async_dispatch()
+
+    @callback
+    def async_request(
+        self,
+        entry_id: str,
+        zone_id: str,
+        deficit: float,
+        duration: float,
+        start: Callable[[], Awaitable[bool]],
+    ) -> None:
+        """Ask for a pump slot. Repeated requests refresh the deficit but keep the queue position.
+
+        start() is awaited when the slot is granted and returns False if the
+        zone no longer needs it.
+        """
+        key = (entry_id, zone_id)
+        if key in self._running or key in self._starting:
+            return
+        request = self._queue.get(key)
+        if request is None:
+            self._queue[key] = WaterRequest(deficit, duration, time.monotonic(), start)
+        else:
+            request.deficit, request.duration, request.start = deficit, duration, start
+
+    @callback
+    def async_restore_running(self, entry_id: str, zone_id: str, remaining: float) -> None:
+        """Hold the slot of a pump that was already running before a restart."""
+        key = (entry_id, zone_id)
+        self._queue.pop(key, None)
+        self._running[key] = time.monotonic() + max(remaining, 0.0) + IRRIGATION_GRACE
+
+    @callback
+    def async_cancel(self, entry_id: str, zone_id: str) -> None:
+        """Withdraw a request that is still waiting."""
+        self._queue.pop((entry_id, zone_id), None)
+
+    @callback
+    def async_release(self, entry_id: str, zone_id: str) -> None:
+        """Free the slot of a zone whose pump stopped."""
+        if self._running.pop((entry_id, zone_id), None) is not None:
+            self._async_dispatch()
+
+    @callback
+    def async_remove_entry(self, entry_id: str) -> None:
+        """Drop all requests and slots of a box (unload or master switch off)."""
+        for key in [key for key in self._queue if key[0] == entry_id]:
+            del self._queue[key]
+        released = [key for key in self._running if key[0] == entry_id]
+        for key in released:
+            del self._running[key]
+        if released:
+            self._async_dispatch()
+
+    def is_waiting(self, entry_id: str, zone_id: str) -> bool:
+        """Return True if a zone is queued for a slot."""
+        return (entry_id, zone_id) in self._queue
+
+    @callback
+    @profiled
+    def _async_dispatch(self, _now=None) -> None:
+        """Grant free slots to the driest zones."""
+        clock = time.monotonic()
+        for key in [key for key, until in self._running.items() if until <= clock]:
+            # The box never released the slot (e.g. pump switched off elsewhere and box unloaded)
+            _LOGGER.warning("Irrigation slot of %s/%s reclaimed after timeout", *key)
+            del self._running[key]
+            self.reclaimed += 1
+        free = self.max_concurrent - len(self._running) - len(self._starting)
+        if free <= 0 or not self._queue:
+            return
+        order = sorted(self._queue.items(), key=lambda item: (-item[1].deficit, item[1].requested))
+        for key, request in order[:free]:
+            del self._queue[key]
+            self._starting.add(key)
+            self.hass.async_create_task(self._async_start(key, request))
+
+    async def _async_start(self, key: tuple[str, str], request: WaterRequest) -> None:
+        try:
+            started = await request.start()
+        except Exception as err:
+            _LOGGER.error("Starting irrigation of %s/%s failed: %s", *key, err)
+            started = False
+        finally:
+            self._starting.discard(key)
+        if started:
+            self._running[key] = time.monotonic() + request.duration + IRRIGATION_GRACE
+            self.granted += 1
+        else:
+            self._async_dispatch()
+
+    def as_dict(self) -> dict:
+        """Return settings, running slots and the queue in grant order (for the panel and diagnostics)."""
+        clock = time.monotonic()
+        order = sorted(self._queue.items(), key=lambda item: (-item[1].deficit, item[1].requested))
+        return {
+            "max_concurrent": self.max_concurrent,
+            "running": [
+                {"entry_id": entry_id, "zone": zone_id, "timeout_in": round(until - clock, 1)}
+                for (entry_id, zone_id), until in self._running.items()
+            ],
+            "queue": [
+                {"entry_id": entry_id, "zone": zone_id, "deficit": round(request.deficit, 2),
+                 "duration": round(request.duration, 1), "waiting": round(clock - request.requested, 1)}
+                for (entry_id, zone_id), request in order
+            ],
+            "granted": self.granted,
+            "reclaimed": self.reclaimed,
+        }
+
+    @callback
+    def async_unload(self) -> None:
+        """Stop dispatching."""
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
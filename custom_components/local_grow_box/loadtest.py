@@ -0,0 +1,262 @@
+"""Load test of the panel websocket handlers.
+
+Wall tablets keep the panel open and poll the same handlers. The loadtest
+service calls the registered handlers directly, with a fake connection
+that captures the responses, from several concurrent clients. It reports
+latency percentiles, response sizes and how long the event loop was
+blocked meanwhile, so API changes can be judged on numbers. Handlers are
+decorated with @profiled, so a profile session can run at the same time.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import logging
+import os
+import random
+import time
+from collections.abc import Callable
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .profiler import OUTPUT_DIR
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_LOADTEST = "loadtest"
+OPERATIONS = ("get_config", "get_logs", "update_config", "upload_image")
+IMAGE_DEVICE_ID = "loadtest"
+PROBE_INTERVAL = 0.005  # In seconds between event loop probes
+BLOCKED_THRESHOLD = 0.01  # In seconds, probe delays above this count as blocking
+RESPONSE_TIMEOUT = 30.0  # In seconds
+
+SERVICE_LOADTEST_SCHEMA = vol.Schema({
+    vol.Optional("entry_id"): str,
+    vol.Optional("duration", default=10): vol.All(vol.Coerce(float), vol.Range(min=1, max=600)),
+    vol.Optional("concurrency", default=4): vol.All(vol.Coerce(int), vol.Range(min=1, max=200)),
+    vol.Optional("operations", default=list(OPERATIONS)): vol.All(
+        vol.Length(min=1), [vol.In(OPERATIONS)]
+    ),
+    vol.Optional("image_kb", default=200): vol.All(vol.Coerce(int), vol.Range(min=1, max=10000)),
+})
+
+
+class LoadTestConnection:
+    """Stand-in for a websocket connection that hands responses to the waiting client."""
+
+    def __init__(self):
+        """Initialize the connection."""
+        self._waiters: dict[int, asyncio.Future] = {}
+
+    def expect(self, msg_id: int) -> asyncio.Future:
+        """Return a future resolved with (response bytes, error code) for msg_id."""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[msg_id] = future
+        return future
+
+    def _resolve(self, msg_id: int, size: int, error: str | None) -> None:
+        future = self._waiters.pop(msg_id, None)
+        if future is not None and not future.done():
+            future.set_result((size, error))
+
+    def send_result(self, msg_id: int, result=None) -> None:
+        """Serialize the result as the real connection would."""
+        self._resolve(msg_id, len(json_bytes(websocket_api.result_message(msg_id, result))), None)
+
+    def send_error(self, msg_id: int, code: str, message: str, *args, **kwargs) -> None:
+        """Record an error response."""
+        self._resolve(msg_id, len(json_bytes(websocket_api.error_message(msg_id, code, message))), code)
+
+    def async_handle_exception(self, msg: dict, err: Exception) -> None:
+        """Record an exception raised by an async handler."""
+        _LOGGER.debug("Load test handler %s failed: %s", msg.get("type"), err)
+        self.send_error(msg["id"], "unknown_error", str(err))
+
+
+def _percentile(values: list[float], share: float) -> float:
+    # Nearest rank on sorted values
+    return values[min(len(values) - 1, max(0, round(share * len(values)) - 1))]
+
+
+def _summarize(samples: dict[str, list], lags: list[float], elapsed: float, meta: dict) -> dict:
+    operations = {}
+    for op, rows in samples.items():
+        latencies = sorted(row[0] * 1000 for row in rows)
+        sizes = [row[1] for row in rows]
+        errors = sum(1 for row in rows if row[2])
+        if not rows:
+            continue
+        operations[op] = {
+            "calls": len(rows),
+            "errors": errors,
+            "per_second": round(len(rows) / elapsed, 1),
+            "p50_ms": round(_percentile(latencies, 0.5), 3),
+            "p90_ms": round(_percentile(latencies, 0.9), 3),
+            "p99_ms": round(_percentile(latencies, 0.99), 3),
+            "max_ms": round(latencies[-1], 3),
+            "mean_bytes": round(sum(sizes) / len(sizes)),
+            "max_bytes": max(sizes),
+        }
+    blocked = [lag for lag in lags if lag > BLOCKED_THRESHOLD]
+    sorted_lags = sorted(lags) or [0.0]
+    return {
+        **meta,
+        "elapsed": round(elapsed, 2),
+        "operations": operations,
+        "event_loop": {
+            "probes": len(lags),
+            "blocked_ms": round(sum(blocked) * 1000, 1),
+            "blocked_share": round(sum(blocked) / elapsed, 4),
+            "blocked_count": len(blocked),
+            "p99_lag_ms": round(_percentile(sorted_lags, 0.99) * 1000, 3),
+            "max_lag_ms": round(sorted_lags[-1] * 1000, 3),
+        },
+    }
+
+
+def _format_report(report: dict) -> str:
+    lines = ["Local Grow Box websocket load test"]
+    for key in ("started", "entry_id", "duration", "concurrency", "image_kb", "elapsed"):
+        lines.append(f"{key}: {report[key]}")
+    lines.append("")
+    lines.append(f"{'operation':16} {'calls':>7} {'err':>5} {'/s':>8} {'p50 ms':>9} {'p90 ms':>9} "
+                 f"{'p99 ms':>9} {'max ms':>9} {'mean B':>10} {'max B':>10}")
+    for op, row in report["operations"].items():
+        lines.append(
+            f"{op:16} {row['calls']:7d} {row['errors']:5d} {row['per_second']:8.1f} {row['p50_ms']:9.3f} "
+            f"{row['p90_ms']:9.3f} {row['p99_ms']:9.3f} {row['max_ms']:9.3f} {row['mean_bytes']:10d} {row['max_bytes']:10d}"
+        )
+    loop = report["event_loop"]
+    lines.append("")
+    lines.append(
+        f"Event loop: blocked {loop['blocked_ms']} ms ({loop['blocked_share'] * 100:.2f} %) in "
+        f"{loop['blocked_count']} stalls > {BLOCKED_THRESHOLD * 1000:.0f} ms, "
+        f"p99 lag {loop['p99_lag_ms']} ms, max lag {loop['max_lag_ms']} ms"
+    )
+    return "\n".join(lines) + "\n"
+
+
+def _write_report(path: str, report: dict) -> list[str]:
+    """Write the text and JSON report. Runs in the executor."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.txt", "w", encoding="utf-8") as file:
+        file.write(_format_report(report))
+    with open(f"{path}.json", "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    return [f"{path}.txt", f"{path}.json"]
+
+
+def _remove_image(path: str) -> None:
+    if os.path.exists(path):
+        os.remove(path)
+
+
+@callback
+def _async_restore_image_version(hass: HomeAssistant, entry: ConfigEntry, version) -> None:
+    """Put back the image version that the simulated uploads bumped."""
+    if entry.options.get("image_version") == version:
+        return
+    options = {key: value for key, value in entry.options.items() if key != "image_version"}
+    if version is not None:
+        options["image_version"] = version
+    manager = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if manager is not None:
+        # Applied to the running box first, so the update listener does not reload it
+        if version is None:
+            manager.config.pop("image_version", None)
+        else:
+            manager.config["image_version"] = version
+    hass.config_entries.async_update_entry(entry, options=options)
+
+
+async def async_handle_loadtest(hass: HomeAssistant, call: ServiceCall, handlers: dict[str, Callable]) -> None:
+    """Drive the websocket handlers of one box and write the report to the config directory.
+
+    update_config sends the current options back, so the box is not reloaded.
+    upload_image writes a throwaway image that is removed afterwards; the
+    handler bumps the image version of the box, which is put back then.
+    """
+    entry_id = call.data.get("entry_id") or next(iter(hass.data.get(DOMAIN, {})), None)
+    entry = hass.config_entries.async_get_entry(entry_id) if entry_id else None
+    if entry is None:
+        raise HomeAssistantError("No grow box to load test")
+    duration = call.data["duration"]
+    concurrency = call.data["concurrency"]
+    operations = call.data["operations"]
+    image = base64.b64encode(random.randbytes(call.data["image_kb"] * 1024)).decode()
+
+    def build(op: str, msg_id: int) -> dict:
+        msg = {"id": msg_id, "type": f"{DOMAIN}/{op}", "entry_id": entry.entry_id}
+        if op == "update_config":
+            msg["config"] = dict(entry.options)
+        elif op == "upload_image":
+            msg["device_id"] = IMAGE_DEVICE_ID
+            msg["image"] = image
+        return msg
+
+    connection = LoadTestConnection()
+    samples: dict[str, list] = {op: [] for op in operations}
+    lags: list[float] = []
+    ids = iter(range(1, 1 << 62))
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + duration
+
+    async def client(index: int) -> None:
+        # Clients start at different operations so they don't move in lockstep
+        position = index
+        while loop.time() < deadline:
+            op = operations[position % len(operations)]
+            position += 1
+            msg_id = next(ids)
+            response = connection.expect(msg_id)
+            started = time.perf_counter()
+            handlers[op](hass, connection, build(op, msg_id))
+            try:
+                size, error = await asyncio.wait_for(response, RESPONSE_TIMEOUT)
+            except asyncio.TimeoutError:
+                size, error = 0, "timeout"
+            samples[op].append((time.perf_counter() - started, size, error))
+
+    async def probe() -> None:
+        while loop.time() < deadline:
+            started = loop.time()
+            await asyncio.sleep(PROBE_INTERVAL)
+            lags.append(max(0.0, loop.time() - started - PROBE_INTERVAL))
+
+    _LOGGER.warning(
+        "Load testing %s with %d clients for %ss: %s", entry.title, concurrency, duration, ", ".join(operations)
+    )
+    started_at = dt_util.now()
+    image_version = entry.options.get("image_version")
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(probe(), *(client(i) for i in range(concurrency)))
+    finally:
+        if "upload_image" in operations:
+            _async_restore_image_version(hass, entry, image_version)
+    elapsed = time.perf_counter() - started
+
+    if "upload_image" in operations:
+        image_path = hass.config.path("www", "local_grow_box_images", f"{IMAGE_DEVICE_ID}.jpg")
+        await hass.async_add_executor_job(_remove_image, image_path)
+
+    meta = {
+        "started": started_at.isoformat(),
+        "entry_id": entry.entry_id,
+        "duration": duration,
+        "concurrency": concurrency,
+        "image_kb": call.data["image_kb"],
+    }
+    report = _summarize(samples, lags, elapsed, meta)
+    path = hass.config.path(OUTPUT_DIR, f"loadtest_{started_at.strftime('%Y%m%d_%H%M%S')}")
+    files = await hass.async_add_executor_job(_write_report, path, report)
+    _LOGGER.warning("Load test report written to %s\n%s", ", ".join(files), _format_report(report))
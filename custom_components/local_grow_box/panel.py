@@ -0,0 +1,96 @@
+"""Panel asset serving for Local Grow Box."""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import HomeAssistantView
+
+try:
+    import brotli
+except ImportError:  # Optional, gzip is always available
+    brotli = None
+
+_LOGGER = logging.getLogger(__name__)
+
+PANEL_FILENAME = "local-grow-box-panel.js"
+PANEL_URL_BASE = "/local_grow_box/panel"
+
+# The URL carries the content hash, so the response never changes for a given URL
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class PanelAsset:
+    """Panel module with its content hash and pre-compressed variants."""
+
+    def __init__(self, raw: bytes):
+        """Hash and compress the panel once (run in the executor)."""
+        self.version = hashlib.sha256(raw).hexdigest()[:16]
+        self.raw = raw
+        self.gzip = gzip.compress(raw, compresslevel=9, mtime=0)
+        self.brotli = brotli.compress(raw, quality=11) if brotli else None
+
+    @property
+    def url(self) -> str:
+        """Return the versioned module URL."""
+        return f"{PANEL_URL_BASE}/{self.version}/{PANEL_FILENAME}"
+
+
+def load_panel_asset(path: str) -> PanelAsset:
+    """Read the panel file and build the asset. Blocking."""
+    with open(path, "rb") as f:
+        asset = PanelAsset(f.read())
+    _LOGGER.debug(
+        "Panel asset %s: %d bytes, gzip %d, brotli %s",
+        asset.version, len(asset.raw), len(asset.gzip),
+        len(asset.brotli) if asset.brotli else "n/a",
+    )
+    return asset
+
+
+class GrowBoxPanelView(HomeAssistantView):
+    """Serve the content-hashed panel module with immutable caching."""
+
+    requires_auth = False  # Loaded by the browser as a plain module script
+    name = "local_grow_box:panel"
+    url = PANEL_URL_BASE + "/{version}/" + PANEL_FILENAME
+
+    def __init__(self, asset: PanelAsset):
+        """Initialize the view."""
+        self._asset = asset
+
+    async def get(self, request: web.Request, version: str) -> web.Response:
+        """Return the panel module, pre-compressed when the client accepts it."""
+        asset = self._asset
+        if version != asset.version:
+            # Stale URL from an older release: point at the current one without caching
+            raise web.HTTPFound(asset.url, headers={hdrs.CACHE_CONTROL: "no-cache"})
+
+        accept = request.headers.get(hdrs.ACCEPT_ENCODING, "")
+        if asset.brotli is not None and "br" in accept:
+            body, encoding = asset.brotli, "br"
+        elif "gzip" in accept:
+            body, encoding = asset.gzip, "gzip"
+        else:
+            body, encoding = asset.raw, None
+
+        etag = f'"{asset.version}-{encoding or "identity"}"'
+        headers = {
+            hdrs.CACHE_CONTROL: IMMUTABLE_CACHE_CONTROL,
+            hdrs.VARY: hdrs.ACCEPT_ENCODING,
+            hdrs.ETAG: etag,
+        }
+        if request.headers.get(hdrs.IF_NONE_MATCH) == etag:
+            return web.Response(status=304, headers=headers)
+
+        if encoding:
+            headers[hdrs.CONTENT_ENCODING] = encoding
+        return web.Response(
+            body=body,
+            content_type="text/javascript",
+            charset="utf-8",
+            headers=headers,
+        )
@@ -0,0 +1,152 @@
+"""Phase profiles for Local Grow Box."""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+import voluptuous as vol
+
+from .const import (
+    PHASE_SEEDLING, PHASE_VEGETATIVE, PHASE_FLOWERING, PHASE_DRYING, PHASE_CURING,
+    PHASE_LIGHT_HOURS, PHASE_VPD_BANDS, DEFAULT_VPD_MIN, DEFAULT_VPD_MAX, CONF_PHASE_SEEDLING_HOURS, CONF_PHASE_VEGETATIVE_HOURS,
+    CONF_PHASE_FLOWERING_HOURS, CONF_PHASE_DRYING_HOURS, CONF_PHASE_CURING_HOURS,
+    CONF_CUSTOM1_NAME, CONF_CUSTOM1_HOURS, CONF_CUSTOM2_NAME, CONF_CUSTOM2_HOURS,
+    CONF_CUSTOM3_NAME, CONF_CUSTOM3_HOURS, CONF_PHASE_PROFILES,
+    CONF_LIGHT_START_HOUR, DEFAULT_LIGHT_START_HOUR, CONF_TARGET_TEMP, DEFAULT_TARGET_TEMP,
+    CONF_TARGET_HUMIDITY, DEFAULT_TARGET_HUMIDITY, CONF_MAX_HUMIDITY, DEFAULT_MAX_HUMIDITY,
+    CONF_TARGET_MOISTURE, DEFAULT_TARGET_MOISTURE, CONF_PUMP_DURATION, DEFAULT_PUMP_DURATION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Built-in phases in display order: id, name, config key of the legacy light hours
+BUILTIN_PHASES = (
+    (PHASE_SEEDLING, "Keimling", CONF_PHASE_SEEDLING_HOURS),
+    (PHASE_VEGETATIVE, "Wachstum", CONF_PHASE_VEGETATIVE_HOURS),
+    (PHASE_FLOWERING, "Blüte", CONF_PHASE_FLOWERING_HOURS),
+    (PHASE_DRYING, "Trocknen", CONF_PHASE_DRYING_HOURS),
+    (PHASE_CURING, "Veredelung", CONF_PHASE_CURING_HOURS),
+)
+BUILTIN_IDS = tuple(phase_id for phase_id, _, _ in BUILTIN_PHASES)
+LEGACY_CUSTOM = (
+    (CONF_CUSTOM1_NAME, CONF_CUSTOM1_HOURS),
+    (CONF_CUSTOM2_NAME, CONF_CUSTOM2_HOURS),
+    (CONF_CUSTOM3_NAME, CONF_CUSTOM3_HOURS),
+)
+
+# Setpoints without a per-phase value fall back to these box-wide options
+GLOBAL_DEFAULTS = {
+    "light_start_hour": (CONF_LIGHT_START_HOUR, DEFAULT_LIGHT_START_HOUR, int),
+    "target_temp": (CONF_TARGET_TEMP, DEFAULT_TARGET_TEMP, float),
+    "target_humidity": (CONF_TARGET_HUMIDITY, DEFAULT_TARGET_HUMIDITY, float),
+    "max_humidity": (CONF_MAX_HUMIDITY, DEFAULT_MAX_HUMIDITY, float),
+    "target_moisture": (CONF_TARGET_MOISTURE, DEFAULT_TARGET_MOISTURE, float),
+    "pump_duration": (CONF_PUMP_DURATION, DEFAULT_PUMP_DURATION, float),
+}
+# Fixed fallbacks for setpoints that only exist per phase
+PHASE_ONLY_DEFAULTS = {"vpd_min": DEFAULT_VPD_MIN, "vpd_max": DEFAULT_VPD_MAX}
+
+PROFILE_SCHEMA = vol.Schema({
+    vol.Required("id"): vol.All(str, vol.Match(r"^[a-z0-9_]{1,32}$")),
+    vol.Optional("name"): vol.Any(None, str),
+    vol.Optional("light_hours"): vol.Any(None, vol.All(vol.Coerce(float), vol.Range(min=0, max=24))),
+    vol.Optional("light_start_hour"): vol.Any(None, vol.All(vol.Coerce(int), vol.Range(min=0, max=23))),
+    vol.Optional("target_temp"): vol.Any(None, vol.Coerce(float)),
+    vol.Optional("target_humidity"): vol.Any(None, vol.All(vol.Coerce(float), vol.Range(min=0, max=100))),
+    vol.Optional("max_humidity"): vol.Any(None, vol.All(vol.Coerce(float), vol.Range(min=0, max=100))),
+    vol.Optional("target_moisture"): vol.Any(None, vol.All(vol.Coerce(float), vol.Range(min=0, max=100))),
+    vol.Optional("pump_duration"): vol.Any(None, vol.All(vol.Coerce(float), vol.Range(min=0))),
+    vol.Optional("vpd_min"): vol.Any(None, vol.All(vol.Coerce(float), vol.Range(min=0, max=5))),
+    vol.Optional("vpd_max"): vol.Any(None, vol.All(vol.Coerce(float), vol.Range(min=0, max=5))),
+})
+
+
+@dataclass(frozen=True, slots=True)
+class PhaseProfile:
+    """Resolved setpoints of one grow phase."""
+
+    id: str
+    name: str
+    light_hours: float
+    light_start_hour: int
+    target_temp: float
+    target_humidity: float
+    max_humidity: float
+    target_moisture: float
+    pump_duration: float
+    vpd_min: float
+    vpd_max: float
+
+    def as_dict(self) -> dict:
+        """Return a JSON friendly representation."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _value(config: dict, key: str, default, type_func):
+    val = config.get(key)
+    if val is None or val == "":
+        return default
+    try:
+        return type_func(val)
+    except (ValueError, TypeError):
+        return default
+
+
+class PhaseRegistry:
+    """All phases of a box, compiled once from the options."""
+
+    def __init__(self, config: dict):
+        """Compile the built-in, legacy custom and stored phase profiles."""
+        defaults = {field: _value(config, *spec) for field, spec in GLOBAL_DEFAULTS.items()}
+        defaults.update(PHASE_ONLY_DEFAULTS)
+        if not 0 <= defaults["light_start_hour"] <= 23:
+            _LOGGER.warning("Invalid start_hour %s. Using default.", defaults["light_start_hour"])
+            defaults["light_start_hour"] = DEFAULT_LIGHT_START_HOUR
+
+        raw: dict[str, dict] = {}
+        for phase_id, name, hours_key in BUILTIN_PHASES:
+            vpd_min, vpd_max = PHASE_VPD_BANDS[phase_id]
+            raw[phase_id] = {
+                "name": name,
+                "light_hours": _value(config, hours_key, PHASE_LIGHT_HOURS[phase_id], float),
+                "vpd_min": vpd_min,
+                "vpd_max": vpd_max,
+            }
+        for name_key, hours_key in LEGACY_CUSTOM:
+            name = config.get(name_key)
+            if name:
+                raw.setdefault(name, {"name": name})["light_hours"] = _value(config, hours_key, 0, float)
+        for phase_id, override in (config.get(CONF_PHASE_PROFILES) or {}).items():
+            raw.setdefault(phase_id, {}).update(
+                (k, v) for k, v in override.items() if v is not None and v != "" and k != "id"
+            )
+
+        self.profiles: dict[str, PhaseProfile] = {}
+        for phase_id, values in raw.items():
+            try:
+                self.profiles[phase_id] = self._build(phase_id, defaults, values)
+            except (vol.Invalid, ValueError, TypeError) as err:
+                _LOGGER.warning("Ignoring invalid phase profile %s: %s", phase_id, err)
+        # Unknown phases (e.g. a deleted one still selected) run 12/12 on the box defaults
+        self.fallback = PhaseProfile(id="", name="", light_hours=12.0, **defaults)
+
+    @staticmethod
+    def _build(phase_id: str, defaults: dict, values: dict) -> PhaseProfile:
+        # Legacy custom phase ids are free text, so validate the values only
+        merged = PROFILE_SCHEMA({**defaults, "name": phase_id, "light_hours": 12.0, **values, "id": "phase"})
+        merged["id"] = phase_id
+        return PhaseProfile(**{name: merged[name] for name in PhaseProfile.__slots__})
+
+    def get(self, phase_id: str) -> PhaseProfile:
+        """Return the profile of a phase, the fallback if unknown."""
+        return self.profiles.get(phase_id, self.fallback)
+
+    def __contains__(self, phase_id: str) -> bool:
+        return phase_id in self.profiles
+
+    def __iter__(self):
+        return iter(self.profiles)
+
+    def as_list(self) -> list[dict]:
+        """Return all profiles in display order."""
+        return [profile.as_dict() for profile in self.profiles.values()]
@@ -0,0 +1,198 @@
+"""Integration-wide power budget for Local Grow Box.
+
+Boxes usually share one circuit. Lights with the same start hour, fans and
+pumps would otherwise switch on in the same second and add up their inrush
+currents. Every automatic turn-on asks the budget first. It is admitted
+while the running load plus the inrush of the loads started during the last
+POWER_INRUSH_TIME seconds stays within the circuit limit; otherwise it
+waits in request order and the box asks again on its next tick.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN, POWER_CIRCUIT_LIMIT, POWER_INRUSH_FACTOR, POWER_INRUSH_TIME, POWER_REQUEST_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_POWER = f"{DOMAIN}_power"
+STORAGE_VERSION = 1
+HISTORY_SIZE = 50
+
+
+@dataclass(slots=True)
+class PowerRequest:
+    """A turn-on waiting for budget."""
+
+    watts: float
+    requested: float
+    seen: float
+
+
+@dataclass(slots=True)
+class PowerReservation:
+    """Inrush draw of a load that was just switched on."""
+
+    entry_id: str
+    entity_id: str
+    draw: float
+    until: float
+
+
+class PowerBudget:
+    """Admit turn-ons of all boxes so the circuit limit is never exceeded."""
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the budget."""
+        self.hass = hass
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}_power")
+        self.circuit_limit = POWER_CIRCUIT_LIMIT
+        self.inrush_factor = POWER_INRUSH_FACTOR
+        self._loads: dict[str, Callable[[], float]] = {}
+        self._queue: dict[tuple[str, str], PowerRequest] = {}
+        self._reservations: list[PowerReservation] = []
+        self._history: deque[dict] = deque(maxlen=HISTORY_SIZE)
+
+    async def async_setup(self) -> None:
+        """Load the settings."""
+        data = await self._store.async_load()
+        if data:
+            self.circuit_limit = data.get("circuit_limit", POWER_CIRCUIT_LIMIT)
+            self.inrush_factor = data.get("inrush_factor", POWER_INRUSH_FACTOR)
+
+    def _data_to_save(self) -> dict:
+        return {"circuit_limit": self.circuit_limit, "inrush_factor": self.inrush_factor}
+
+    @callback
+    def async_set_settings(self, circuit_limit: float, inrush_factor: float) -> None:
+        """Change the circuit limit (0 turns the budget off) and the inrush factor."""
+        self.circuit_limit = circuit_limit
+        self.inrush_factor = inrush_factor
+        self._store.async_delay_save(self._data_to_save, 1)
+
+    @callback
+    def async_register_load(self, entry_id: str, load: Callable[[], float]) -> Callable[[], None]:
+        """Count load() (the watts a box draws right now) against the budget."""
+        self._loads[entry_id] = load
+
+        @callback
+        def remove() -> None:
+            self._loads.pop(entry_id, None)
+            for key in [key for key in self._queue if key[0] == entry_id]:
+                del self._queue[key]
+
+        return remove
+
+    @property
+    def load(self) -> float:
+        """Return the steady load of all boxes in W."""
+        return sum(load() for load in self._loads.values())
+
+    def _expire(self, clock: float) -> None:
+        self._reservations = [r for r in self._reservations if r.until > clock]
+        for key in [key for key, request in self._queue.items() if clock - request.seen > POWER_REQUEST_TIMEOUT]:
+            # The box no longer wants it (conditions changed, unloaded or master off)
+            del self._queue[key]
+
+    @callback
+    def async_request(self, entry_id: str, entity_id: str, watts: float) -> bool:
+        """Return True if entity_id may be switched on now, else keep its place in the queue."""
+        if self.circuit_limit <= 0 or watts <= 0:
+            return True
+        clock = time.monotonic()
+        self._expire(clock)
+        key = (entry_id, entity_id)
+        request = self._queue.get(key)
+        if request is None:
+            request = self._queue[key] = PowerRequest(watts, clock, clock)
+        else:
+            request.watts, request.seen = watts, clock
+
+        load = self.load
+        available = self.circuit_limit - load - sum(r.draw for r in self._reservations)
+        for other_key, other in self._queue.items():
+            need = other.watts * self.inrush_factor
+            # A load that cannot fit even alone only waits for the other inrushes to pass
+            fits = need <= available or (
+                need > self.circuit_limit - load and not self._reservations and available >= 0
+            )
+            if not fits:
+                # Strictly in request order, so large loads are not starved by small ones
+                return False
+            if other_key == key:
+                break
+            # Held for the earlier request, it asks again within a tick
+            available -= need
+
+        del self._queue[key]
+        self._reservations.append(PowerReservation(entry_id, entity_id, watts * self.inrush_factor, clock + POWER_INRUSH_TIME))
+        self._history.append({
+            "at": dt_util.utcnow().isoformat(),
+            "entry_id": entry_id,
+            "entity_id": entity_id,
+            "watts": watts,
+            "delay": round(clock - request.requested, 2),
+            "load": round(load, 1),
+        })
+        if watts * self.inrush_factor > self.circuit_limit - load:
+            _LOGGER.warning(
+                "Switching on %s (%.0f W) exceeds the circuit limit of %.0f W", entity_id, watts, self.circuit_limit
+            )
+        return True
+
+    def is_waiting(self, entry_id: str, entity_id: str) -> bool:
+        """Return True if a turn-on is queued."""
+        return (entry_id, entity_id) in self._queue
+
+    def schedule(self) -> list[dict]:
+        """Return the queued turn-ons with their estimated start, assuming the load stays as it is."""
+        clock = time.monotonic()
+        load = self.load
+        ends = sorted((r.until, r.draw) for r in self._reservations)
+        reserved = sum(draw for _, draw in ends)
+        at = clock
+        result = []
+        for (entry_id, entity_id), request in self._queue.items():
+            need = request.watts * self.inrush_factor
+            while ends and self.circuit_limit - load - reserved < need:
+                at, draw = ends.pop(0)
+                reserved -= draw
+            ends.append((at + POWER_INRUSH_TIME, need))
+            ends.sort()
+            reserved += need
+            load += request.watts
+            result.append({
+                "entry_id": entry_id,
+                "entity_id": entity_id,
+                "watts": request.watts,
+                "waiting": round(clock - request.requested, 2),
+                "expected_in": round(at - clock, 2),
+            })
+        return result
+
+    def as_dict(self) -> dict:
+        """Return settings, load, inrush reservations, queue and recent turn-ons (for diagnostics)."""
+        clock = time.monotonic()
+        return {
+            "circuit_limit": self.circuit_limit,
+            "inrush_factor": self.inrush_factor,
+            "load": round(self.load, 1),
+            "loads": {entry_id: round(load(), 1) for entry_id, load in self._loads.items()},
+            "inrush": [
+                {"entry_id": r.entry_id, "entity_id": r.entity_id, "draw": round(r.draw, 1),
+                 "remaining": round(r.until - clock, 2)}
+                for r in self._reservations if r.until > clock
+            ],
+            "queue": self.schedule(),
+            "history": list(self._history),
+        }
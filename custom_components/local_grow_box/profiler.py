@@ -0,0 +1,186 @@
+"""On-demand profiling of the control loop and websocket handlers.
+
+cProfile and tracemalloc are per interpreter, so there is one session per
+process. Profiled functions check a single flag while no session runs.
+"""
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import functools
+import io
+import logging
+import os
+import pstats
+import random
+import time
+import tracemalloc
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_PROFILE = "profile"
+OUTPUT_DIR = "local_grow_box_profiles"
+TRACEMALLOC_FRAMES = 5
+
+SERVICE_PROFILE_SCHEMA = vol.Schema({
+    vol.Optional("duration", default=60): vol.All(vol.Coerce(float), vol.Range(min=1, max=3600)),
+    vol.Optional("top", default=30): vol.All(vol.Coerce(int), vol.Range(min=1, max=500)),
+    vol.Optional("memory", default=False): bool,
+    vol.Optional("sample", default=1.0): vol.All(vol.Coerce(float), vol.Range(min=0.01, max=1)),
+})
+
+
+class ProfileSession:
+    """Collect cProfile stats and section timings while active."""
+
+    def __init__(self):
+        """Initialize an idle session."""
+        self.active = False
+        self.sample = 1.0
+        self._profile: cProfile.Profile | None = None
+        self._depth = 0
+        self._profiling = False
+        self.sections: dict[str, list] = {}
+
+    def start(self, sample: float) -> None:
+        """Start collecting."""
+        self.sample = sample
+        self.sections = {}
+        self._profile = cProfile.Profile()
+        self._profiling = False
+        self.active = True
+
+    def stop(self) -> cProfile.Profile | None:
+        """Stop collecting and return the profile."""
+        self.active = False
+        if self._profiling:
+            self._profile.disable()
+            self._profiling = False
+        profile, self._profile = self._profile, None
+        return profile
+
+    def enter(self) -> float:
+        """Enter a profiled section, enabling cProfile on the outermost one."""
+        if self._depth == 0 and self._profile is not None and random.random() < self.sample:
+            try:
+                self._profile.enable()
+                self._profiling = True
+            except ValueError as err:
+                # Another profiler (e.g. the profiler integration) owns the hook
+                _LOGGER.warning("Profiling stopped: %s", err)
+                self.active = False
+        self._depth += 1
+        return time.perf_counter()
+
+    def exit(self, name: str, started: float) -> None:
+        """Leave a profiled section and account its wall time."""
+        elapsed = time.perf_counter() - started
+        self._depth -= 1
+        if self._depth == 0 and self._profiling:
+            self._profile.disable()
+            self._profiling = False
+        section = self.sections.setdefault(name, [0, 0.0, 0.0])
+        section[0] += 1
+        section[1] += elapsed
+        section[2] = max(section[2], elapsed)
+
+
+PROFILER = ProfileSession()
+
+
+def profiled(func):
+    """Time func (sync or async) as a section while a session is active.
+
+    Awaits inside an async section also profile whatever the event loop
+    runs meanwhile, which is the point when looking for loop stalls.
+    """
+    name = func.__qualname__
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if not PROFILER.active:
+                return await func(*args, **kwargs)
+            started = PROFILER.enter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                PROFILER.exit(name, started)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not PROFILER.active:
+            return func(*args, **kwargs)
+        started = PROFILER.enter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            PROFILER.exit(name, started)
+    return wrapper
+
+
+def _write_report(path: str, profile: cProfile.Profile | None, sections: dict, memory, top: int, meta: dict) -> list[str]:
+    """Write the .pstats and text report. Runs in the executor."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    files = []
+    text = io.StringIO()
+    text.write("Local Grow Box profile\n")
+    for key, value in meta.items():
+        text.write(f"{key}: {value}\n")
+
+    text.write("\nSections (calls, total s, mean ms, max ms)\n")
+    for name, (calls, total, peak) in sorted(sections.items(), key=lambda item: -item[1][1]):
+        text.write(f"{name:60} {calls:8d} {total:10.3f} {total / calls * 1000:10.3f} {peak * 1000:10.3f}\n")
+
+    if profile is not None and profile.getstats():
+        profile.dump_stats(f"{path}.pstats")
+        files.append(f"{path}.pstats")
+        text.write(f"\nTop {top} functions by cumulative time\n")
+        stats = pstats.Stats(profile, stream=text)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+
+    if memory is not None:
+        text.write(f"\nTop {top} allocations by line\n")
+        for stat in memory.statistics("lineno")[:top]:
+            text.write(f"{stat}\n")
+
+    with open(f"{path}.txt", "w", encoding="utf-8") as file:
+        file.write(text.getvalue())
+    files.append(f"{path}.txt")
+    return files
+
+
+async def async_handle_profile(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Profile for the requested duration and write the report to the config directory."""
+    if PROFILER.active:
+        raise HomeAssistantError("A profiling session is already running")
+    duration = call.data["duration"]
+    top = call.data["top"]
+    memory = call.data["memory"]
+    started_tracemalloc = memory and not tracemalloc.is_tracing()
+    if started_tracemalloc:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+
+    _LOGGER.warning("Profiling Local Grow Box for %ss", duration)
+    started = dt_util.now()
+    PROFILER.start(call.data["sample"])
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        profile = PROFILER.stop()
+        snapshot = tracemalloc.take_snapshot() if memory and tracemalloc.is_tracing() else None
+        if started_tracemalloc:
+            tracemalloc.stop()
+
+    path = hass.config.path(OUTPUT_DIR, f"profile_{started.strftime('%Y%m%d_%H%M%S')}")
+    meta = {"started": started.isoformat(), "duration": duration, "sample": call.data["sample"], "memory": memory}
+    files = await hass.async_add_executor_job(
+        _write_report, path, profile, PROFILER.sections, snapshot, top, meta
+    )
+    _LOGGER.warning("Profile written to %s", ", ".join(files))
@@ -0,0 +1,99 @@
+"""Psychrometric helpers for Local Grow Box.
+
+All functions take temperatures in °C and relative humidity in %. They
+accept plain floats or, when NumPy is installed, arrays of any shape (for
+history and simulation use). Pressures are returned in kPa.
+"""
+from __future__ import annotations
+
+import math
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, scalars work without it
+    np = None
+
+# Magnus-Tetens coefficients over water (same as the original VPD formula)
+SVP_A = 0.61078  # kPa
+SVP_B = 17.27
+SVP_C = 237.3  # °C
+WATER_VAPOR_GAS_CONSTANT = 461.5  # J/(kg*K)
+
+
+def _exp(x):
+    if np is not None and isinstance(x, np.ndarray):
+        return np.exp(x)
+    return math.exp(x)
+
+
+def _log(x):
+    if np is not None and isinstance(x, np.ndarray):
+        return np.log(x)
+    return math.log(x)
+
+
+def _asarray(x):
+    # Lists become arrays so callers can pass history columns directly
+    if np is not None and isinstance(x, (list, tuple)):
+        return np.asarray(x, dtype=float)
+    return x
+
+
+def svp(temp):
+    """Return the saturation vapor pressure at temp."""
+    temp = _asarray(temp)
+    return SVP_A * _exp(SVP_B * temp / (temp + SVP_C))
+
+
+def vpd(temp, humidity, leaf_offset=0.0):
+    """Return the vapor pressure deficit between leaf and air.
+
+    leaf_offset is the leaf temperature relative to the air (usually
+    negative under lights). With 0 this is the plain air VPD.
+    """
+    temp, humidity = _asarray(temp), _asarray(humidity)
+    return svp(temp + leaf_offset) - svp(temp) * humidity / 100
+
+
+def dew_point(temp, humidity):
+    """Return the dew point in °C."""
+    temp, humidity = _asarray(temp), _asarray(humidity)
+    gamma = _log(humidity / 100) + SVP_B * temp / (temp + SVP_C)
+    return SVP_C * gamma / (SVP_B - gamma)
+
+
+def absolute_humidity(temp, humidity):
+    """Return the absolute humidity in g/m³."""
+    temp, humidity = _asarray(temp), _asarray(humidity)
+    vapor_pressure = svp(temp) * humidity / 100 * 1000  # Pa
+    return vapor_pressure / (WATER_VAPOR_GAS_CONSTANT * (temp + 273.15)) * 1000
+
+
+class SvpTable:
+    """Precomputed SVP values with linear interpolation for the per-tick path."""
+
+    def __init__(self, low: float = -20.0, high: float = 60.0, step: float = 0.1):
+        """Tabulate svp() from low to high °C."""
+        self.low = low
+        self.high = high
+        self.step = step
+        count = int(round((high - low) / step)) + 1
+        self._values = [svp(low + i * step) for i in range(count)]
+
+    def svp(self, temp: float) -> float:
+        """Return the interpolated SVP, computed exactly outside the table."""
+        if not self.low <= temp < self.high:
+            return svp(temp)
+        pos = (temp - self.low) / self.step
+        values = self._values
+        # Just below high, pos rounds up to the last entry
+        index = min(int(pos), len(values) - 2)
+        frac = pos - index
+        return values[index] + (values[index + 1] - values[index]) * frac
+
+    def vpd(self, temp: float, humidity: float, leaf_offset: float = 0.0) -> float:
+        """Return the leaf VPD from the table (see vpd())."""
+        return self.svp(temp + leaf_offset) - self.svp(temp) * humidity / 100
+
+
+SVP_TABLE = SvpTable()
@@ -0,0 +1,105 @@
+"""Sunrise and sunset brightness ramps for dimmable lights.
+
+A ramp is planned once when the light window starts or is about to end,
+as a short list of service calls with their due times. Lights that
+support transitions get a single call and fade by themselves; other
+dimmable lights get LIGHT_RAMP_STEPS brightness steps. The control tick
+only checks whether the next step is due.
+"""
+from __future__ import annotations
+
+import datetime
+from dataclasses import dataclass
+
+from homeassistant.components.light import ATTR_SUPPORTED_COLOR_MODES, LightEntityFeature, brightness_supported
+from homeassistant.const import ATTR_SUPPORTED_FEATURES
+from homeassistant.core import State
+
+from .const import LIGHT_RAMP_MIN_PCT, LIGHT_RAMP_STEPS
+
+RAMP_SUNRISE = "sunrise"
+RAMP_SUNSET = "sunset"
+
+MODE_TRANSITION = "transition"
+MODE_STEPPED = "stepped"
+
+
+def ramp_mode(state: State | None) -> str | None:
+    """Return how a light can be ramped, None if it can only be switched."""
+    if state is None or state.domain != "light":
+        return None
+    if not brightness_supported(state.attributes.get(ATTR_SUPPORTED_COLOR_MODES)):
+        return None
+    if state.attributes.get(ATTR_SUPPORTED_FEATURES, 0) & LightEntityFeature.TRANSITION:
+        return MODE_TRANSITION
+    return MODE_STEPPED
+
+
+@dataclass(frozen=True, slots=True)
+class RampStep:
+    """One light.turn_on call of a ramp."""
+
+    at: datetime.datetime
+    brightness_pct: int
+    transition: float | None = None
+
+    def service_data(self, entity_id: str) -> dict:
+        """Return the light.turn_on data of the step."""
+        data = {"entity_id": entity_id, "brightness_pct": self.brightness_pct}
+        if self.transition:
+            data["transition"] = round(self.transition)
+        return data
+
+
+class LightRamp:
+    """Planned steps of one sunrise or sunset."""
+
+    __slots__ = ("kind", "mode", "start", "end", "steps", "index")
+
+    def __init__(self, kind: str, mode: str, start: datetime.datetime, end: datetime.datetime, now: datetime.datetime):
+        """Plan the ramp between start and end, beginning at now (later if resumed mid-ramp)."""
+        self.kind = kind
+        self.mode = mode
+        self.start = start
+        self.end = end
+        self.index = 0
+        low, high = (LIGHT_RAMP_MIN_PCT, 100) if kind == RAMP_SUNRISE else (100, LIGHT_RAMP_MIN_PCT)
+        span = (end - start).total_seconds()
+        if mode == MODE_TRANSITION:
+            self.steps = (RampStep(now, high, (end - now).total_seconds()),)
+            return
+        # The last step is due one step before the end, so it is sent while the window still ramps
+        steps = [
+            RampStep(start + datetime.timedelta(seconds=span * i / LIGHT_RAMP_STEPS),
+                     round(low + (high - low) * i / (LIGHT_RAMP_STEPS - 1)))
+            for i in range(LIGHT_RAMP_STEPS)
+        ]
+        # Resumed mid-ramp: only the latest step that is already due is sent
+        past = [step for step in steps if step.at <= now]
+        self.steps = tuple(past[-1:] + [step for step in steps if step.at > now])
+
+    def matches(self, kind: str, mode: str, start: datetime.datetime) -> bool:
+        """Return True if this is the planned ramp for the given window."""
+        return self.kind == kind and self.mode == mode and self.start == start
+
+    def due(self, now: datetime.datetime) -> RampStep | None:
+        """Return the step to send now, skipping steps that were overtaken."""
+        step = None
+        while self.index < len(self.steps) and self.steps[self.index].at <= now:
+            step = self.steps[self.index]
+            self.index += 1
+        return step
+
+    def as_dict(self) -> dict:
+        """Return the plan and the progress (for diagnostics)."""
+        return {
+            "kind": self.kind,
+            "mode": self.mode,
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "sent": self.index,
+            "steps": [
+                {"at": step.at.isoformat(), "brightness_pct": step.brightness_pct, "transition": step.transition}
+                for step in self.steps
+            ],
+        }
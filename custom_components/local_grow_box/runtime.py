@@ -0,0 +1,209 @@
+"""Actuator runtime and energy counters for Local Grow Box."""
+from __future__ import annotations
+
+import datetime
+import logging
+from datetime import timedelta
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN, CONF_LIGHT_ENTITY, CONF_FAN_ENTITY, CONF_PUMP_ENTITY, CONF_HUMIDIFIER_ENTITY,
+    CONF_LIGHT_WATTS, CONF_FAN_WATTS, CONF_PUMP_WATTS, CONF_HUMIDIFIER_WATTS,
+)
+from .entities import EntityTracker
+from .snapshot import UNAVAILABLE_STATES
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30  # In seconds
+# Long on-periods (light) are folded into the stored totals this often
+CHECKPOINT_INTERVAL = timedelta(minutes=5)
+
+# Config key of the entity -> actuator name
+ACTUATOR_KEYS = {
+    CONF_LIGHT_ENTITY: "light",
+    CONF_FAN_ENTITY: "fan",
+    CONF_PUMP_ENTITY: "pump",
+    CONF_HUMIDIFIER_ENTITY: "humidifier",
+}
+WATTS_KEYS = {
+    "light": CONF_LIGHT_WATTS,
+    "fan": CONF_FAN_WATTS,
+    "pump": CONF_PUMP_WATTS,
+    "humidifier": CONF_HUMIDIFIER_WATTS,
+}
+ACTUATORS = tuple(ACTUATOR_KEYS.values())
+
+
+def is_running(actuator: str, state: State | None) -> bool:
+    """Return True if the actuator state counts as running."""
+    if state is None or state.state in UNAVAILABLE_STATES:
+        return False
+    if actuator == "humidifier":
+        # Humidifier domain and switches: anything but "off" counts as running
+        return state.state != "off"
+    return state.state == "on"
+
+
+def _empty_counter() -> dict:
+    # Seconds and kWh. total/energy only ever grow, phase_* reset with the phase
+    return {"total": 0.0, "phase": 0.0, "energy": 0.0, "phase_energy": 0.0}
+
+
+class RuntimeCounters:
+    """Count on-time and energy per actuator from state change events."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, entities: EntityTracker, watts: dict[str, float]):
+        """Initialize the counters. watts maps actuator -> nameplate power."""
+        self.hass = hass
+        self._entities = entities
+        self.watts = watts
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}_runtime_{entry_id}")
+        self._counters = {actuator: _empty_counter() for actuator in ACTUATORS}
+        self._on_since: dict[str, datetime.datetime | None] = dict.fromkeys(ACTUATORS)
+        self._phase_key: str | None = None
+        self._unsub_state = None
+        self._unsub_checkpoint = None
+        self._unsub_stop = None
+
+    async def async_setup(self) -> None:
+        """Load stored totals and start counting. Entities must be set up."""
+        data = await self._store.async_load() or {}
+        self._phase_key = data.get("phase_key")
+        for actuator, stored in data.get("counters", {}).items():
+            if actuator in self._counters:
+                self._counters[actuator].update(stored)
+
+        # Time between shutdown and now is not known, count from here
+        now = dt_util.utcnow()
+        for key, actuator in ACTUATOR_KEYS.items():
+            if is_running(actuator, self._entities.state(key)):
+                self._on_since[actuator] = now
+
+        self._unsub_state = self._entities.async_add_listener(self._async_state_changed)
+        self._unsub_checkpoint = async_track_time_interval(
+            self.hass, self._async_checkpoint, CHECKPOINT_INTERVAL
+        )
+        # Config entries are not unloaded when Home Assistant stops
+        self._unsub_stop = self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_stop)
+
+    async def async_unload(self) -> None:
+        """Stop counting and save the totals."""
+        if self._unsub_state:
+            self._unsub_state()
+            self._unsub_state = None
+        if self._unsub_checkpoint:
+            self._unsub_checkpoint()
+            self._unsub_checkpoint = None
+        if self._unsub_stop:
+            self._unsub_stop()
+            self._unsub_stop = None
+        self._fold_all(dt_util.utcnow())
+        await self._store.async_save(self._data_to_save())
+
+    async def _async_stop(self, _event: Event) -> None:
+        self._unsub_stop = None
+        self._fold_all(dt_util.utcnow())
+        await self._store.async_save(self._data_to_save())
+
+    def _fold(self, actuator: str, now: datetime.datetime) -> None:
+        """Move the open on-interval of an actuator into its counters."""
+        since = self._on_since[actuator]
+        if since is None:
+            return
+        seconds = max(0.0, (now - since).total_seconds())
+        kwh = seconds * self.watts.get(actuator, 0.0) / 3_600_000
+        counter = self._counters[actuator]
+        counter["total"] += seconds
+        counter["phase"] += seconds
+        counter["energy"] += kwh
+        counter["phase_energy"] += kwh
+        self._on_since[actuator] = now
+
+    def _fold_all(self, now: datetime.datetime) -> None:
+        for actuator in ACTUATORS:
+            self._fold(actuator, now)
+
+    def _data_to_save(self) -> dict:
+        return {"phase_key": self._phase_key, "counters": self._counters}
+
+    @callback
+    def _async_state_changed(self, key: str, old_state: State | None, new_state: State | None) -> None:
+        actuator = ACTUATOR_KEYS.get(key)
+        if actuator is None:
+            return
+        now = dt_util.utcnow()
+        running = is_running(actuator, new_state)
+        if self._on_since[actuator] is not None and not running:
+            self._fold(actuator, now)
+            self._on_since[actuator] = None
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        elif self._on_since[actuator] is None and running:
+            self._on_since[actuator] = now
+
+    @callback
+    def _async_checkpoint(self, now: datetime.datetime) -> None:
+        if any(self._on_since.values()):
+            self._fold_all(dt_util.utcnow())
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_set_phase(self, phase_key: str) -> None:
+        """Reset the phase counters when the phase (name + start) changed."""
+        if phase_key == self._phase_key:
+            return
+        if self._phase_key is not None:
+            self.async_reset_phase()
+        self._phase_key = phase_key
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_reset_phase(self) -> None:
+        """Reset the phase counters, keeping the lifetime totals."""
+        self._fold_all(dt_util.utcnow())
+        for counter in self._counters.values():
+            counter["phase"] = 0.0
+            counter["phase_energy"] = 0.0
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _open(self, actuator: str) -> float:
+        since = self._on_since[actuator]
+        return max(0.0, (dt_util.utcnow() - since).total_seconds()) if since else 0.0
+
+    def runtime(self, actuator: str, phase: bool = False) -> float:
+        """Return the on-time in seconds, including a running on-period."""
+        return self._counters[actuator]["phase" if phase else "total"] + self._open(actuator)
+
+    def energy(self, actuator: str, phase: bool = False) -> float:
+        """Return the energy in kWh, including a running on-period."""
+        open_kwh = self._open(actuator) * self.watts.get(actuator, 0.0) / 3_600_000
+        return self._counters[actuator]["phase_energy" if phase else "energy"] + open_kwh
+
+    @property
+    def load(self) -> float:
+        """Return the nameplate power of the running actuators in W."""
+        return sum(self.watts.get(actuator, 0.0) for actuator, since in self._on_since.items() if since)
+
+    def as_dict(self) -> dict:
+        """Return all counters (for websocket and diagnostics)."""
+        return {
+            actuator: {
+                "runtime": round(self.runtime(actuator), 1),
+                "phase_runtime": round(self.runtime(actuator, True), 1),
+                "energy": round(self.energy(actuator), 4),
+                "phase_energy": round(self.energy(actuator, True), 4),
+                "watts": self.watts.get(actuator, 0.0),
+                "on": self._on_since[actuator] is not None,
+            }
+            for actuator in ACTUATORS
+        }
+
+    async def async_remove(self) -> None:
+        """Delete the stored counters."""
+        await self._store.async_remove()
@@ -10,7 +10,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
 
 from homeassistant.helpers.device_registry import DeviceInfo
-from .const import DOMAIN, GROW_PHASES, PHASE_VEGETATIVE
+from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,7 +28,6 @@ class GrowPhaseSelect(SelectEntity, RestoreEntity):
 
     _attr_has_entity_name = True
     _attr_name = "Grow Phase"
-    _attr_options = GROW_PHASES
     _attr_icon = "mdi:sprout"
 
     def __init__(self, hass, manager, entry_id):
@@ -37,6 +36,8 @@ class GrowPhaseSelect(SelectEntity, RestoreEntity):
         self.manager = manager
         self._entry_id = entry_id
         self._attr_unique_id = f"{entry_id}_phase"
+        # One option per phase profile, built-in and custom
+        self._attr_options = list(manager.phases)
         self._attr_current_option = manager.current_phase
 
     @property
@@ -52,8 +53,11 @@ class GrowPhaseSelect(SelectEntity, RestoreEntity):
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added."""
         await super().async_added_to_hass()
+        # A phase stored in the options (panel, grow plan) wins over the restored state
+        if "current_phase" in self.manager.config:
+            return
         if (last_state := await self.async_get_last_state()) is not None:
-            if last_state.state in GROW_PHASES:
+            if last_state.state in self.manager.phases:
                 self._attr_current_option = last_state.state
                 # Sync manager with restored state
                 self.manager.set_phase(last_state.state)
@@ -61,5 +65,7 @@ class GrowPhaseSelect(SelectEntity, RestoreEntity):
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
         self._attr_current_option = option
-        self.manager.set_phase(option)
         self.async_write_ha_state()
+        if option != self.manager.current_phase:
+            # Persist the phase and restart its clock, like the panel does
+            self.manager.async_change_phase(option)
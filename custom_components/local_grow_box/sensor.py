@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import logging
 import math
+from datetime import timedelta
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -10,11 +11,14 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfPressure
+from homeassistant.const import UnitOfEnergy, UnitOfPressure, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.device_registry import DeviceInfo
-from .const import DOMAIN
+from homeassistant.util import dt as dt_util
+from .const import DOMAIN, CONF_MOISTURE_SENSOR, CONF_PUMP_ENTITY
+from .runtime import ACTUATOR_KEYS
+from .zones import MAIN_ZONE
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,10 +32,20 @@ async def async_setup_entry(
     # Retrieve the manager
     try:
         manager = hass.data[DOMAIN][entry.entry_id]
-        async_add_entities([
+        entities = [
             GrowBoxVPDSensor(hass, manager, entry.entry_id),
             GrowBoxDaysInPhaseSensor(hass, manager, entry.entry_id)
-        ])
+        ]
+        # Runtime per configured actuator, energy only where a wattage is set
+        for key, actuator in ACTUATOR_KEYS.items():
+            if not manager.config.get(key):
+                continue
+            entities.append(GrowBoxRuntimeSensor(hass, manager, entry.entry_id, actuator))
+            if manager.runtime.watts.get(actuator, 0.0) > 0:
+                entities.append(GrowBoxEnergySensor(hass, manager, entry.entry_id, actuator))
+        if manager.config.get(CONF_MOISTURE_SENSOR) and manager.config.get(CONF_PUMP_ENTITY):
+            entities.append(GrowBoxWateringForecastSensor(hass, manager, entry.entry_id))
+        async_add_entities(entities)
         _LOGGER.debug("Sensors added successfully")
     except Exception as e:
         _LOGGER.error("Error setting up sensors: %s", e)
@@ -106,3 +120,134 @@ class GrowBoxDaysInPhaseSensor(SensorEntity):
     def native_value(self) -> int:
         """Return the value of the sensor."""
         return self.manager.days_in_phase
+
+ACTUATOR_NAMES = {
+    "light": "Light",
+    "fan": "Fan",
+    "pump": "Pump",
+    "humidifier": "Humidifier",
+}
+
+class GrowBoxRuntimeSensor(SensorEntity):
+    """Total on-time of an actuator."""
+
+    _attr_has_entity_name = True
+    _attr_native_unit_of_measurement = UnitOfTime.HOURS
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_suggested_display_precision = 2
+    _attr_icon = "mdi:timer-outline"
+
+    def __init__(self, hass, manager, entry_id, actuator):
+        """Initialize the sensor."""
+        self.hass = hass
+        self.manager = manager
+        self._entry_id = entry_id
+        self._actuator = actuator
+        self._attr_name = f"{ACTUATOR_NAMES[actuator]} Runtime"
+        self._attr_unique_id = f"{entry_id}_{actuator}_runtime"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device info."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._entry_id)},
+            name=self.manager.entry.title,
+            manufacturer="Local Grow Box",
+            model="Grow Box Controller",
+        )
+
+    @property
+    def native_value(self) -> float:
+        """Return the lifetime on-time in hours."""
+        return round(self.manager.runtime.runtime(self._actuator) / 3600, 4)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the on-time of the current phase."""
+        return {"phase_hours": round(self.manager.runtime.runtime(self._actuator, phase=True) / 3600, 4)}
+
+class GrowBoxEnergySensor(SensorEntity):
+    """Energy used by an actuator, from its on-time and configured wattage."""
+
+    _attr_has_entity_name = True
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_suggested_display_precision = 3
+    _attr_icon = "mdi:lightning-bolt"
+
+    def __init__(self, hass, manager, entry_id, actuator):
+        """Initialize the sensor."""
+        self.hass = hass
+        self.manager = manager
+        self._entry_id = entry_id
+        self._actuator = actuator
+        self._attr_name = f"{ACTUATOR_NAMES[actuator]} Energy"
+        self._attr_unique_id = f"{entry_id}_{actuator}_energy"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device info."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._entry_id)},
+            name=self.manager.entry.title,
+            manufacturer="Local Grow Box",
+            model="Grow Box Controller",
+        )
+
+    @property
+    def native_value(self) -> float:
+        """Return the lifetime energy in kWh."""
+        return round(self.manager.runtime.energy(self._actuator), 4)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the energy of the current phase and the wattage used."""
+        return {
+            "phase_energy": round(self.manager.runtime.energy(self._actuator, phase=True), 4),
+            "watts": self.manager.runtime.watts.get(self._actuator, 0.0),
+        }
+
+class GrowBoxWateringForecastSensor(SensorEntity):
+    """Predicted time the soil moisture falls to the target, from the drying trend."""
+
+    _attr_has_entity_name = True
+    _attr_name = "Watering Forecast"
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_icon = "mdi:water-clock"
+    _unrecorded_attributes = frozenset({"samples", "settling"})
+
+    def __init__(self, hass, manager, entry_id):
+        """Initialize the sensor."""
+        self.hass = hass
+        self.manager = manager
+        self._entry_id = entry_id
+        self._attr_unique_id = f"{entry_id}_watering_forecast"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device info."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._entry_id)},
+            name=self.manager.entry.title,
+            manufacturer="Local Grow Box",
+            model="Grow Box Controller",
+        )
+
+    @property
+    def native_value(self):
+        """Return when the target moisture will be reached, None while unknown."""
+        now = dt_util.utcnow()
+        eta = self.manager.zones[MAIN_ZONE].watering.seconds_until(
+            self.manager.phase_profile.target_moisture, now.timestamp()
+        )
+        if eta is None:
+            return None
+        # Whole minutes, so the state doesn't change with every poll
+        return (now + timedelta(seconds=eta)).replace(second=0, microsecond=0)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return drying rate, pump gain and the predicted pump duration."""
+        return self.manager.watering_predictions()
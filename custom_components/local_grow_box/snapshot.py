@@ -0,0 +1,97 @@
+"""Per-tick sensor snapshot for Local Grow Box."""
+from __future__ import annotations
+
+import datetime
+import math
+from dataclasses import dataclass
+
+from homeassistant.core import State
+
+from .const import (
+    CONF_LIGHT_ENTITY, CONF_FAN_ENTITY, CONF_PUMP_ENTITY, CONF_HUMIDIFIER_ENTITY,
+    CONF_TEMP_SENSOR, CONF_HUMIDITY_SENSOR, CONF_MOISTURE_SENSOR,
+)
+from .entities import EntityTracker
+
+UNAVAILABLE_STATES = ("unavailable", "unknown")
+
+
+@dataclass(frozen=True, slots=True)
+class SensorSnapshot:
+    """Parsed inputs of one control tick.
+
+    Numeric values are None when the sensor is missing, unavailable or not a
+    number. Actuator flags are None when the entity is missing or unavailable.
+    """
+
+    taken_at: datetime.datetime
+    temp: float | None = None
+    humidity: float | None = None
+    moisture: float | None = None
+    light_on: bool | None = None
+    fan_on: bool | None = None
+    pump_on: bool | None = None
+    humidifier_on: bool | None = None
+    light_changed: datetime.datetime | None = None
+    fan_changed: datetime.datetime | None = None
+    pump_changed: datetime.datetime | None = None
+    humidifier_changed: datetime.datetime | None = None
+
+    def as_dict(self) -> dict:
+        """Return a JSON friendly representation (for logs and traces)."""
+        data = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            data[name] = value.isoformat() if isinstance(value, datetime.datetime) else value
+        return data
+
+
+def _usable(state: State | None) -> State | None:
+    if state is None or state.state in UNAVAILABLE_STATES:
+        return None
+    return state
+
+
+def _as_float(state: State | None) -> float | None:
+    if state is None:
+        return None
+    try:
+        value = float(state.state)
+    except ValueError:
+        return None
+    # "nan" and "inf" parse as floats but are no readings
+    return value if math.isfinite(value) else None
+
+
+def state_as_float(state: State | None) -> float | None:
+    """Return the numeric value of a state, None if unavailable or not a number."""
+    return _as_float(_usable(state))
+
+
+def state_is_on(state: State | None) -> bool | None:
+    """Return True if a switch-like state is on, None if unavailable."""
+    state = _usable(state)
+    return state.state == "on" if state else None
+
+
+def build_snapshot(entities: EntityTracker, now: datetime.datetime) -> SensorSnapshot:
+    """Read every configured entity once and parse it."""
+    light = _usable(entities.state(CONF_LIGHT_ENTITY))
+    fan = _usable(entities.state(CONF_FAN_ENTITY))
+    pump = _usable(entities.state(CONF_PUMP_ENTITY))
+    humidifier = _usable(entities.state(CONF_HUMIDIFIER_ENTITY))
+    return SensorSnapshot(
+        taken_at=now,
+        temp=_as_float(_usable(entities.state(CONF_TEMP_SENSOR))),
+        humidity=_as_float(_usable(entities.state(CONF_HUMIDITY_SENSOR))),
+        moisture=_as_float(_usable(entities.state(CONF_MOISTURE_SENSOR))),
+        light_on=light.state == "on" if light else None,
+        fan_on=fan.state == "on" if fan else None,
+        pump_on=pump.state == "on" if pump else None,
+        # Humidifier domain and switches: anything but "off" counts as running
+        humidifier_on=humidifier.state != "off" if humidifier else None,
+        light_changed=light.last_changed if light else None,
+        fan_changed=fan.last_changed if fan else None,
+        pump_changed=pump.last_changed if pump else None,
+        humidifier_changed=humidifier.last_changed if humidifier else None,
+    )
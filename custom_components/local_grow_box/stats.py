@@ -0,0 +1,179 @@
+"""Hourly long-term statistics for Local Grow Box."""
+from __future__ import annotations
+
+import datetime
+import logging
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfPressure, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .runtime import ACTUATORS, RuntimeCounters
+from .snapshot import SensorSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HourlyStats:
+    """Accumulate hourly aggregates per tick and import them as external statistics.
+
+    On-time is the growth of the lifetime RuntimeCounters over the hour. The
+    open hour is part of the controller state, so a reload or restart
+    continues it instead of importing a partial hour.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, runtime: RuntimeCounters):
+        """Initialize the accumulator."""
+        self.hass = hass
+        self.entry = entry
+        self._runtime = runtime
+        prefix = f"{DOMAIN}:{entry.entry_id.lower()}"
+        self.vpd_id = f"{prefix}_vpd"
+        self.on_time_ids = {actuator: f"{prefix}_{actuator}_on_time" for actuator in ACTUATORS}
+        self.pump_runs_id = f"{prefix}_pump_runs"
+        self._sums: dict[str, float] | None = None
+        self._hour_start: datetime.datetime | None = None
+        # Lifetime on-seconds per actuator when the hour started
+        self._on_base: dict[str, float] = {}
+        self._last_pump_on = None
+        self._reset()
+
+    def _reset(self):
+        self._vpd_n = 0
+        self._vpd_sum = 0.0
+        self._vpd_min = None
+        self._vpd_max = None
+        self._pump_runs = 0
+
+    def _on_seconds(self) -> dict[str, float]:
+        return {actuator: self._runtime.runtime(actuator) for actuator in ACTUATORS}
+
+    @callback
+    def async_add_tick(self, snapshot: SensorSnapshot, vpd: float | None):
+        """Fold one tick into the current hour, closing the previous hour if needed."""
+        now = dt_util.as_utc(snapshot.taken_at)
+        hour_start = now.replace(minute=0, second=0, microsecond=0)
+        if self._hour_start is not None and hour_start != self._hour_start:
+            self._async_close()
+        if self._hour_start is None:
+            self._hour_start = hour_start
+            self._on_base = self._on_seconds()
+
+        if snapshot.pump_on and self._last_pump_on is False:
+            self._pump_runs += 1
+        if snapshot.pump_on is not None:
+            self._last_pump_on = snapshot.pump_on
+
+        if vpd is not None:
+            self._vpd_n += 1
+            self._vpd_sum += vpd
+            self._vpd_min = vpd if self._vpd_min is None else min(self._vpd_min, vpd)
+            self._vpd_max = vpd if self._vpd_max is None else max(self._vpd_max, vpd)
+
+    def as_state(self) -> dict | None:
+        """Return the open hour for a warm restart."""
+        if self._hour_start is None:
+            return None
+        return {
+            "hour_start": self._hour_start.isoformat(),
+            "on_base": self._on_base,
+            "vpd": [self._vpd_n, self._vpd_sum, self._vpd_min, self._vpd_max],
+            "pump_runs": self._pump_runs,
+            "last_pump_on": self._last_pump_on,
+        }
+
+    @callback
+    def async_restore(self, state: dict | None):
+        """Continue a saved hour. An hour that is over by now is imported on the first tick."""
+        if not state:
+            return
+        self._hour_start = dt_util.parse_datetime(state["hour_start"])
+        self._on_base = state["on_base"]
+        self._vpd_n, self._vpd_sum, self._vpd_min, self._vpd_max = state["vpd"]
+        self._pump_runs = state["pump_runs"]
+        self._last_pump_on = state["last_pump_on"]
+
+    @callback
+    def _async_close(self):
+        on_seconds = self._on_seconds()
+        hour = {
+            "start": self._hour_start,
+            "vpd": (self._vpd_sum / self._vpd_n, self._vpd_min, self._vpd_max) if self._vpd_n else None,
+            "on_hours": {a: max(0.0, on_seconds[a] - self._on_base.get(a, on_seconds[a])) / 3600 for a in ACTUATORS},
+            "pump_runs": self._pump_runs,
+        }
+        self._reset()
+        self._hour_start = None
+        if "recorder" not in self.hass.config.components:
+            return
+        self.hass.async_create_task(self._async_import(hour))
+
+    async def _async_load_sums(self) -> dict[str, float]:
+        """Read the last cumulative sums so the series continue across restarts."""
+        from homeassistant.components.recorder import get_instance
+        from homeassistant.components.recorder.statistics import get_last_statistics
+
+        sums = {}
+        for statistic_id in (*self.on_time_ids.values(), self.pump_runs_id):
+            last = await get_instance(self.hass).async_add_executor_job(
+                get_last_statistics, self.hass, 1, statistic_id, True, {"sum"}
+            )
+            rows = last.get(statistic_id)
+            sums[statistic_id] = (rows[0].get("sum") or 0.0) if rows else 0.0
+        return sums
+
+    async def _async_import(self, hour: dict):
+        from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+        if self._sums is None:
+            self._sums = await self._async_load_sums()
+        start = hour["start"]
+        title = self.entry.title
+
+        if hour["vpd"] is not None:
+            mean, low, high = hour["vpd"]
+            async_add_external_statistics(
+                self.hass,
+                {
+                    "has_mean": True,
+                    "has_sum": False,
+                    "name": f"{title} VPD",
+                    "source": DOMAIN,
+                    "statistic_id": self.vpd_id,
+                    "unit_of_measurement": UnitOfPressure.KPA,
+                },
+                [{"start": start, "mean": mean, "min": low, "max": high}],
+            )
+
+        for actuator, statistic_id in self.on_time_ids.items():
+            value = hour["on_hours"][actuator]
+            self._sums[statistic_id] += value
+            async_add_external_statistics(
+                self.hass,
+                {
+                    "has_mean": False,
+                    "has_sum": True,
+                    "name": f"{title} {actuator} on-time",
+                    "source": DOMAIN,
+                    "statistic_id": statistic_id,
+                    "unit_of_measurement": UnitOfTime.HOURS,
+                },
+                [{"start": start, "state": value, "sum": self._sums[statistic_id]}],
+            )
+
+        self._sums[self.pump_runs_id] += hour["pump_runs"]
+        async_add_external_statistics(
+            self.hass,
+            {
+                "has_mean": False,
+                "has_sum": True,
+                "name": f"{title} pump runs",
+                "source": DOMAIN,
+                "statistic_id": self.pump_runs_id,
+                "unit_of_measurement": None,
+            },
+            [{"start": start, "state": hour["pump_runs"], "sum": self._sums[self.pump_runs_id]}],
+        )
+        _LOGGER.debug("Imported hourly statistics for %s at %s", title, start)
@@ -13,29 +13,7 @@ from homeassistant.helpers.device_registry import DeviceInfo
 from .const import (
     DOMAIN, 
     CONF_PUMP_ENTITY, 
-    CONF_CAMERA_ENTITY,
-    CONF_TEMP_SENSOR,
-    CONF_HUMIDITY_SENSOR,
-    CONF_LIGHT_ENTITY,
-    CONF_FAN_ENTITY,
-    CONF_PUMP_DURATION,
-    CONF_MOISTURE_SENSOR,
-    CONF_TARGET_MOISTURE,
-    CONF_LIGHT_START_HOUR,
-    CONF_TARGET_TEMP,
-    CONF_MAX_HUMIDITY,
-    DEFAULT_PUMP_DURATION,
-    DEFAULT_TARGET_MOISTURE,
-    DEFAULT_LIGHT_START_HOUR,
-    DEFAULT_TARGET_TEMP,
-    DEFAULT_MAX_HUMIDITY,
-    CONF_TARGET_HUMIDITY,
-    DEFAULT_TARGET_HUMIDITY,
     CONF_HUMIDIFIER_ENTITY,
-    CONF_MIN_HUMIDITY,
-    DEFAULT_MIN_HUMIDITY,
-    CONF_HUMIDITY_HYSTERESIS,
-    DEFAULT_HUMIDITY_HYSTERESIS,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -64,6 +42,7 @@ class GrowBoxMasterSwitch(SwitchEntity, RestoreEntity):
     _attr_has_entity_name = True
     _attr_name = "Master Control"
     _attr_icon = "mdi:power"
+    _unrecorded_attributes = frozenset({"phase_start_date", "days_in_phase"})
 
     def __init__(self, hass, manager, entry_id):
         """Initialize the switch."""
@@ -85,23 +64,12 @@ class GrowBoxMasterSwitch(SwitchEntity, RestoreEntity):
 
     @property
     def extra_state_attributes(self):
-        """Return entity specific state attributes."""
+        """Return entity specific state attributes.
+
+        Configuration is served by the local_grow_box/get_box websocket
+        command; both values here are also excluded from the recorder.
+        """
         return {
-            "camera_entity": self.manager.config.get(CONF_CAMERA_ENTITY),
-            "temp_sensor": self.manager.config.get(CONF_TEMP_SENSOR),
-            "humidity_sensor": self.manager.config.get(CONF_HUMIDITY_SENSOR),
-            "light_entity": self.manager.config.get(CONF_LIGHT_ENTITY),
-            "fan_entity": self.manager.config.get(CONF_FAN_ENTITY),
-            "pump_entity": self.manager.config.get(CONF_PUMP_ENTITY),
-            "moisture_sensor": self.manager.config.get(CONF_MOISTURE_SENSOR),
-            "target_moisture": self.manager.config.get(CONF_TARGET_MOISTURE, DEFAULT_TARGET_MOISTURE),
-            "pump_duration": self.manager.config.get(CONF_PUMP_DURATION, DEFAULT_PUMP_DURATION),
-            "light_start_hour": self.manager.config.get(CONF_LIGHT_START_HOUR, DEFAULT_LIGHT_START_HOUR),
-            "target_temp": self.manager.config.get(CONF_TARGET_TEMP, DEFAULT_TARGET_TEMP),
-            "max_humidity": self.manager.config.get(CONF_MAX_HUMIDITY, DEFAULT_MAX_HUMIDITY),
-            "target_humidity": self.manager.config.get(CONF_TARGET_HUMIDITY, DEFAULT_TARGET_HUMIDITY),
-            "humidity_hysteresis": self.manager.config.get(CONF_HUMIDITY_HYSTERESIS, DEFAULT_HUMIDITY_HYSTERESIS),
-            "humidifier_entity": self.manager.config.get(CONF_HUMIDIFIER_ENTITY),
             "phase_start_date": self.manager.phase_start_date.isoformat() if self.manager.phase_start_date else None,
             "days_in_phase": self.manager.days_in_phase,
         }
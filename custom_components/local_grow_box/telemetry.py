@@ -0,0 +1,410 @@
+"""Grow-length telemetry store for Local Grow Box.
+
+Samples are appended as fixed-width binary records to per-tier segment files
+under .storage/local_grow_box_telemetry/<entry_id>/. Every raw sample also
+feeds in-memory 1 minute buckets. Closed buckets roll up into 15 minute and
+1 hour buckets, so no tier is ever recomputed from disk. Raw and 1 minute
+segments expire after a few weeks, and the 15 minute and 1 hour tiers grow
+by about 230 kB per box per month. The open buckets are saved with every
+flush and continue after a reload or restart.
+"""
+from __future__ import annotations
+
+import asyncio
+import datetime
+import json
+import logging
+import math
+import mmap
+import os
+import shutil
+import struct
+from datetime import timedelta
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .snapshot import SensorSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+CHANNELS = ("temp", "humidity", "vpd", "moisture")
+ACTUATORS = ("light", "fan", "pump", "humidifier")
+
+SAMPLE_INTERVAL = 10  # In seconds between raw samples
+FLUSH_INTERVAL = timedelta(seconds=60)
+OPEN_BUCKETS_FILE = "open.json"
+
+# ts, 4 x float32 value (NaN = missing), actuator bitmask
+RAW_RECORD = struct.Struct("<I4fB3x")
+# ts, sample count, 4 x (mean, min, max) float32, 4 x on-seconds
+ROLLUP_RECORD = struct.Struct("<IH12f4H2x")
+_TS = struct.Struct("<I")
+
+
+class Tier:
+    """One resolution level of the store."""
+
+    __slots__ = ("name", "seconds", "record", "segment", "retention_days")
+
+    def __init__(self, name, seconds, record, segment, retention_days):
+        """Initialize the tier."""
+        self.name = name
+        self.seconds = seconds
+        self.record = record
+        self.segment = segment  # strftime pattern of the segment file (UTC)
+        self.retention_days = retention_days  # None keeps the tier forever
+
+
+TIERS = (
+    Tier("raw", SAMPLE_INTERVAL, RAW_RECORD, "%Y%m%d", 7),
+    Tier("1m", 60, ROLLUP_RECORD, "%Y%m%d", 31),
+    Tier("15m", 900, ROLLUP_RECORD, "%Y%m", None),
+    Tier("1h", 3600, ROLLUP_RECORD, "%Y", None),
+)
+TIERS_BY_NAME = {tier.name: tier for tier in TIERS}
+
+
+def _nan(value):
+    return math.nan if value is None else value
+
+
+def _none(value):
+    return None if math.isnan(value) else round(value, 3)
+
+
+class _Bucket:
+    """Incremental aggregate of one rollup interval."""
+
+    __slots__ = ("start", "count", "n", "sum", "min", "max", "on_seconds")
+
+    def __init__(self, start: int):
+        """Initialize an empty bucket."""
+        self.start = start
+        self.count = 0
+        self.n = [0] * len(CHANNELS)
+        self.sum = [0.0] * len(CHANNELS)
+        self.min = [math.inf] * len(CHANNELS)
+        self.max = [-math.inf] * len(CHANNELS)
+        self.on_seconds = [0] * len(ACTUATORS)
+
+    def add_sample(self, values, flags, interval):
+        """Add one raw sample."""
+        self.count += 1
+        for i, value in enumerate(values):
+            if value is None:
+                continue
+            self.n[i] += 1
+            self.sum[i] += value
+            if value < self.min[i]:
+                self.min[i] = value
+            if value > self.max[i]:
+                self.max[i] = value
+        for i in range(len(ACTUATORS)):
+            if flags & (1 << i):
+                self.on_seconds[i] += interval
+
+    def as_dict(self) -> dict:
+        """Return the bucket as JSON friendly dict."""
+        return {
+            "start": self.start,
+            "count": self.count,
+            "n": self.n,
+            "sum": self.sum,
+            "min": [v if n else None for v, n in zip(self.min, self.n)],
+            "max": [v if n else None for v, n in zip(self.max, self.n)],
+            "on_seconds": self.on_seconds,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> _Bucket:
+        """Recreate a saved bucket."""
+        bucket = cls(data["start"])
+        bucket.count = data["count"]
+        bucket.n = list(data["n"])
+        bucket.sum = list(data["sum"])
+        bucket.min = [math.inf if v is None else v for v in data["min"]]
+        bucket.max = [-math.inf if v is None else v for v in data["max"]]
+        bucket.on_seconds = list(data["on_seconds"])
+        return bucket
+
+    def merge(self, other: _Bucket):
+        """Fold a closed child bucket into this one."""
+        self.count += other.count
+        for i in range(len(CHANNELS)):
+            self.n[i] += other.n[i]
+            self.sum[i] += other.sum[i]
+            self.min[i] = min(self.min[i], other.min[i])
+            self.max[i] = max(self.max[i], other.max[i])
+        for i in range(len(ACTUATORS)):
+            self.on_seconds[i] += other.on_seconds[i]
+
+    def pack(self) -> bytes:
+        """Return the fixed-width rollup record."""
+        stats = []
+        for i in range(len(CHANNELS)):
+            if self.n[i]:
+                stats += [self.sum[i] / self.n[i], self.min[i], self.max[i]]
+            else:
+                stats += [math.nan, math.nan, math.nan]
+        return ROLLUP_RECORD.pack(
+            self.start, min(self.count, 0xFFFF), *stats,
+            *(min(s, 0xFFFF) for s in self.on_seconds),
+        )
+
+
+class TelemetryStore:
+    """Append-only, tiered time series of one grow box."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        """Initialize the store."""
+        self.hass = hass
+        self._dir = hass.config.path(".storage", "local_grow_box_telemetry", entry_id)
+        self._pending: list[tuple[Tier, int, bytes]] = []
+        self._buckets: dict[str, _Bucket] = {}
+        self._last_sample = 0
+        self._last_prune = None
+        self._unsub_flush = None
+        self._unsub_stop = None
+        self._write_lock = asyncio.Lock()
+
+    async def async_setup(self):
+        """Prepare the directory, continue the open buckets and start periodic flushing."""
+        await self.hass.async_add_executor_job(self._prepare)
+        self._unsub_flush = async_track_time_interval(self.hass, self._async_flush_interval, FLUSH_INTERVAL)
+        # Config entries are not unloaded when Home Assistant stops
+        self._unsub_stop = self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_stop)
+
+    async def async_unload(self):
+        """Stop flushing and write the pending records and the open buckets."""
+        if self._unsub_flush:
+            self._unsub_flush()
+            self._unsub_flush = None
+        if self._unsub_stop:
+            self._unsub_stop()
+            self._unsub_stop = None
+        await self.async_flush(force=True)
+
+    async def _async_stop(self, _event: Event):
+        self._unsub_stop = None
+        await self.async_flush(force=True)
+
+    def _prepare(self):
+        """Create the directory, drop torn trailing records and load the open buckets. Blocking."""
+        os.makedirs(self._dir, exist_ok=True)
+        last_written = {}
+        for tier in TIERS:
+            segments = self._segments(tier)
+            if not segments:
+                continue
+            path = os.path.join(self._dir, segments[-1])
+            size = os.path.getsize(path)
+            excess = size % tier.record.size
+            if excess:
+                _LOGGER.warning("Truncating torn telemetry record in %s", path)
+                with open(path, "r+b") as f:
+                    f.truncate(size - excess)
+                size -= excess
+            if size:
+                with open(path, "rb") as f:
+                    f.seek(size - tier.record.size)
+                    last_written[tier.name] = _TS.unpack(f.read(_TS.size))[0]
+
+        try:
+            with open(os.path.join(self._dir, OPEN_BUCKETS_FILE), encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Discarding open telemetry buckets: %s", err)
+            return
+        self._last_sample = max(data.get("last_sample", 0), last_written.get(TIERS[0].name, 0))
+        for name, bucket in data.get("buckets", {}).items():
+            # Written already if the records got to disk but the bucket file did not
+            if name in TIERS_BY_NAME and bucket["start"] > last_written.get(name, -1):
+                self._buckets[name] = _Bucket.from_dict(bucket)
+
+    @callback
+    def async_add_sample(self, snapshot: SensorSnapshot, vpd: float | None):
+        """Record the tick snapshot if a raw sample is due."""
+        ts = int(snapshot.taken_at.timestamp())
+        ts -= ts % SAMPLE_INTERVAL
+        if ts <= self._last_sample:
+            return
+        self._last_sample = ts
+
+        values = (snapshot.temp, snapshot.humidity, vpd, snapshot.moisture)
+        flags = 0
+        for i, on in enumerate((snapshot.light_on, snapshot.fan_on, snapshot.pump_on, snapshot.humidifier_on)):
+            if on:
+                flags |= 1 << i
+
+        raw = TIERS[0]
+        self._pending.append((raw, ts, raw.record.pack(ts, *(_nan(v) for v in values), flags)))
+
+        minute = TIERS[1]
+        start = ts - ts % minute.seconds
+        bucket = self._buckets.get(minute.name)
+        if bucket is not None and bucket.start != start:
+            self._close(1, bucket)
+            bucket = None
+        if bucket is None:
+            bucket = self._buckets[minute.name] = _Bucket(start)
+        bucket.add_sample(values, flags, SAMPLE_INTERVAL)
+
+    def _close(self, index: int, bucket: _Bucket):
+        """Emit a finished bucket and roll it into the next coarser tier."""
+        tier = TIERS[index]
+        self._pending.append((tier, bucket.start, bucket.pack()))
+        del self._buckets[tier.name]
+        if index + 1 >= len(TIERS):
+            return
+        parent_tier = TIERS[index + 1]
+        parent_start = bucket.start - bucket.start % parent_tier.seconds
+        parent = self._buckets.get(parent_tier.name)
+        if parent is not None and parent.start != parent_start:
+            self._close(index + 1, parent)
+            parent = None
+        if parent is None:
+            parent = self._buckets[parent_tier.name] = _Bucket(parent_start)
+        parent.merge(bucket)
+
+    async def _async_flush_interval(self, _now=None):
+        await self.async_flush()
+
+    async def async_flush(self, force: bool = False):
+        """Write pending records and the open buckets in one executor job."""
+        if not self._pending and not force:
+            return
+        batch, self._pending = self._pending, []
+        today = dt_util.utcnow().date()
+        prune = self._last_prune != today
+        self._last_prune = today
+        buckets = {
+            "last_sample": self._last_sample,
+            "buckets": {name: bucket.as_dict() for name, bucket in self._buckets.items()},
+        }
+        # Serialize writers so appends to one segment never interleave
+        async with self._write_lock:
+            await self.hass.async_add_executor_job(self._write, batch, prune, buckets)
+
+    def _segment_name(self, tier: Tier, ts: int) -> str:
+        when = datetime.datetime.fromtimestamp(ts, datetime.timezone.utc)
+        return f"{tier.name}-{when.strftime(tier.segment)}.bin"
+
+    def _segments(self, tier: Tier) -> list[str]:
+        prefix = f"{tier.name}-"
+        try:
+            names = os.listdir(self._dir)
+        except FileNotFoundError:
+            return []
+        return sorted(n for n in names if n.startswith(prefix) and n.endswith(".bin"))
+
+    def _write(self, batch, prune, buckets):
+        """Append a batch of records, grouped per segment file, then save the open buckets. Blocking."""
+        grouped: dict[str, list[bytes]] = {}
+        for tier, ts, record in batch:
+            grouped.setdefault(self._segment_name(tier, ts), []).append(record)
+        try:
+            for name, records in grouped.items():
+                with open(os.path.join(self._dir, name), "ab") as f:
+                    f.write(b"".join(records))
+            path = os.path.join(self._dir, OPEN_BUCKETS_FILE)
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                json.dump(buckets, f)
+            os.replace(f"{path}.tmp", path)
+            if prune:
+                self._prune()
+        except OSError as err:
+            _LOGGER.error("Failed to write telemetry: %s", err)
+
+    def _prune(self):
+        """Delete segments older than their tier's retention. Blocking."""
+        now = dt_util.utcnow()
+        for tier in TIERS:
+            if tier.retention_days is None:
+                continue
+            cutoff = self._segment_name(tier, int((now - timedelta(days=tier.retention_days)).timestamp()))
+            for name in self._segments(tier):
+                if name < cutoff:
+                    os.remove(os.path.join(self._dir, name))
+
+    def pick_tier(self, start: int, end: int, max_points: int = 2000) -> Tier:
+        """Return the finest tier that covers the range within max_points."""
+        oldest_needed = dt_util.utcnow() - datetime.datetime.fromtimestamp(start, datetime.timezone.utc)
+        for tier in TIERS:
+            if tier.retention_days is not None and oldest_needed > timedelta(days=tier.retention_days):
+                continue
+            if (end - start) / tier.seconds <= max_points:
+                return tier
+        return TIERS[-1]
+
+    def iter_records(self, tier: Tier, start: int, end: int):
+        """Yield unpacked records with start <= ts < end. Blocking.
+
+        Segments are memory-mapped and the first record is found by binary
+        search on the sorted timestamps, so only the requested span is read.
+        """
+        size = tier.record.size
+        first = self._segment_name(tier, start)
+        last = self._segment_name(tier, max(start, end - 1))
+        for name in self._segments(tier):
+            if name < first or name > last:
+                continue
+            path = os.path.join(self._dir, name)
+            count = os.path.getsize(path) // size
+            if not count:
+                continue
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                lo, hi = 0, count
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    if _TS.unpack_from(mm, mid * size)[0] < start:
+                        lo = mid + 1
+                    else:
+                        hi = mid
+                for i in range(lo, count):
+                    record = tier.record.unpack_from(mm, i * size)
+                    if record[0] >= end:
+                        return
+                    yield record
+
+    def read(self, start: int, end: int, tier: Tier | None = None) -> dict:
+        """Return the range as column arrays (JSON friendly). Blocking."""
+        tier = tier or self.pick_tier(start, end)
+        result = {"resolution": tier.name, "interval": tier.seconds, "t": []}
+        if tier is TIERS[0]:
+            for channel in CHANNELS:
+                result[channel] = []
+            for actuator in ACTUATORS:
+                result[actuator] = []
+            for ts, *rest in self.iter_records(tier, start, end):
+                result["t"].append(ts)
+                for i, channel in enumerate(CHANNELS):
+                    result[channel].append(_none(rest[i]))
+                flags = rest[len(CHANNELS)]
+                for i, actuator in enumerate(ACTUATORS):
+                    result[actuator].append(bool(flags & (1 << i)))
+            return result
+
+        for channel in CHANNELS:
+            result[channel] = {"mean": [], "min": [], "max": []}
+        for actuator in ACTUATORS:
+            result[f"{actuator}_on_seconds"] = []
+        for ts, _count, *rest in self.iter_records(tier, start, end):
+            result["t"].append(ts)
+            for i, channel in enumerate(CHANNELS):
+                column = result[channel]
+                column["mean"].append(_none(rest[i * 3]))
+                column["min"].append(_none(rest[i * 3 + 1]))
+                column["max"].append(_none(rest[i * 3 + 2]))
+            offset = len(CHANNELS) * 3
+            for i, actuator in enumerate(ACTUATORS):
+                result[f"{actuator}_on_seconds"].append(rest[offset + i])
+        return result
+
+    def remove(self):
+        """Delete all telemetry of this box. Blocking."""
+        shutil.rmtree(self._dir, ignore_errors=True)
@@ -0,0 +1,97 @@
+"""Structured decision trace for Local Grow Box.
+
+Every control decision names the rule that fired. A record is kept when the
+rule or the action of a subsystem changes, and otherwise once per sampling
+interval, so a steady box writes a few records per hour. The buffer holds a
+fixed number of records per box; the oldest fall out first.
+"""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from .const import TRACE_CAPACITY, TRACE_SAMPLE_INTERVAL
+
+# Actions
+ACTION_ON = "on"
+ACTION_OFF = "off"
+ACTION_KEEP = "keep"
+
+
+@dataclass(frozen=True, slots=True)
+class TraceRecord:
+    """One control decision."""
+
+    ts: float
+    subsystem: str
+    rule: str
+    action: str
+    inputs: dict[str, Any]
+    thresholds: dict[str, Any]
+    latency_ms: float
+
+    def as_dict(self) -> dict:
+        """Return a JSON friendly representation."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class DecisionTrace:
+    """Bounded ring buffer of decision records of one box."""
+
+    def __init__(self, capacity: int = TRACE_CAPACITY, sample_interval: float = TRACE_SAMPLE_INTERVAL):
+        """Initialize an empty trace."""
+        self.sample_interval = sample_interval
+        self._records: deque[TraceRecord] = deque(maxlen=capacity)
+        self._last: dict[str, tuple[str, str, float]] = {}
+        self.written = 0
+        self.skipped = 0
+
+    def record(
+        self,
+        ts: float,
+        subsystem: str,
+        rule: str,
+        action: str,
+        latency_ms: float,
+        details: Callable[[], tuple[dict, dict]],
+    ) -> bool:
+        """Keep a decision if it changed or is due for sampling.
+
+        details returns (inputs, thresholds) and is only called when the
+        record is kept, so unchanged ticks cost a tuple compare.
+        """
+        last = self._last.get(subsystem)
+        if last is not None and last[0] == rule and last[1] == action and ts - last[2] < self.sample_interval:
+            self.skipped += 1
+            return False
+        inputs, thresholds = details()
+        self._records.append(
+            TraceRecord(ts, subsystem, rule, action, inputs, thresholds, round(latency_ms, 3))
+        )
+        self._last[subsystem] = (rule, action, ts)
+        self.written += 1
+        return True
+
+    def query(
+        self, start: float | None = None, end: float | None = None, subsystem: str | None = None
+    ) -> list[dict]:
+        """Return the records between start and end (epoch seconds), oldest first."""
+        return [
+            record.as_dict()
+            for record in self._records
+            if (start is None or record.ts >= start)
+            and (end is None or record.ts <= end)
+            and (subsystem is None or record.subsystem == subsystem)
+        ]
+
+    def as_dict(self) -> dict:
+        """Return the whole buffer and its counters (for diagnostics)."""
+        return {
+            "capacity": self._records.maxlen,
+            "sample_interval": self.sample_interval,
+            "written": self.written,
+            "skipped": self.skipped,
+            "records": self.query(),
+        }
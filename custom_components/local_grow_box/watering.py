@@ -0,0 +1,215 @@
+"""Moisture trend estimation for predictive watering.
+
+After each watering the soil moisture falls roughly linearly. A running
+least-squares fit over the readings since the last watering gives the
+drying rate. From that follow the time until the target is crossed and the
+moisture gained per pump second, measured from the rise after each run.
+Both are updated in O(1) per reading.
+"""
+from __future__ import annotations
+
+import datetime
+
+from homeassistant.core import State, callback
+
+from .const import (
+    CONF_MOISTURE_SENSOR, CONF_PUMP_ENTITY, WATERING_MIN_SAMPLES, WATERING_MIN_SPAN,
+    WATERING_SETTLE, WATERING_GAIN_WEIGHT, WATERING_OVERSHOOT, WATERING_DURATION_RANGE,
+)
+from .entities import EntityTracker
+from .snapshot import state_as_float
+
+
+class DryingTrend:
+    """Incremental least-squares line through (time, moisture)."""
+
+    __slots__ = ("origin", "n", "sum_t", "sum_y", "sum_tt", "sum_ty", "last_t")
+
+    def __init__(self):
+        """Initialize an empty fit."""
+        self.reset(0.0)
+
+    def reset(self, origin: float) -> None:
+        """Start a new fit; times are taken relative to origin for precision."""
+        self.origin = origin
+        self.n = 0
+        self.sum_t = self.sum_y = self.sum_tt = self.sum_ty = 0.0
+        self.last_t = 0.0
+
+    def add(self, ts: float, value: float) -> None:
+        """Add a reading."""
+        t = ts - self.origin
+        self.n += 1
+        self.sum_t += t
+        self.sum_y += value
+        self.sum_tt += t * t
+        self.sum_ty += t * value
+        self.last_t = t
+
+    @property
+    def slope(self) -> float | None:
+        """Return the moisture change per second, None until the fit is trustworthy."""
+        if self.n < WATERING_MIN_SAMPLES or self.last_t < WATERING_MIN_SPAN:
+            return None
+        denominator = self.n * self.sum_tt - self.sum_t * self.sum_t
+        if denominator <= 0:
+            return None
+        return (self.n * self.sum_ty - self.sum_t * self.sum_y) / denominator
+
+    def value_at(self, ts: float) -> float | None:
+        """Return the fitted moisture at ts."""
+        slope = self.slope
+        if slope is None:
+            return None
+        intercept = (self.sum_y - slope * self.sum_t) / self.n
+        return intercept + slope * (ts - self.origin)
+
+
+class WateringModel:
+    """Drying trend and pump gain of one zone, fed from the entity tracker."""
+
+    def __init__(
+        self,
+        entities: EntityTracker,
+        pump_key: str = CONF_PUMP_ENTITY,
+        moisture_key: str = CONF_MOISTURE_SENSOR,
+    ):
+        """Initialize the model."""
+        self._entities = entities
+        self._pump_key = pump_key
+        self._moisture_key = moisture_key
+        self.trend = DryingTrend()
+        self.gain: float | None = None  # % moisture per pump second
+        self.runs = 0
+        self._pump_started: float | None = None
+        self._pump_seconds = 0.0
+        self._before: float | None = None
+        self._settle_until: float | None = None
+        self._peak: float | None = None
+        self._moisture: float | None = None
+        self._unsub = None
+
+    @callback
+    def async_setup(self) -> None:
+        """Follow the moisture sensor and the pump."""
+        now = datetime.datetime.now(datetime.timezone.utc).timestamp()
+        self.trend.reset(now)
+        self._moisture = state_as_float(self._entities.state(self._moisture_key))
+        self._unsub = self._entities.async_add_listener(self._async_state_changed)
+
+    @callback
+    def _async_state_changed(self, key: str, old: State | None, new: State | None) -> None:
+        if new is None:
+            return
+        ts = new.last_updated.timestamp()
+        if key == self._pump_key:
+            self._pump_changed(ts, new.state == "on")
+        elif key == self._moisture_key:
+            value = state_as_float(new)
+            if value is not None:
+                self._moisture_changed(ts, value)
+
+    def _pump_changed(self, ts: float, on: bool) -> None:
+        if on and self._pump_started is None:
+            self._pump_started = ts
+            if self._settle_until is None:
+                # Several runs within one settle window count as one watering
+                self._before = self._moisture
+                self._pump_seconds = 0.0
+        elif not on and self._pump_started is not None:
+            self._pump_seconds += ts - self._pump_started
+            self._pump_started = None
+            self._settle_until = ts + WATERING_SETTLE
+            self._peak = self._moisture
+
+    def _moisture_changed(self, ts: float, value: float) -> None:
+        self._moisture = value
+        if self._pump_started is not None:
+            return
+        if self._settle_until is not None:
+            if ts < self._settle_until:
+                self._peak = value if self._peak is None else max(self._peak, value)
+                return
+            self._finish_watering(ts)
+        self.trend.add(ts, value)
+
+    def _finish_watering(self, ts: float) -> None:
+        if self._before is not None and self._peak is not None and self._pump_seconds > 0:
+            gain = (self._peak - self._before) / self._pump_seconds
+            if gain > 0:
+                self.gain = gain if self.gain is None else (
+                    self.gain + (gain - self.gain) * WATERING_GAIN_WEIGHT
+                )
+                self.runs += 1
+        self._settle_until = self._peak = self._before = None
+        self.trend.reset(ts)
+
+    def as_state(self) -> dict:
+        """Return the fit and the gain measurement for a warm restart."""
+        trend = self.trend
+        return {
+            "trend": [getattr(trend, name) for name in DryingTrend.__slots__],
+            "gain": self.gain,
+            "runs": self.runs,
+            "pump_started": self._pump_started,
+            "pump_seconds": self._pump_seconds,
+            "before": self._before,
+            "settle_until": self._settle_until,
+            "peak": self._peak,
+        }
+
+    @callback
+    def async_restore(self, state: dict) -> None:
+        """Continue from a saved state. Must run after async_setup."""
+        for name, value in zip(DryingTrend.__slots__, state["trend"]):
+            setattr(self.trend, name, value)
+        self.gain = state["gain"]
+        self.runs = state["runs"]
+        self._pump_seconds = state["pump_seconds"]
+        self._before = state["before"]
+        self._settle_until = state["settle_until"]
+        self._peak = state["peak"]
+        self._pump_started = state.get("pump_started")
+        pump = self._entities.state(self._pump_key)
+        if self._pump_started is not None and pump is not None and pump.state == "off":
+            # Stopped while Home Assistant was down: the settle window starts from there
+            self._pump_changed(max(pump.last_changed.timestamp(), self._pump_started), False)
+
+    def seconds_until(self, target: float, ts: float) -> float | None:
+        """Return the predicted seconds until the moisture falls to target, None if unknown."""
+        slope = self.trend.slope
+        if slope is None or slope >= 0 or self._settle_until is not None:
+            return None
+        current = self.trend.value_at(ts)
+        return max((current - target) / -slope, 0.0)
+
+    def duration_for(self, target: float, current: float, default: float) -> float:
+        """Return the pump seconds that lift current to a little above target."""
+        if not self.gain:
+            return default
+        low, high = WATERING_DURATION_RANGE
+        seconds = (target + WATERING_OVERSHOOT - current) / self.gain
+        return min(max(seconds, default * low), default * high)
+
+    def as_dict(self, target: float, default: float, ts: float) -> dict:
+        """Return the predictions (for sensor attributes and diagnostics)."""
+        slope = self.trend.slope
+        eta = self.seconds_until(target, ts)
+        current = self._moisture
+        return {
+            "drying_rate_per_hour": round(slope * 3600, 3) if slope is not None else None,
+            "gain_per_pump_second": round(self.gain, 4) if self.gain else None,
+            "hours_to_target": round(eta / 3600, 2) if eta is not None else None,
+            "predicted_duration": round(self.duration_for(target, current, default), 1)
+            if current is not None else None,
+            "samples": self.trend.n,
+            "waterings_measured": self.runs,
+            "settling": self._settle_until is not None,
+        }
+
+    @callback
+    def async_unload(self) -> None:
+        """Stop following the entities."""
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
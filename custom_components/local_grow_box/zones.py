@@ -0,0 +1,153 @@
+"""Irrigation zones of a Local Grow Box.
+
+The pump and moisture sensor of the box settings form the main zone.
+Further zones are stored as a list under CONF_WATER_ZONES; their entities
+are tracked under the keys zone_<id>_pump and zone_<id>_moisture.
+"""
+from __future__ import annotations
+
+import datetime
+from datetime import timedelta
+
+import voluptuous as vol
+
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_MOISTURE_SENSOR, CONF_PUMP_ENTITY, CONF_WATER_ZONES, DEFAULT_SOAK
+from .entities import EntityTracker
+from .watering import WateringModel
+
+MAIN_ZONE = "main"
+
+ZONE_SCHEMA = vol.Schema({
+    vol.Required("id"): vol.All(str, vol.Match(r"^[a-z0-9_]{1,32}$"), vol.NotIn([MAIN_ZONE])),
+    vol.Required("name"): vol.All(str, vol.Length(min=1, max=64)),
+    vol.Required("pump_entity"): str,
+    vol.Optional("moisture_sensor"): vol.Any(None, str),
+    # Empty values fall back to the phase profile
+    vol.Optional("target_moisture"): vol.Any(None, vol.All(vol.Coerce(float), vol.Range(min=0, max=100))),
+    vol.Optional("pump_duration"): vol.Any(None, vol.All(vol.Coerce(float), vol.Range(min=1, max=3600))),
+    vol.Optional("soak"): vol.Any(None, vol.All(vol.Coerce(float), vol.Range(min=0, max=86400))),
+})
+
+
+def _unique_ids(zones: list) -> list:
+    ids = [zone["id"] for zone in zones]
+    if len(ids) != len(set(ids)):
+        raise vol.Invalid("Zone ids must be unique")
+    return zones
+
+
+ZONES_SCHEMA = vol.All([ZONE_SCHEMA], _unique_ids)
+
+
+def zone_keys(zone_id: str) -> tuple[str, str]:
+    """Return the tracker keys of a zone's pump and moisture sensor."""
+    if zone_id == MAIN_ZONE:
+        return CONF_PUMP_ENTITY, CONF_MOISTURE_SENSOR
+    return f"zone_{zone_id}_pump", f"zone_{zone_id}_moisture"
+
+
+def zone_references(config: dict) -> dict[str, str]:
+    """Return the entity references of the additional zones for the tracker."""
+    refs = {}
+    for zone in config.get(CONF_WATER_ZONES) or []:
+        pump_key, moisture_key = zone_keys(zone["id"])
+        refs[pump_key] = zone.get("pump_entity")
+        refs[moisture_key] = zone.get("moisture_sensor")
+    return refs
+
+
+def rename_zone_entities(zones: list, renamed: dict[str, str]) -> list | None:
+    """Apply renamed zone keys to the stored zone list, None if no zone is affected."""
+    changed = False
+    result = []
+    for zone in zones:
+        pump_key, moisture_key = zone_keys(zone["id"])
+        zone = dict(zone)
+        for key, field in ((pump_key, "pump_entity"), (moisture_key, "moisture_sensor")):
+            if key in renamed:
+                zone[field] = renamed[key]
+                changed = True
+        result.append(zone)
+    return result if changed else None
+
+
+class WaterZone:
+    """Settings, timers and watering model of one zone."""
+
+    __slots__ = (
+        "id", "name", "pump_key", "moisture_key", "target_moisture", "pump_duration", "soak",
+        "watering", "pump_start_time", "last_pump_stop_time", "pump_run_duration",
+    )
+
+    def __init__(
+        self,
+        zone_id: str,
+        name: str,
+        entities: EntityTracker,
+        target_moisture: float | None = None,
+        pump_duration: float | None = None,
+        soak: float | None = None,
+    ):
+        """Initialize the zone."""
+        self.id = zone_id
+        self.name = name
+        self.pump_key, self.moisture_key = zone_keys(zone_id)
+        self.target_moisture = target_moisture
+        self.pump_duration = pump_duration
+        self.soak = DEFAULT_SOAK if soak is None else soak
+        self.watering = WateringModel(entities, self.pump_key, self.moisture_key)
+        self.pump_start_time: datetime.datetime | None = None
+        self.pump_run_duration: float | None = None
+        # In the past so the zone can water right after a restart if needed
+        self.last_pump_stop_time = dt_util.now() - timedelta(hours=1)
+
+    @property
+    def subsystem(self) -> str:
+        """Return the trace subsystem of the zone."""
+        return "pump" if self.id == MAIN_ZONE else f"pump_{self.id}"
+
+    @property
+    def label(self) -> str:
+        """Return the pump name used in the log."""
+        return "Pumpe" if self.id == MAIN_ZONE else f"Pumpe {self.name}"
+
+    def as_state(self) -> dict:
+        """Return the timers and the watering model for a warm restart."""
+        return {
+            "pump_start": self.pump_start_time.isoformat() if self.pump_start_time else None,
+            "last_stop": self.last_pump_stop_time.isoformat(),
+            "run_duration": self.pump_run_duration,
+            "watering": self.watering.as_state(),
+        }
+
+    def restore(self, state: dict) -> None:
+        """Continue from a saved state. The watering model must be set up."""
+        self.pump_start_time = dt_util.parse_datetime(state["pump_start"]) if state["pump_start"] else None
+        self.last_pump_stop_time = dt_util.parse_datetime(state["last_stop"])
+        self.pump_run_duration = state["run_duration"]
+        self.watering.async_restore(state["watering"])
+
+    def as_dict(self) -> dict:
+        """Return settings and timers (for diagnostics)."""
+        return {
+            "name": self.name,
+            "target_moisture": self.target_moisture,
+            "pump_duration": self.pump_duration,
+            "soak": self.soak,
+            "pump_start": self.pump_start_time.isoformat() if self.pump_start_time else None,
+            "last_stop": self.last_pump_stop_time.isoformat() if self.last_pump_stop_time else None,
+            "run_duration": self.pump_run_duration,
+        }
+
+
+def build_zones(config: dict, entities: EntityTracker) -> dict[str, WaterZone]:
+    """Create the main zone and the additional zones of a box."""
+    zones = {MAIN_ZONE: WaterZone(MAIN_ZONE, "Main", entities)}
+    for zone in config.get(CONF_WATER_ZONES) or []:
+        zones[zone["id"]] = WaterZone(
+            zone["id"], zone["name"], entities,
+            zone.get("target_moisture"), zone.get("pump_duration"), zone.get("soak"),
+        )
+    return zones
@@ -0,0 +1 @@
+"""Tests for Local Grow Box."""
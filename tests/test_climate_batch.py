@@ -0,0 +1,113 @@
+"""Compare the batched climate rules against the per-box rules."""
+from __future__ import annotations
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("homeassistant")
+
+from custom_components.local_grow_box.climate import (  # noqa: E402
+    STATE_MISSING,
+    ClimateSetpoints,
+    decide_climate,
+    decide_climate_batch,
+)
+from custom_components.local_grow_box.psychrometrics import SVP_TABLE  # noqa: E402
+
+BOXES = 2000
+# Readings at and around the ends of the SVP table
+EDGE_TEMPS = [SVP_TABLE.low, SVP_TABLE.high, SVP_TABLE.high - 1e-14, SVP_TABLE.low - 0.05, SVP_TABLE.high + 0.05]
+
+
+def _random_setpoints(rng: random.Random, vpd_mode: bool) -> ClimateSetpoints:
+    vpd_min = rng.uniform(0.4, 1.2)
+    return ClimateSetpoints(
+        vpd_mode=vpd_mode,
+        target_temp=rng.uniform(18, 30),
+        max_humidity=rng.uniform(55, 80),
+        target_humidity=rng.uniform(40, 70),
+        humidity_hysteresis=rng.uniform(0, 10),
+        temp_hysteresis=rng.uniform(0, 3),
+        fan_hysteresis=rng.uniform(0, 10),
+        leaf_offset=rng.uniform(-3, 1),
+        vpd_min=vpd_min,
+        vpd_max=vpd_min + rng.uniform(0.2, 0.8),
+        vpd_hysteresis=rng.uniform(0, 0.3),
+    )
+
+
+def _random_temp(rng: random.Random, sp: ClimateSetpoints) -> float:
+    choice = rng.random()
+    if choice < 0.1:
+        return rng.choice(EDGE_TEMPS)
+    if choice < 0.2:
+        # Outside the table, the scalar path computes SVP directly
+        return rng.choice([rng.uniform(-40, SVP_TABLE.low), rng.uniform(SVP_TABLE.high, 80)])
+    if choice < 0.3:
+        # Exactly on the fan thresholds
+        return rng.choice([sp.target_temp, sp.target_temp - sp.temp_hysteresis])
+    return rng.uniform(10, 40)
+
+
+def _random_humidity(rng: random.Random, sp: ClimateSetpoints) -> float:
+    if rng.random() < 0.2:
+        return rng.choice([
+            sp.max_humidity, sp.max_humidity - sp.fan_hysteresis,
+            sp.target_humidity, sp.target_humidity - sp.humidity_hysteresis, 0.0, 100.0,
+        ])
+    return rng.uniform(0, 100)
+
+
+def _random_state(rng: random.Random) -> bool | None:
+    return rng.choice([None, False, True])
+
+
+def _state(value: bool | None) -> int:
+    return STATE_MISSING if value is None else int(value)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_batch_matches_per_box(seed):
+    """Every box decides the same, with the same rules, in both paths."""
+    rng = random.Random(seed)
+    boxes = []
+    for _ in range(BOXES):
+        sp = _random_setpoints(rng, vpd_mode=rng.random() < 0.5)
+        boxes.append((
+            sp, _random_temp(rng, sp), _random_humidity(rng, sp),
+            _random_state(rng), _random_state(rng), rng.random() < 0.7,
+        ))
+
+    columns = {
+        name: np.array([getattr(box[0], name) for box in boxes]) for name in ClimateSetpoints.__slots__
+    }
+    vpd, fan, humidifier, fan_rule, humidifier_rule = decide_climate_batch(
+        columns,
+        np.array([box[1] for box in boxes], dtype=float),
+        np.array([box[2] for box in boxes], dtype=float),
+        np.array([_state(box[3]) for box in boxes], dtype=np.int8),
+        np.array([_state(box[4]) for box in boxes], dtype=np.int8),
+        np.array([box[5] for box in boxes], dtype=bool),
+    )
+
+    for i, box in enumerate(boxes):
+        expected = decide_climate(*box)
+        actual = (float(vpd[i]), int(fan[i]), int(humidifier[i]), str(fan_rule[i]), str(humidifier_rule[i]))
+        assert actual == (
+            expected.vpd, expected.fan, expected.humidifier, expected.fan_rule, expected.humidifier_rule
+        ), box
+
+
+def test_table_upper_bound():
+    """Just below the upper end of the table both paths interpolate the last step."""
+    temp = np.array([SVP_TABLE.high - 1e-14, 59.99999999999999])
+    sp = _random_setpoints(random.Random(0), vpd_mode=True)
+    columns = {name: np.full(len(temp), getattr(sp, name)) for name in ClimateSetpoints.__slots__}
+    vpd, *_ = decide_climate_batch(
+        columns, temp, np.full(len(temp), 50.0),
+        np.zeros(len(temp), dtype=np.int8), np.zeros(len(temp), dtype=np.int8), np.ones(len(temp), dtype=bool),
+    )
+    for i, value in enumerate(temp):
+        assert float(vpd[i]) == decide_climate(sp, float(value), 50.0, False, False, True).vpd